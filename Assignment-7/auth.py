@@ -1,8 +1,16 @@
 import bcrypt
 import os
+import time
 
 USER_DATA_FILE = "users.txt"
 
+# failed logins: username,window_start,previous_count,current_count,locked_until,lockouts
+LOGIN_ATTEMPTS_FILE = "login_attempts.txt"
+MAX_FAILURES = 5          # per sliding window
+WINDOW_SECONDS = 300
+LOCKOUT_SECONDS = 60      # doubles with every further lockout
+MAX_LOCKOUT_SECONDS = 3600
+
 
 def hash_password(plain_text_password):
     pass_bytes = plain_text_password.encode("utf-8")
@@ -57,14 +65,79 @@ def register_user(username, password):
     return True
 
 
+def load_attempts():
+    attempts = {}
+    if os.path.exists(LOGIN_ATTEMPTS_FILE):
+        with open(LOGIN_ATTEMPTS_FILE, "r") as f:
+            for line in f:
+                # the five numbers are last, so a comma in the username can't shift them
+                parts = line.rstrip("\n").rsplit(",", 5)
+                if len(parts) != 6:
+                    continue
+                try:
+                    attempts[parts[0]] = [float(n) for n in parts[1:]]
+                except ValueError:
+                    # skip a damaged line rather than breaking every login
+                    continue
+    return attempts
+
+
+def save_attempts(attempts):
+    with open(LOGIN_ATTEMPTS_FILE, "w") as f:
+        for name, numbers in attempts.items():
+            f.write(name + "," + ",".join(str(n) for n in numbers) + "\n")
+
+
+# seconds the user still has to wait before trying again (0 = allowed)
+def lockout_remaining(username):
+    counter = load_attempts().get(username)
+    if counter is None:
+        return 0
+    return max(0, counter[3] - time.time())
+
+
+# sliding window from two fixed windows: the previous one counts by how much of it is still in range
+def record_failure(username):
+    now = time.time()
+    attempts = load_attempts()
+    counter = attempts.setdefault(username, [now, 0, 0, 0, 0])
+
+    elapsed_windows = int((now - counter[0]) // WINDOW_SECONDS)
+    if elapsed_windows >= 1:
+        counter[1] = counter[2] if elapsed_windows == 1 else 0
+        counter[2] = 0
+        counter[0] += elapsed_windows * WINDOW_SECONDS
+    counter[2] += 1
+
+    overlap = 1 - (now - counter[0]) / WINDOW_SECONDS
+    if counter[1] * overlap + counter[2] >= MAX_FAILURES:
+        counter[3] = now + min(LOCKOUT_SECONDS * 2 ** counter[4], MAX_LOCKOUT_SECONDS)
+        counter[4] += 1
+        counter[1] = counter[2] = 0
+    save_attempts(attempts)
+
+
+def clear_failures(username):
+    attempts = load_attempts()
+    if attempts.pop(username, None) is not None:
+        save_attempts(attempts)
+
+
 def login_user(username, password):
+    # locked out users are turned away before any bcrypt work
+    if lockout_remaining(username) > 0:
+        return False
     if not os.path.exists(USER_DATA_FILE):
         return False
     with open(USER_DATA_FILE, "r") as f:
         for line in f:
             saved_username, saved_hashed_password = line.strip().split(",", 1)
             if saved_username == username:
-                return PassVerify(password, saved_hashed_password)
+                if PassVerify(password, saved_hashed_password):
+                    clear_failures(username)
+                    return True
+                break
+    record_failure(username)
     return False
 
 
@@ -129,6 +202,8 @@ def main():
 
             if login_user(username, password):
                 print("Login successful!")
+            elif lockout_remaining(username) > 0:
+                print(f"Too many failed attempts. Try again in {int(lockout_remaining(username)) + 1} seconds.")
             else:
                 print("Invalid username or password, Login failed.")
 
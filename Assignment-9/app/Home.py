@@ -1,5 +1,8 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from app.data.users import login_user, register_user
+from app.services.metrics import start_metrics_server
+from app.services.sessions import current_session, start_session
 
 st.set_page_config(
     page_title="Intelligence Platform",
@@ -8,6 +11,9 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# /metrics for prometheus when PLATFORM_METRICS_PORT is set (once per process)
+start_metrics_server()
+
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
 
@@ -39,7 +45,13 @@ def login_page():
                     if username == "" or password == "":
                         st.error("Username and password are required")
                     else:
-                        result = login_user(username, password)
+                        # ip address when streamlit exposes it (not on localhost / behind some proxies),
+                        # else this browser session, so one client's failures never lock out everybody
+                        client = getattr(st.context, "ip_address", None)
+                        if not client:
+                            ctx = get_script_run_ctx()
+                            client = "session:" + (ctx.session_id if ctx is not None else "unknown")
+                        result = login_user(username, password, client)
 
                         if type(result) == tuple:
                             success = result[0]
@@ -49,11 +61,12 @@ def login_page():
                             role = "user"
 
                         if success:
-                            st.session_state.logged_in = True
-                            st.session_state.username = username
-                            st.session_state.role = role
+                            # only the signed token is trusted by the pages
+                            start_session(username, role)
                             st.success("Login successful")
                            
+                        elif type(result) == tuple and result[1].startswith("Too many"):
+                            st.error(result[1])
                         else:
                             st.error("Invalid username or password")
 
@@ -92,7 +105,7 @@ def login_page():
 
 
 def main():
-    if st.session_state.logged_in:
+    if current_session():
         st.success("Login successful, open Dashboard from the sidebar.")
         st.write("Username:", st.session_state.username)
         st.write("Role:", st.session_state.role)
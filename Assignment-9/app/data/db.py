@@ -1,5 +1,5 @@
 import sqlite3
 
-def connect_database(db_path="DATA/intelligence_platform.db"):
-    conn = sqlite3.connect(db_path)
+def connect_database(db_path="DATA/intelligence_platform.db", check_same_thread=True):
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
     return conn
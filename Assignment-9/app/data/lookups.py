@@ -0,0 +1,62 @@
+from functools import lru_cache
+from app.data.db import connect_database
+from app.services import metrics
+
+# coded column -> (decoded column name, lookup table)
+CODED_COLUMNS = {
+    "severity_id": ("severity", "severity_levels"),
+    "status_id": ("status", "statuses"),
+    "priority_id": ("priority", "priorities"),
+}
+
+
+# lookup tables are tiny and static, so each one is read once per process
+@lru_cache(maxsize=None)
+def get_lookup(table):
+    conn = connect_database()
+    cursor = conn.cursor()
+
+    cursor.execute(f"SELECT id, label FROM {table} ORDER BY id")
+    rows = cursor.fetchall()
+
+    conn.close()
+    by_id = {row[0]: row[1] for row in rows}
+    by_label = {row[1]: row[0] for row in rows}
+    return by_id, by_label
+
+
+def label_for(table, lookup_id):
+    return get_lookup(table)[0].get(lookup_id)
+
+
+def id_for(table, label):
+    by_label = get_lookup(table)[1]
+    key = str(label).strip().lower()
+    if key not in by_label:
+        raise ValueError(f"Unknown {table} value: {label}")
+    return by_label[key]
+
+
+def labels(table):
+    return list(get_lookup(table)[0].values())
+
+
+# lru_cache already counts hits and misses; read them at scrape time instead of on every lookup
+def _cache_counts():
+    info = get_lookup.cache_info()
+    return {("hit",): info.hits, ("miss",): info.misses}
+
+
+metrics.counter("platform_lookup_cache_total", "Lookup table cache accesses", ["result"],
+                callback=_cache_counts)
+
+
+# swaps severity_id/status_id/priority_id columns for their labels (in place, same position)
+def decode_frame(df):
+    for column, (name, table) in CODED_COLUMNS.items():
+        if column in df.columns:
+            position = df.columns.get_loc(column)
+            decoded = df[column].map(get_lookup(table)[0])
+            df = df.drop(columns=[column])
+            df.insert(position, name, decoded)
+    return df
@@ -0,0 +1,68 @@
+from app.data.db import connect_database
+from app.data.schema import create_preferences_table
+
+DEFAULT_PREFERENCES = {
+    "theme": "Light",
+    "notifications": True,
+    "auto_refresh": True,
+    "refresh_interval": 60,
+    "chart_style": "Bar",
+    "row_limit": 50,
+}
+
+BOOL_PREFERENCES = ["notifications", "auto_refresh"]
+
+
+#getting one user's saved preferences (defaults filled in)
+def get_preferences(username):
+    conn = connect_database()
+    cursor = conn.cursor()
+    create_preferences_table(cursor)
+
+    cursor.execute("""
+        SELECT theme, notifications, auto_refresh, refresh_interval, chart_style, row_limit
+        FROM user_preferences
+        WHERE username = ?
+    """, (username,))
+    row = cursor.fetchone()
+
+    conn.close()
+
+    prefs = dict(DEFAULT_PREFERENCES)
+    if row:
+        prefs.update(zip(DEFAULT_PREFERENCES.keys(), row))
+        for key in BOOL_PREFERENCES:
+            prefs[key] = bool(prefs[key])
+    return prefs
+
+
+#saving (insert or update) one user's preferences
+def save_preferences(username, prefs):
+    conn = connect_database()
+    cursor = conn.cursor()
+    create_preferences_table(cursor)
+
+    cursor.execute("""
+        INSERT INTO user_preferences
+            (username, theme, notifications, auto_refresh, refresh_interval, chart_style, row_limit, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(username) DO UPDATE SET
+            theme = excluded.theme,
+            notifications = excluded.notifications,
+            auto_refresh = excluded.auto_refresh,
+            refresh_interval = excluded.refresh_interval,
+            chart_style = excluded.chart_style,
+            row_limit = excluded.row_limit,
+            updated_at = CURRENT_TIMESTAMP
+    """, (
+        username,
+        prefs["theme"],
+        int(prefs["notifications"]),
+        int(prefs["auto_refresh"]),
+        int(prefs["refresh_interval"]),
+        prefs["chart_style"],
+        int(prefs["row_limit"]),
+    ))
+
+    conn.commit()
+    conn.close()
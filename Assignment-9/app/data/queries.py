@@ -0,0 +1,112 @@
+import threading
+import time
+from app.data.db import connect_database
+from app.services import metrics
+from app.services.profiler import add_time
+
+metrics.histogram("platform_db_query_seconds", "Named query latency (execute + fetch)", ["query"])
+metrics.counter("platform_db_rows_total", "Rows returned by named queries", ["query"])
+
+# named, parameterized queries shared by the pages
+# (same SQL text every time -> sqlite3 reuses the prepared statement)
+QUERIES = {
+    # Dashboard tabs
+    "dashboard_incidents": """
+        SELECT id, title, severity_id, status_id, date
+        FROM cyber_incidents
+        LIMIT ?
+    """,
+    "dashboard_tickets": """
+        SELECT id, title, priority_id, status_id, created_date
+        FROM it_tickets
+        LIMIT ?
+    """,
+    "dashboard_datasets": """
+        SELECT id, name, source, category, size
+        FROM datasets_metadata
+        LIMIT ?
+    """,
+
+    # Dashboard metric cards and charts (one grouped query per domain)
+    "incident_metrics": """
+        SELECT severity_id, status_id, COUNT(*)
+        FROM cyber_incidents
+        GROUP BY severity_id, status_id
+    """,
+    "ticket_metrics": """
+        SELECT status_id, priority_id, COUNT(*)
+        FROM it_tickets
+        GROUP BY status_id, priority_id
+    """,
+    "dataset_metrics": """
+        SELECT category, source, COUNT(*)
+        FROM datasets_metadata
+        GROUP BY category, source
+    """,
+
+    # CRUD page lists
+    "recent_incidents": """
+        SELECT id, title, severity_id, status_id, date
+        FROM cyber_incidents
+        ORDER BY id DESC
+        LIMIT ?
+    """,
+    "recent_tickets": """
+        SELECT id, title, priority_id, status_id, created_date
+        FROM it_tickets
+        ORDER BY id DESC
+        LIMIT ?
+    """,
+    "recent_datasets": """
+        SELECT id, name, source, category, size
+        FROM datasets_metadata
+        ORDER BY id DESC
+        LIMIT ?
+    """,
+}
+
+_lock = threading.Lock()
+_conn = None
+_stats = {}
+
+
+# one long-lived connection for read queries (keeps its statement cache warm)
+def get_shared_connection():
+    global _conn
+    if _conn is None:
+        _conn = connect_database(check_same_thread=False)
+    return _conn
+
+
+# running a named query, returns (column names, rows)
+def run_named_query(name, params=()):
+    sql = QUERIES[name]
+
+    with _lock:
+        start = time.perf_counter()
+        cursor = get_shared_connection().execute(sql, params)
+        rows = cursor.fetchall()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        columns = [c[0] for c in cursor.description]
+
+        stat = _stats.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+        stat["calls"] += 1
+        stat["total_ms"] += elapsed_ms
+        stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+        stat["rows"] += len(rows)
+
+    add_time("db", elapsed_ms / 1000)
+    metrics.observe("platform_db_query_seconds", elapsed_ms / 1000, name)
+    metrics.inc("platform_db_rows_total", name, amount=len(rows))
+    return columns, rows
+
+
+# per-query timings, slowest (by total time) first
+def get_query_stats():
+    with _lock:
+        stats = [dict(name=name, **stat) for name, stat in _stats.items()]
+
+    for stat in stats:
+        stat["avg_ms"] = stat["total_ms"] / stat["calls"]
+    return sorted(stats, key=lambda s: s["total_ms"], reverse=True)
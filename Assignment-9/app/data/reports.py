@@ -1,11 +1,17 @@
 from app.data.db import connect_database
+from app.data.lookups import id_for
 
 #all cyber incidents
 def get_all_cyber_incidents():
     conn = connect_database()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT id, title, severity, status, date FROM cyber_incidents")
+    cursor.execute("""
+        SELECT i.id, i.title, sv.label, st.label, i.date
+        FROM cyber_incidents i
+        JOIN severity_levels sv ON sv.id = i.severity_id
+        JOIN statuses st ON st.id = i.status_id
+    """)
     rows = cursor.fetchall()
 
     conn.close()
@@ -17,10 +23,12 @@ def get_high_severity_incidents():
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT id, title, severity, status, date
-        FROM cyber_incidents
-        WHERE severity IN ('high', 'critical')
-    """)
+        SELECT i.id, i.title, sv.label, st.label, i.date
+        FROM cyber_incidents i
+        JOIN severity_levels sv ON sv.id = i.severity_id
+        JOIN statuses st ON st.id = i.status_id
+        WHERE i.severity_id IN (?, ?)
+    """, (id_for("severity_levels", "high"), id_for("severity_levels", "critical")))
     rows = cursor.fetchall()
 
     conn.close()
@@ -32,10 +40,12 @@ def get_open_it_tickets():
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT id, title, priority, status, created_date
-        FROM it_tickets
-        WHERE status = 'open'
-    """)
+        SELECT t.id, t.title, pr.label, st.label, t.created_date
+        FROM it_tickets t
+        JOIN priorities pr ON pr.id = t.priority_id
+        JOIN statuses st ON st.id = t.status_id
+        WHERE t.status_id = ?
+    """, (id_for("statuses", "open"),))
     rows = cursor.fetchall()
 
     conn.close()
@@ -1,5 +1,323 @@
 from app.data.db import connect_database
 
+TRACKED_TABLES = ["users", "cyber_incidents", "datasets_metadata", "it_tickets"]
+
+# lookup tables for the categorical columns (id = position + 1)
+LOOKUPS = {
+    "severity_levels": ["low", "medium", "high", "critical"],
+    "statuses": ["open", "in progress", "resolved", "closed"],
+    "priorities": ["low", "medium", "high", "critical"],
+}
+
+CYBER_INCIDENTS_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        severity_id INTEGER NOT NULL REFERENCES severity_levels(id)
+            CHECK (severity_id BETWEEN 1 AND 4),
+        status_id INTEGER NOT NULL DEFAULT 1 REFERENCES statuses(id)
+            CHECK (status_id BETWEEN 1 AND 4),
+        date TEXT
+    )
+"""
+
+IT_TICKETS_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        priority_id INTEGER NOT NULL REFERENCES priorities(id)
+            CHECK (priority_id BETWEEN 1 AND 4),
+        status_id INTEGER NOT NULL DEFAULT 1 REFERENCES statuses(id)
+            CHECK (status_id BETWEEN 1 AND 4),
+        created_date TEXT
+    )
+"""
+
+# table -> (DDL, columns, {id column: (old text column, lookup table)})
+NORMALIZED_TABLES = {
+    "cyber_incidents": (
+        CYBER_INCIDENTS_DDL,
+        ["id", "title", "severity_id", "status_id", "date"],
+        {"severity_id": ("severity", "severity_levels"), "status_id": ("status", "statuses")},
+    ),
+    "it_tickets": (
+        IT_TICKETS_DDL,
+        ["id", "title", "priority_id", "status_id", "created_date"],
+        {"priority_id": ("priority", "priorities"), "status_id": ("status", "statuses")},
+    ),
+}
+
+
+def create_lookup_tables(cursor):
+    for table, labels in LOOKUPS.items():
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY,
+            label TEXT UNIQUE NOT NULL
+        )
+        """)
+        cursor.executemany(
+            f"INSERT OR IGNORE INTO {table} (id, label) VALUES (?, ?)",
+            list(enumerate(labels, start=1))
+        )
+
+
+# rebuilds old tables (free-text severity/status/priority) with integer lookup ids
+# 'Open', 'open ' and 'OPEN' all map to the same id; unknown values abort the migration
+def migrate_categoricals(conn):
+    conn.commit()
+    cursor = conn.cursor()
+    migrated = False
+
+    try:
+        cursor.execute("BEGIN")
+        for table, (ddl, columns, coded) in NORMALIZED_TABLES.items():
+            existing = [r[1] for r in cursor.execute(f"PRAGMA table_info({table})")]
+            if not any(old in existing for old, _ in coded.values()):
+                continue
+
+            select_exprs = []
+            for column in columns:
+                if column not in coded:
+                    select_exprs.append(column)
+                    continue
+
+                old, lookup = coded[column]
+                unknown = cursor.execute(f"""
+                    SELECT DISTINCT {old} FROM {table}
+                    WHERE {old} IS NOT NULL
+                      AND LOWER(TRIM({old})) NOT IN (SELECT label FROM {lookup})
+                """).fetchall()
+                if unknown:
+                    raise ValueError(f"{table}.{old} has unknown values: {[r[0] for r in unknown]}")
+
+                select_exprs.append(
+                    f"COALESCE((SELECT id FROM {lookup} WHERE label = LOWER(TRIM({table}.{old}))), 1)"
+                )
+
+            cursor.execute(ddl.format(name=f"{table}_new"))
+            cursor.execute(f"""
+                INSERT INTO {table}_new ({", ".join(columns)})
+                SELECT {", ".join(select_exprs)} FROM {table}
+            """)
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            migrated = True
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if migrated:
+        conn.execute("VACUUM")
+    return migrated
+
+
+# per-table version counters, bumped by triggers on every write
+# (lets pages check "did this table change?" without querying it)
+def create_change_tracking(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+    for table in TRACKED_TABLES:
+        cursor.execute(
+            "INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)",
+            (table,)
+        )
+        for suffix, event in [("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")]:
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix}
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE table_versions SET version = version + 1
+                WHERE table_name = '{table}';
+            END
+            """)
+
+
+# tables rolled up per day: table -> (domain, date column, level column)
+TREND_SOURCES = {
+    "cyber_incidents": ("incidents", "date", "severity_id"),
+    "it_tickets": ("tickets", "created_date", "priority_id"),
+}
+
+DONE_STATUSES = "(SELECT id FROM statuses WHERE label IN ('resolved', 'closed'))"
+
+
+def _trend_upsert(domain, day, level, opened="0", resolved="0", seconds="0", where="true"):
+    return f"""
+        INSERT INTO trend_rollups (domain, day, level_id, opened, resolved, resolve_seconds)
+        SELECT '{domain}', {day}, {level}, {opened}, {resolved}, {seconds}
+        WHERE {where}
+        ON CONFLICT (domain, day, level_id) DO UPDATE SET
+            opened = opened + excluded.opened,
+            resolved = resolved + excluded.resolved,
+            resolve_seconds = resolve_seconds + excluded.resolve_seconds;
+    """
+
+
+# daily opened/resolved counts per severity/priority, kept up to date by triggers
+# (read by app.data.trends, so trend charts never scan the base tables)
+# resolutions are events recorded when the status changes to resolved/closed; rows inserted
+# already resolved (e.g. csv loads) are booked on their own date with an unknown (0 s) resolve time;
+# rows resolved before this table existed have no resolution time and are not counted
+# rows without a date are booked on their insert day (from change_log, today if compacted away)
+def create_trend_rollups(cursor):
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trend_rollups'"
+    ).fetchone()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS trend_rollups (
+        domain TEXT NOT NULL,
+        day TEXT NOT NULL,
+        level_id INTEGER NOT NULL,
+        opened INTEGER NOT NULL DEFAULT 0,
+        resolved INTEGER NOT NULL DEFAULT 0,
+        resolve_seconds REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (domain, day, level_id)
+    ) WITHOUT ROWID
+    """)
+
+    for table, (domain, date_col, level) in TREND_SOURCES.items():
+        inserted_on = f"""(SELECT changed_at FROM change_log
+                              WHERE table_name = '{table}' AND row_id = old.id AND op = 'I'
+                              ORDER BY seq DESC LIMIT 1)"""
+        new_day = f"date(COALESCE(new.{date_col}, 'now'))"
+        # coalesce stops at the first non-null value, so dated rows never read change_log
+        old_day = f"date(COALESCE(old.{date_col}, {inserted_on}, 'now'))"
+        # rows without a date were opened today (0 seconds to resolve if resolved right away)
+        seconds = f"MAX(0, (julianday('now') - julianday(COALESCE(new.{date_col}, 'now'))) * 86400)"
+
+        # older databases have the earlier versions of these triggers
+        for suffix in ["ai", "ad", "au_bucket", "au_status", "fill_date"]:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_trend_{suffix}")
+
+        cursor.execute(f"""
+        CREATE TRIGGER {table}_trend_ai AFTER INSERT ON {table}
+        BEGIN
+            {_trend_upsert(domain, new_day, f"new.{level}", opened="1")}
+            {_trend_upsert(domain, new_day, f"new.{level}", resolved="1",
+                           where=f"new.status_id IN {DONE_STATUSES}")}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER {table}_trend_ad AFTER DELETE ON {table}
+        BEGIN
+            {_trend_upsert(domain, old_day, f"old.{level}", opened="-1")}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER {table}_trend_au_bucket
+        AFTER UPDATE OF {date_col}, {level} ON {table}
+        BEGIN
+            {_trend_upsert(domain, old_day, f"old.{level}", opened="-1")}
+            {_trend_upsert(domain, new_day, f"new.{level}", opened="1")}
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER {table}_trend_au_status
+        AFTER UPDATE OF status_id ON {table}
+        WHEN new.status_id IN {DONE_STATUSES} AND old.status_id NOT IN {DONE_STATUSES}
+        BEGIN
+            {_trend_upsert(domain, "date('now')", f"new.{level}", resolved="1", seconds=seconds)}
+        END
+        """)
+
+        if not exists:
+            cursor.execute(f"""
+            INSERT INTO trend_rollups (domain, day, level_id, opened)
+            SELECT '{domain}', date(COALESCE({date_col}, 'now')), {level}, COUNT(*)
+            FROM {table}
+            GROUP BY 2, 3
+            """)
+
+
+# tables journaled into change_log -> captured columns (password_hash is never copied)
+CHANGE_LOG_TABLES = {
+    "cyber_incidents": ["id", "title", "severity_id", "status_id", "date"],
+    "it_tickets": ["id", "title", "priority_id", "status_id", "created_date"],
+    "datasets_metadata": ["id", "name", "source", "category", "size"],
+    "users": ["id", "username", "role"],
+}
+
+
+# append-only change journal for downstream consumers (see app.services.change_feed)
+# seq is AUTOINCREMENT so it never goes backwards, even after compaction
+def create_change_log(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D')),
+        payload TEXT NOT NULL,
+        changed_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS change_log_offsets (
+        consumer TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    for table, columns in CHANGE_LOG_TABLES.items():
+        new_row = "json_object(" + ", ".join(f"'{c}', new.{c}" for c in columns) + ")"
+        old_row = "json_object(" + ", ".join(f"'{c}', old.{c}" for c in columns) + ")"
+
+        for suffix, event, ref, op, payload in [
+            ("ai", "INSERT", "new", "I", new_row),
+            ("au", "UPDATE", "new", "U", new_row),
+            ("ad", "DELETE", "old", "D", old_row),
+        ]:
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_cdc_{suffix}
+            AFTER {event} ON {table}
+            BEGIN
+                INSERT INTO change_log (table_name, row_id, op, payload)
+                VALUES ('{table}', {ref}.id, '{op}', {payload});
+            END
+            """)
+
+
+# one row per user, loaded once per session by app.services.preferences
+def create_preferences_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS user_preferences (
+        username TEXT PRIMARY KEY,
+        theme TEXT DEFAULT 'Light',
+        notifications INTEGER DEFAULT 1,
+        auto_refresh INTEGER DEFAULT 1,
+        refresh_interval INTEGER DEFAULT 60,
+        chart_style TEXT DEFAULT 'Bar',
+        row_limit INTEGER DEFAULT 50,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+# login sessions behind the signed tokens of app.services.sessions
+# (only a sha-256 of the session id is stored; expires_at is unix seconds)
+def create_sessions_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sessions (
+        id_hash TEXT PRIMARY KEY,
+        username TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        expires_at REAL NOT NULL
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions(username)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
+
+
 def create_tables():
     conn = connect_database()
     cursor = conn.cursor()
@@ -14,16 +332,11 @@ def create_tables():
     )
     """)
 
+    # LOOKUP TABLES (severity / status / priority)
+    create_lookup_tables(cursor)
+
     # CYBER INCIDENTS TABLE
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS cyber_incidents (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        severity TEXT NOT NULL,
-        status TEXT DEFAULT 'open',
-        date TEXT
-    )
-    """)
+    cursor.execute(CYBER_INCIDENTS_DDL.format(name="cyber_incidents"))
 
     # DATASETS METADATA TABLE
     cursor.execute("""
@@ -37,15 +350,30 @@ def create_tables():
     """)
 
     # IT TICKETS TABLE
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS it_tickets (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        title TEXT NOT NULL,
-        priority TEXT NOT NULL,
-        status TEXT DEFAULT 'open',
-        created_date TEXT
-    )
-    """)
+    cursor.execute(IT_TICKETS_DDL.format(name="it_tickets"))
+
+    # older databases: convert the free-text columns to lookup ids
+    migrate_categoricals(conn)
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cyber_incidents_severity ON cyber_incidents(severity_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cyber_incidents_status ON cyber_incidents(status_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_it_tickets_priority ON it_tickets(priority_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_it_tickets_status ON it_tickets(status_id)")
+
+    # USER PREFERENCES TABLE
+    create_preferences_table(cursor)
+
+    # LOGIN SESSIONS
+    create_sessions_table(cursor)
+
+    # CHANGE TRACKING
+    create_change_tracking(cursor)
+
+    # TREND ROLLUPS
+    create_trend_rollups(cursor)
+
+    # CHANGE DATA CAPTURE
+    create_change_log(cursor)
 
     conn.commit()
     conn.close()
@@ -0,0 +1,70 @@
+from app.data.db import connect_database
+from app.data.schema import create_sessions_table
+
+
+#new session row for a logged in user
+def insert_session(id_hash, username, expires_at):
+    conn = connect_database()
+    cursor = conn.cursor()
+    create_sessions_table(cursor)
+
+    cursor.execute("""
+        INSERT INTO sessions (id_hash, username, expires_at)
+        VALUES (?, ?, ?)
+    """, (id_hash, username, expires_at))
+
+    conn.commit()
+    conn.close()
+
+
+#username and current role behind a live session (None if expired / revoked / user deleted)
+def get_session_user(id_hash, now):
+    conn = connect_database()
+    cursor = conn.cursor()
+    create_sessions_table(cursor)
+
+    cursor.execute("""
+        SELECT u.username, u.role, s.expires_at
+        FROM sessions s
+        JOIN users u ON u.username = s.username
+        WHERE s.id_hash = ? AND s.expires_at > ?
+    """, (id_hash, now))
+    row = cursor.fetchone()
+
+    conn.close()
+    return row
+
+
+#logout
+def delete_session(id_hash):
+    conn = connect_database()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM sessions WHERE id_hash = ?", (id_hash,))
+    conn.commit()
+    conn.close()
+
+
+#every session of one user (user deleted)
+def delete_user_sessions(username):
+    conn = connect_database()
+    cursor = conn.cursor()
+    create_sessions_table(cursor)
+
+    cursor.execute("DELETE FROM sessions WHERE username = ?", (username,))
+    conn.commit()
+    conn.close()
+
+
+#expired sessions -> number removed
+def delete_expired_sessions(now):
+    conn = connect_database()
+    cursor = conn.cursor()
+    create_sessions_table(cursor)
+
+    cursor.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+    removed = cursor.rowcount
+
+    conn.commit()
+    conn.close()
+    return removed
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DB_PATH = "DATA/intelligence_platform.db"
+# versions are published next to it as intelligence_platform_snapshot.<epoch ms>.db
+SNAPSHOT_PATH = "DATA/intelligence_platform_snapshot.db"
+
+# republish the snapshot when it is older than this
+SNAPSHOT_MAX_AGE = 300
+# but never more often than this, even if the data keeps changing
+SNAPSHOT_MIN_AGE = 10
+# bytes of the snapshot memory-mapped by readers
+SNAPSHOT_MMAP_SIZE = 256 * 1024 * 1024
+# versions kept on disk: the current one and the one readers may still have open
+SNAPSHOT_KEEP = 2
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_publisher = None
+_published_versions = None
+_wanted_versions = None
+# pointer to the current version: (epoch ms, path)
+_current = None
+
+
+# published versions on disk, oldest first
+def _snapshot_versions():
+    base = Path(SNAPSHOT_PATH)
+    versions = []
+    for path in base.parent.glob(f"{base.stem}.*{base.suffix}"):
+        stamp = path.name[len(base.stem) + 1:len(path.name) - len(base.suffix)]
+        if stamp.isdigit():
+            versions.append((int(stamp), path))
+    return sorted(versions)
+
+
+def _current_snapshot():
+    global _current
+    if _current is None:
+        versions = _snapshot_versions()
+        _current = versions[-1] if versions else None
+    return _current
+
+
+def snapshot_published_at():
+    current = _current_snapshot()
+    return None if current is None else current[0] / 1000
+
+
+def snapshot_age():
+    published = snapshot_published_at()
+    return None if published is None else max(0.0, time.time() - published)
+
+
+# copies the live database with the backup API into a new versioned file and points
+# readers at it; a published file is never renamed over (Windows refuses that while
+# a reader has it open), readers of the previous version keep their consistent view
+def publish_snapshot(versions=None):
+    global _current, _published_versions
+
+    with _lock:
+        current = _current_snapshot()
+        stamp = int(time.time() * 1000)
+        if current is not None:
+            stamp = max(stamp, current[0] + 1)
+        base = Path(SNAPSHOT_PATH)
+        path = base.with_name(f"{base.stem}.{stamp}{base.suffix}")
+        tmp_path = f"{path}.tmp"
+        source = sqlite3.connect(DB_PATH)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, path)
+        _current = (stamp, path)
+        _published_versions = versions
+
+        # superseded versions still open somewhere are retried on the next publish
+        for _, old_path in _snapshot_versions()[:-SNAPSHOT_KEEP]:
+            try:
+                old_path.unlink()
+            except OSError:
+                pass
+        return snapshot_published_at()
+
+
+# seconds until the snapshot is due: SNAPSHOT_MAX_AGE, or SNAPSHOT_MIN_AGE once the data moved
+def _seconds_until_due():
+    age = snapshot_age()
+    if age is None:
+        return 0.0
+    changed = _wanted_versions is not None and _wanted_versions != _published_versions
+    return (SNAPSHOT_MIN_AGE if changed else SNAPSHOT_MAX_AGE) - age
+
+
+# background thread: republishes whenever the snapshot is due, so no page rerun waits for a copy
+def _publish_loop():
+    while True:
+        wait = _seconds_until_due()
+        if wait > 0:
+            _wake.wait(wait)
+            _wake.clear()
+            continue
+        try:
+            publish_snapshot(_wanted_versions)
+        except (sqlite3.Error, OSError):
+            # keep serving the current snapshot, try again later
+            time.sleep(SNAPSHOT_MIN_AGE)
+
+
+# versions: table versions from auto_refresh.get_table_versions(); when they moved
+# since the last publish the publisher republishes early (but not within SNAPSHOT_MIN_AGE)
+# only the very first snapshot is published here, on the caller's thread
+def ensure_snapshot(versions=None):
+    global _publisher, _wanted_versions
+
+    published = snapshot_published_at()
+    if published is None:
+        published = publish_snapshot(versions)
+    if versions is not None and versions != _wanted_versions:
+        _wanted_versions = versions
+        _wake.set()
+    with _lock:
+        if _publisher is None:
+            _publisher = threading.Thread(target=_publish_loop, name="snapshot-publisher", daemon=True)
+            _publisher.start()
+    return published
+
+
+# a published version is never modified, so immutable=1 is safe:
+# no locks, no change checks, reads served from mmap
+def connect_snapshot():
+    _, path = _current_snapshot()
+    uri = f"file:{path.resolve().as_posix()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.execute(f"PRAGMA mmap_size = {SNAPSHOT_MMAP_SIZE}")
+    return conn
@@ -0,0 +1,67 @@
+from app.data.db import connect_database
+from app.data.lookups import label_for, labels
+
+# SQL mapping a daily bucket onto the requested bucket
+BUCKETS = {
+    "day": "day",
+    "week": "date(day, '-6 days', 'weekday 1')",  # monday of that week
+    "month": "strftime('%Y-%m-01', day)",
+}
+
+# trend domain -> lookup table of its level column
+DOMAIN_LEVELS = {
+    "incidents": "severity_levels",
+    "tickets": "priorities",
+}
+
+
+def _range(start, end):
+    return start or "0000-01-01", end or "9999-12-31"
+
+
+# opened per bucket and severity/priority -> (bucket dates, {label: [counts]})
+def get_trend(domain, bucket="day", start=None, end=None):
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+    lookup = DOMAIN_LEVELS[domain]
+
+    conn = connect_database()
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT {BUCKETS[bucket]} AS bucket, level_id, SUM(opened)
+        FROM trend_rollups
+        WHERE domain = ? AND day BETWEEN ? AND ?
+        GROUP BY bucket, level_id
+        ORDER BY bucket
+    """, (domain,) + _range(start, end))
+    rows = cursor.fetchall()
+    conn.close()
+
+    buckets = list(dict.fromkeys(row[0] for row in rows))
+    position = {b: i for i, b in enumerate(buckets)}
+    series = {label: [0] * len(buckets) for label in labels(lookup)}
+    for bucket_start, level_id, opened in rows:
+        series[label_for(lookup, level_id)][position[bucket_start]] = opened
+    return buckets, series
+
+
+# mean time to resolve in hours per severity/priority (None = nothing resolved)
+def get_mttr(domain, start=None, end=None):
+    lookup = DOMAIN_LEVELS[domain]
+    mttr = {label: None for label in labels(lookup)}
+
+    conn = connect_database()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT level_id, SUM(resolved), SUM(resolve_seconds)
+        FROM trend_rollups
+        WHERE domain = ? AND day BETWEEN ? AND ?
+        GROUP BY level_id
+    """, (domain,) + _range(start, end))
+    rows = cursor.fetchall()
+    conn.close()
+
+    for level_id, resolved, seconds in rows:
+        if resolved:
+            mttr[label_for(lookup, level_id)] = seconds / resolved / 3600
+    return mttr
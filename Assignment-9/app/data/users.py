@@ -49,6 +49,10 @@ def update_user_role(username, new_role):
     conn.commit()
     conn.close()
 
+    # open sessions pick up the new role (and its permissions) on their next page run
+    forget_user(username)
+    forget_permissions(username)
+
 #deleting user
 def delete_user(username):
     conn = connect_database()
@@ -58,7 +62,19 @@ def delete_user(username):
     conn.commit()
     conn.close()
 
+    revoke_user_sessions(username)
+    forget_permissions(username)
+
 import bcrypt
+import time
+from app.services import metrics
+from app.services.rate_limit import format_wait, record_failure, record_success, retry_after
+from app.services.authz import forget_permissions
+from app.services.sessions import forget_user, revoke_user_sessions
+
+metrics.counter("platform_logins_total", "Login attempts by outcome", ["result"])
+metrics.histogram("platform_password_check_seconds", "Time spent in bcrypt.checkpw",
+                  buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
 
 def register_user(username, password, role="user"):
     existing = get_user_by_username(username)
@@ -72,15 +88,32 @@ def register_user(username, password, role="user"):
     return True, "Account created successfully"
 
 
-def login_user(username, password):
+# client = ip address or session id (None = username budget only);
+# locked-out usernames/clients are turned away before any bcrypt work
+def login_user(username, password, client=None):
+    wait = retry_after(username, client)
+    if wait > 0:
+        metrics.inc("platform_logins_total", "throttled")
+        return False, f"Too many failed attempts, try again in {format_wait(wait)}"
+
     user = get_user_by_username(username)
     if not user:
+        metrics.inc("platform_logins_total", "unknown_user")
+        record_failure(username, client)
         return False, "User not found"
 
     stored_hash = user[2]
     password_bytes = password.encode("utf-8")
 
-    if bcrypt.checkpw(password_bytes, stored_hash.encode("utf-8")):
+    start = time.perf_counter()
+    valid = bcrypt.checkpw(password_bytes, stored_hash.encode("utf-8"))
+    metrics.observe("platform_password_check_seconds", time.perf_counter() - start)
+
+    if valid:
+        metrics.inc("platform_logins_total", "success")
+        record_success(username, client)
         return True, user[3]
     else:
+        metrics.inc("platform_logins_total", "bad_password")
+        record_failure(username, client)
         return False, "Incorrect password"
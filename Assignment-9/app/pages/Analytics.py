@@ -1,19 +1,35 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from app.data.db import connect_database
+from app.data.snapshot import SNAPSHOT_MAX_AGE, SNAPSHOT_MIN_AGE, connect_snapshot, ensure_snapshot, publish_snapshot, snapshot_age
+from app.data.lookups import decode_frame
+from app.data.trends import BUCKETS, get_mttr, get_trend
+from app.services.auto_refresh import get_table_versions, watch_tables
+from app.services.preferences import load_preferences
+from app.services.profiler import finish_profile, phase, profile_panel, start_profile
+from app.services.sessions import current_session
 
 st.set_page_config(page_title="Analytics", page_icon="📈", layout="wide")
 
-if "logged_in" not in st.session_state or not st.session_state.logged_in:
+# signed token -> username + current role (cached, re-checked every few seconds)
+if not current_session():
     st.error("Please log in first.")
     st.stop()
 
-def load_df(query):
-    conn=connect_database()
-    df=pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+# opt-in from the admin sidebar panel
+start_profile("Analytics", st.session_state.get("profiling", False))
+
+# reads the read-only snapshot, so long scans never block CRUD writers
+# snapshot_time is only part of the cache key: same snapshot -> no query
+# (4 queries, current + previous snapshot; older frames are evicted)
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_df(query, snapshot_time):
+    with phase("db"):
+        conn=connect_snapshot()
+        df=pd.read_sql_query(query, conn)
+        conn.close()
+    with phase("transform"):
+        return decode_frame(df)
 
 def safe_lower(series):
     return series.astype(str).str.lower()
@@ -25,10 +41,16 @@ with st.sidebar:
 
 st.title("📈 Analytics & Reporting")
 
-users_df=load_df("SELECT * FROM users")
-incidents_df=load_df("SELECT * FROM cyber_incidents")
-tickets_df=load_df("SELECT * FROM it_tickets")
-datasets_df=load_df("SELECT * FROM datasets_metadata")
+versions=get_table_versions()
+if st.button("🔄 Refresh snapshot"):
+    publish_snapshot(versions)
+snapshot_time=ensure_snapshot(versions=versions)
+st.caption(f"Read-only snapshot taken {snapshot_age() or 0:.0f}s ago (republished after changes, at most every {SNAPSHOT_MIN_AGE}s, and at least every {SNAPSHOT_MAX_AGE // 60} min).")
+
+users_df=load_df("SELECT * FROM users", snapshot_time)
+incidents_df=load_df("SELECT * FROM cyber_incidents", snapshot_time)
+tickets_df=load_df("SELECT * FROM it_tickets", snapshot_time)
+datasets_df=load_df("SELECT * FROM datasets_metadata", snapshot_time)
 
 m1, m2, m3, m4=st.columns(4)
 m1.metric("Users", len(users_df))
@@ -38,7 +60,7 @@ m4.metric("Datasets", len(datasets_df))
 
 st.divider()
 
-tab1, tab2, tab3=st.tabs(["🧑 Users", "🛡️ Incidents", "🧾 Tickets"])
+tab1, tab2, tab3, tab4=st.tabs(["🧑 Users", "🛡️ Incidents", "🧾 Tickets", "📈 Trends"])
 
 with tab1:
     st.subheader("Users Overview")
@@ -129,3 +151,37 @@ with tab3:
 
         with st.expander("📄 Show tickets table"):
             st.dataframe(tickets_df, use_container_width=True)
+
+# reads the trigger-maintained trend_rollups table, not the incident/ticket tables
+with tab4:
+    st.subheader("Trends")
+
+    c1, c2, c3=st.columns(3)
+    domain=c1.selectbox("Data", ["incidents", "tickets"], key="trend_domain")
+    bucket=c2.selectbox("Group by", list(BUCKETS), index=2, key="trend_bucket")
+    start=c3.date_input("From", value=None, key="trend_start")
+    start=start.isoformat() if start else None
+
+    with phase("db"):
+        buckets, series=get_trend(domain, bucket, start)
+    if not buckets:
+        st.info("No data in this period.")
+    else:
+        with phase("transform"):
+            trend_df=pd.DataFrame(series, index=buckets).rename_axis("period").reset_index()
+            trend_df=trend_df.melt(id_vars="period", var_name="level", value_name="opened")
+        fig=px.line(trend_df, x="period", y="opened", color="level", markers=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.write("Mean time to resolve")
+    with phase("db"):
+        mttr=get_mttr(domain, start)
+    for col, (label, hours) in zip(st.columns(len(mttr)), mttr.items()):
+        col.metric(label, "-" if hours is None else f"{hours:.1f} h")
+
+finish_profile()
+profile_panel("Analytics", st.session_state.role=="admin")
+
+prefs=load_preferences()
+if prefs["auto_refresh"]:
+    watch_tables(["users", "cyber_incidents", "it_tickets", "datasets_metadata"], prefs["refresh_interval"])
@@ -1,25 +1,74 @@
+import os
+import shutil
+import tempfile
 import streamlit as st
 import pandas as pd
 from app.data.db import connect_database
+from app.data.queries import run_named_query
+from app.data.lookups import decode_frame, id_for
+from app.services.preferences import clear_preferences
+from app.services.export import FORMATS, export_path, export_query
+from app.services.profiler import finish_profile, phase, profile_panel, start_profile
+from app.services.sessions import current_session, end_session
+from app.services.authz import allowed_actions, can, require
 
 st.set_page_config(page_title="CRUD", page_icon="⚙️", layout="wide")
 
-if "logged_in" not in st.session_state or not st.session_state.logged_in:
+# signed token -> username + current role (cached, re-checked every few seconds)
+if not current_session():
     st.error("Please log in first.")
     st.stop()
 
-def read_df(query, params=()):
-    conn=connect_database()
-    df=pd.read_sql_query(query, conn, params=params)
-    conn.close()
-    return df
+# opt-in from the admin sidebar panel; named queries add their own db time
+start_profile("CRUD", st.session_state.get("profiling", False))
+
+def read_df(query_name, params=()):
+    columns, rows=run_named_query(query_name, params)
+    with phase("transform"):
+        return decode_frame(pd.DataFrame(rows, columns=columns))
+
+# one temp directory per session for its exports (removed on logout)
+def export_dir():
+    path=st.session_state.get("export_dir")
+    if not path or not os.path.isdir(path):
+        path=tempfile.mkdtemp(prefix="export_")
+        st.session_state.export_dir=path
+    return path
+
+def clear_exports():
+    path=st.session_state.pop("export_dir", None)
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+# the export is streamed to a temp file (constant memory) and the file handed to the download button
+# a new export replaces the previous file of that table, so at most one per table stays on disk
+def export_button(name):
+    if not can("export"):
+        return
+    c1, c2, c3=st.columns([1, 1, 2])
+    fmt=c1.selectbox("Export format", FORMATS, key=f"export_fmt_{name}")
+    if c2.button("📤 Prepare export", key=f"export_{name}"):
+        old=st.session_state.pop(f"export_path_{name}", None)
+        if old and os.path.exists(old):
+            os.remove(old)
+        try:
+            path=export_path(name, export_dir(), fmt)
+            export_query(name, path, fmt)
+            st.session_state[f"export_path_{name}"]=path
+        except RuntimeError as e:
+            st.error(str(e))
+    path=st.session_state.get(f"export_path_{name}")
+    if path and os.path.exists(path):
+        with open(path, "rb") as f:
+            c3.download_button("⬇️ Download " + os.path.basename(path), f, file_name=os.path.basename(path), key=f"download_{name}")
 
 def run_sql(query, params=()):
-    conn=connect_database()
-    cur=conn.cursor()
-    cur.execute(query, params)
-    conn.commit()
-    conn.close()
+    with phase("db"):
+        conn=connect_database()
+        cur=conn.cursor()
+        cur.execute(query, params)
+        conn.commit()
+        conn.close()
 
 with st.sidebar:
     st.write("👤 Account")
@@ -27,24 +76,29 @@ with st.sidebar:
     st.write(f"Role: {str(st.session_state.role).upper()}")
     st.divider()
     if st.button("🚪 Logout", use_container_width=True):
-        st.session_state.logged_in=False
-        st.session_state.username=""
-        st.session_state.role="user"
+        clear_preferences()
+        clear_exports()
+        end_session()
         st.experimental_rerun()
 
 st.title("⚙️ CRUD Operations")
 
 table_pick=st.selectbox("Choose section", ["🛡️ Cyber Incidents", "🛠️ IT Tickets", "📚 Datasets"], key="crud_section")
-action=st.radio("Choose action", ["Create", "Read", "Update", "Delete"], horizontal=True)
+# only the actions this role may perform (see authz.ACTION_PERMISSIONS)
+action=st.radio("Choose action", allowed_actions(), horizontal=True)
+if action is None:
+    st.info("Your role has no access to these records.")
+    st.stop()
 
 st.divider()
 
 if table_pick=="🛡️ Cyber Incidents":
     table_name="cyber_incidents"
-    df=read_df("SELECT * FROM cyber_incidents ORDER BY id DESC LIMIT 200")
+    df=read_df("recent_incidents", (200,))
 
     if action=="Read":
         st.dataframe(df, use_container_width=True)
+        export_button("cyber_incidents")
 
     elif action=="Create":
         with st.form("create_incident"):
@@ -54,12 +108,13 @@ if table_pick=="🛡️ Cyber Incidents":
             submitted=st.form_submit_button("Add")
 
         if submitted:
+            require("create")
             if title=="":
                 st.error("Title is required")
             else:
                 run_sql(
-                    "INSERT INTO cyber_incidents (title, severity, status) VALUES (?, ?, ?)",
-                    (title, severity, status)
+                    "INSERT INTO cyber_incidents (title, severity_id, status_id, date) VALUES (?, ?, ?, date('now'))",
+                    (title, id_for("severity_levels", severity), id_for("statuses", status))
                 )
                 st.success("Incident added")
                 st.experimental_rerun()
@@ -71,7 +126,8 @@ if table_pick=="🛡️ Cyber Incidents":
             pick_id=st.selectbox("Pick incident ID", df["id"])
             new_status=st.selectbox("New status", ["open","in progress","resolved"])
             if st.button("Update"):
-                run_sql("UPDATE cyber_incidents SET status=? WHERE id=?", (new_status, int(pick_id)))
+                require("update")
+                run_sql("UPDATE cyber_incidents SET status_id=? WHERE id=?", (id_for("statuses", new_status), int(pick_id)))
                 st.success("Updated")
                 st.experimental_rerun()
 
@@ -82,15 +138,17 @@ if table_pick=="🛡️ Cyber Incidents":
             del_id=st.selectbox("Pick incident ID to delete", df["id"], key="del_inc")
             st.warning("This cannot be undone")
             if st.button("Delete"):
+                require("delete", "Only analysts and admins can delete incidents.")
                 run_sql("DELETE FROM cyber_incidents WHERE id=?", (int(del_id),))
                 st.success("Deleted")
                 st.experimental_rerun()
 
 elif table_pick=="🛠️ IT Tickets":
-    df=read_df("SELECT * FROM it_tickets ORDER BY id DESC LIMIT 200")
+    df=read_df("recent_tickets", (200,))
 
     if action=="Read":
         st.dataframe(df, use_container_width=True)
+        export_button("it_tickets")
 
     elif action=="Create":
         with st.form("create_ticket"):
@@ -100,12 +158,13 @@ elif table_pick=="🛠️ IT Tickets":
             submitted=st.form_submit_button("Add")
 
         if submitted:
+            require("create")
             if title=="":
                 st.error("Title is required")
             else:
                 run_sql(
-                    "INSERT INTO it_tickets (title, status, priority) VALUES (?, ?, ?)",
-                    (title, status, priority)
+                    "INSERT INTO it_tickets (title, status_id, priority_id, created_date) VALUES (?, ?, ?, date('now'))",
+                    (title, id_for("statuses", status), id_for("priorities", priority))
                 )
                 st.success("Ticket added")
                 st.experimental_rerun()
@@ -117,7 +176,8 @@ elif table_pick=="🛠️ IT Tickets":
             pick_id=st.selectbox("Pick ticket ID", df["id"])
             new_status=st.selectbox("New status", ["open","in progress","closed"])
             if st.button("Update"):
-                run_sql("UPDATE it_tickets SET status=? WHERE id=?", (new_status, int(pick_id)))
+                require("update")
+                run_sql("UPDATE it_tickets SET status_id=? WHERE id=?", (id_for("statuses", new_status), int(pick_id)))
                 st.success("Updated")
                 st.experimental_rerun()
 
@@ -128,15 +188,17 @@ elif table_pick=="🛠️ IT Tickets":
             del_id=st.selectbox("Pick ticket ID to delete", df["id"], key="del_ticket")
             st.warning("This cannot be undone")
             if st.button("Delete"):
+                require("delete", "Only analysts and admins can delete tickets.")
                 run_sql("DELETE FROM it_tickets WHERE id=?", (int(del_id),))
                 st.success("Deleted")
                 st.experimental_rerun()
 
 else:
-    df=read_df("SELECT * FROM datasets_metadata ORDER BY id DESC LIMIT 200")
+    df=read_df("recent_datasets", (200,))
 
     if action=="Read":
         st.dataframe(df, use_container_width=True)
+        export_button("datasets_metadata")
 
     elif action=="Create":
         with st.form("create_dataset"):
@@ -147,6 +209,7 @@ else:
             submitted=st.form_submit_button("Add")
 
         if submitted:
+            require("create")
             if name=="":
                 st.error("Name is required")
             else:
@@ -164,6 +227,7 @@ else:
             pick_id=st.selectbox("Pick dataset ID", df["id"])
             new_size=st.number_input("New size", min_value=0, step=1)
             if st.button("Update"):
+                require("update")
                 run_sql("UPDATE datasets_metadata SET size=? WHERE id=?", (int(new_size), int(pick_id)))
                 st.success("Updated")
                 st.experimental_rerun()
@@ -175,6 +239,10 @@ else:
             del_id=st.selectbox("Pick dataset ID to delete", df["id"], key="del_data")
             st.warning("This cannot be undone")
             if st.button("Delete"):
+                require("delete", "Only analysts and admins can delete datasets.")
                 run_sql("DELETE FROM datasets_metadata WHERE id=?", (int(del_id),))
                 st.success("Deleted")
                 st.experimental_rerun()
+
+finish_profile()
+profile_panel("CRUD", st.session_state.role=="admin")
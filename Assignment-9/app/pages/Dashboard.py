@@ -1,22 +1,52 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from app.data.db import connect_database
+from app.data.queries import run_named_query
+from app.data.lookups import decode_frame
+from app.services.dashboard_metrics import get_incident_metrics, get_ticket_metrics, get_dataset_metrics
+from app.services.auto_refresh import get_table_versions, watch_tables
+from app.services.preferences import load_preferences, set_preference, flush_preferences, clear_preferences
+from app.services.profiler import finish_profile, phase, profile_panel, start_profile
+from app.services.sessions import current_session, end_session
 
 st.set_page_config(page_title="Dashboard", page_icon="🧩", layout="wide")
 
-if "logged_in" not in st.session_state or not st.session_state.logged_in:
+# signed token -> username + current role (cached, re-checked every few seconds)
+if not current_session():
     st.error("Please log in first!")
     st.stop()
 
-def read_table(sql):
-    conn=connect_database()
-    df=pd.read_sql_query(sql, conn)
-    conn.close()
-    return df
-
-def lower_col(df, col):
-    return df[col].astype(str).str.lower() if col in df.columns else pd.Series([], dtype=str)
+# opt-in from the admin sidebar panel; named queries add their own db time
+start_profile("Dashboard", st.session_state.get("profiling", False))
+
+# version is only part of the cache key: same version -> no query
+# versions only grow, so old frames are evicted: ~2 entries per table / row limit
+@st.cache_data(show_spinner=False, max_entries=12)
+def read_table(query_name, params, version):
+    columns, rows=run_named_query(query_name, params)
+    with phase("transform"):
+        return decode_frame(pd.DataFrame(rows, columns=columns))
+
+METRICS={
+    "incidents": get_incident_metrics,
+    "tickets": get_ticket_metrics,
+    "datasets": get_dataset_metrics,
+}
+
+# card values + chart counts come pre-aggregated from SQL (current + previous version per domain)
+@st.cache_data(show_spinner=False, max_entries=6)
+def read_metrics(domain, version):
+    return METRICS[domain]()
+
+def count_chart(counts, label, style):
+    names=[str(k) for k in counts.keys()]
+    values=list(counts.values())
+    if style=="Bar":
+        return px.bar(x=names, y=values, labels={"x":label,"y":"Count"})
+    elif style=="Pie":
+        return px.pie(values=values, names=names)
+    else:
+        return px.line(x=names, y=values, markers=True, labels={"x":label,"y":"Count"})
 
 with st.sidebar:
     st.write("👤 Account")
@@ -24,33 +54,41 @@ with st.sidebar:
     st.write(f"Role: {str(st.session_state.role).upper()}")
     st.divider()
     if st.button("🚪 Logout", use_container_width=True):
-        st.session_state.logged_in=False
-        st.session_state.username=""
-        st.session_state.role="user"
+        clear_preferences()
+        end_session()
         st.experimental_rerun()
 
 st.title("🧩 Multi-Domain Dashboard")
 
+prefs=load_preferences()
+chart_styles=["Bar", "Pie", "Line"]
+row_limits=[50, 100, 200]
+
 top1, top2, top3=st.columns([2, 1, 1])
 with top2:
-    chart_style=st.selectbox("Chart style", ["Bar", "Pie", "Line"], key="chart_style")
+    chart_style=st.selectbox("Chart style", chart_styles, index=chart_styles.index(prefs["chart_style"]) if prefs["chart_style"] in chart_styles else 0, key="chart_style")
 with top3:
-    row_limit=st.selectbox("Rows", [50, 100, 200], key="row_limit")
+    row_limit=st.selectbox("Rows", row_limits, index=row_limits.index(prefs["row_limit"]) if prefs["row_limit"] in row_limits else 0, key="row_limit")
+
+set_preference("chart_style", chart_style)
+set_preference("row_limit", row_limit)
+
+versions=get_table_versions()
 
 tab_a, tab_b, tab_c=st.tabs(["🛡️ Security", "🛠️ IT Ops", "📚 Data"])
 
 with tab_a:
     st.subheader("🛡️ Cyber Incidents")
-    df=read_table(f"SELECT * FROM cyber_incidents LIMIT {row_limit}")
+    m=read_metrics("incidents", versions.get("cyber_incidents", 0))
 
-    if df.empty:
+    if m["total"]==0:
         st.warning("No incidents data available")
     else:
         a1, a2, a3, a4=st.columns(4)
-        a1.metric("Incidents", len(df))
-        a2.metric("Critical", int((lower_col(df, "severity")=="critical").sum()) if "severity" in df.columns else 0)
-        a3.metric("High", int((lower_col(df, "severity")=="high").sum()) if "severity" in df.columns else 0)
-        a4.metric("Resolved", int((lower_col(df, "status")=="resolved").sum()) if "status" in df.columns else 0)
+        a1.metric("Incidents", m["total"])
+        a2.metric("Critical", m["critical"])
+        a3.metric("High", m["high"])
+        a4.metric("Resolved", m["resolved"])
 
         st.divider()
 
@@ -58,42 +96,28 @@ with tab_a:
 
         with left:
             st.write("Severity summary")
-            if "severity" in df.columns:
-                counts=df["severity"].value_counts()
-                if chart_style=="Bar":
-                    fig=px.bar(x=counts.index, y=counts.values, labels={"x":"Severity","y":"Count"})
-                elif chart_style=="Pie":
-                    fig=px.pie(values=counts.values, names=counts.index)
-                else:
-                    fig=px.line(x=counts.index, y=counts.values, markers=True, labels={"x":"Severity","y":"Count"})
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No severity column found.")
+            st.plotly_chart(count_chart(m["by_severity"], "Severity", chart_style), use_container_width=True)
 
         with right:
             st.write("Status summary")
-            if "status" in df.columns:
-                counts=df["status"].value_counts()
-                fig=px.pie(values=counts.values, names=counts.index)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No status column found.")
+            st.plotly_chart(count_chart(m["by_status"], "Status", "Pie"), use_container_width=True)
 
         with st.expander("📋 View incidents table"):
+            df=read_table("dashboard_incidents", (row_limit,), versions.get("cyber_incidents", 0))
             st.dataframe(df, use_container_width=True)
 
 with tab_b:
     st.subheader("🛠️ IT Tickets")
-    df=read_table(f"SELECT * FROM it_tickets LIMIT {row_limit}")
+    m=read_metrics("tickets", versions.get("it_tickets", 0))
 
-    if df.empty:
+    if m["total"]==0:
         st.warning("No tickets data available")
     else:
         b1, b2, b3, b4=st.columns(4)
-        b1.metric("Tickets", len(df))
-        b2.metric("Open", int((lower_col(df, "status")=="open").sum()) if "status" in df.columns else 0)
-        b3.metric("In Progress", int((lower_col(df, "status")=="in progress").sum()) if "status" in df.columns else 0)
-        b4.metric("Closed", int((lower_col(df, "status")=="closed").sum()) if "status" in df.columns else 0)
+        b1.metric("Tickets", m["total"])
+        b2.metric("Open", m["open"])
+        b3.metric("In Progress", m["in_progress"])
+        b4.metric("Closed", m["closed"])
 
         st.divider()
 
@@ -101,42 +125,28 @@ with tab_b:
 
         with left:
             st.write("Ticket status")
-            if "status" in df.columns:
-                counts=df["status"].value_counts()
-                if chart_style=="Bar":
-                    fig=px.bar(x=counts.index, y=counts.values, labels={"x":"Status","y":"Count"})
-                elif chart_style=="Pie":
-                    fig=px.pie(values=counts.values, names=counts.index)
-                else:
-                    fig=px.line(x=counts.index, y=counts.values, markers=True, labels={"x":"Status","y":"Count"})
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No status column found.")
+            st.plotly_chart(count_chart(m["by_status"], "Status", chart_style), use_container_width=True)
 
         with right:
             st.write("Priority split")
-            if "priority" in df.columns:
-                counts=df["priority"].value_counts()
-                fig=px.pie(values=counts.values, names=counts.index)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No priority column found.")
+            st.plotly_chart(count_chart(m["by_priority"], "Priority", "Pie"), use_container_width=True)
 
         with st.expander("📋 View tickets table"):
+            df=read_table("dashboard_tickets", (row_limit,), versions.get("it_tickets", 0))
             st.dataframe(df, use_container_width=True)
 
 with tab_c:
     st.subheader("📚 Datasets")
-    df=read_table(f"SELECT * FROM datasets_metadata LIMIT {row_limit}")
+    m=read_metrics("datasets", versions.get("datasets_metadata", 0))
 
-    if df.empty:
+    if m["total"]==0:
         st.warning("No datasets data available")
     else:
         c1, c2, c3, c4=st.columns(4)
-        c1.metric("Datasets", len(df))
-        c2.metric("Categories", df["category"].nunique() if "category" in df.columns else 0)
-        c3.metric("Sources", df["source"].nunique() if "source" in df.columns else 0)
-        c4.metric("Records", len(df))
+        c1.metric("Datasets", m["total"])
+        c2.metric("Categories", m["categories"])
+        c3.metric("Sources", m["sources"])
+        c4.metric("Records", m["total"])
 
         st.divider()
 
@@ -144,26 +154,20 @@ with tab_c:
 
         with left:
             st.write("By category")
-            if "category" in df.columns:
-                counts=df["category"].value_counts()
-                if chart_style=="Bar":
-                    fig=px.bar(x=counts.index, y=counts.values, labels={"x":"Category","y":"Count"})
-                elif chart_style=="Pie":
-                    fig=px.pie(values=counts.values, names=counts.index)
-                else:
-                    fig=px.line(x=counts.index, y=counts.values, markers=True, labels={"x":"Category","y":"Count"})
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No category column found.")
+            st.plotly_chart(count_chart(m["by_category"], "Category", chart_style), use_container_width=True)
 
         with right:
             st.write("By source")
-            if "source" in df.columns:
-                counts=df["source"].value_counts()
-                fig=px.pie(values=counts.values, names=counts.index)
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No source column found.")
+            st.plotly_chart(count_chart(m["by_source"], "Source", "Pie"), use_container_width=True)
 
         with st.expander("📋 View datasets table"):
+            df=read_table("dashboard_datasets", (row_limit,), versions.get("datasets_metadata", 0))
             st.dataframe(df, use_container_width=True)
+
+flush_preferences()
+
+finish_profile()
+profile_panel("Dashboard", st.session_state.role=="admin")
+
+if prefs["auto_refresh"]:
+    watch_tables(["cyber_incidents", "it_tickets", "datasets_metadata"], prefs["refresh_interval"])
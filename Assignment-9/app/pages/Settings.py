@@ -1,11 +1,17 @@
 import streamlit as st
+from app.services.preferences import load_preferences, set_preference, flush_preferences
+from app.services.profiler import finish_profile, profile_panel, start_profile
+from app.services.sessions import current_session
 
 st.set_page_config(page_title="Settings", page_icon="⚙️", layout="wide")
 
-if "logged_in" not in st.session_state or not st.session_state.logged_in:
+# signed token -> username + current role (cached, re-checked every few seconds)
+if not current_session():
     st.error("Please log in first.")
     st.stop()
 
+start_profile("Settings", st.session_state.get("profiling", False))
+
 with st.sidebar:
     st.write("👤 Account")
     st.write(f"Username: {st.session_state.username}")
@@ -45,14 +51,23 @@ with tab1:
 with tab2:
     st.subheader("Preferences")
 
-    theme = st.selectbox("Theme", ["Light", "Dark", "Auto"])
-    notifications = st.checkbox("Enable Notifications", value=True)
-    auto_refresh = st.checkbox("Auto-refresh Data", value=True)
+    prefs = load_preferences()
+    themes = ["Light", "Dark", "Auto"]
+
+    theme = st.selectbox("Theme", themes, index=themes.index(prefs["theme"]) if prefs["theme"] in themes else 0)
+    notifications = st.checkbox("Enable Notifications", value=prefs["notifications"])
+    auto_refresh = st.checkbox("Auto-refresh Data", value=prefs["auto_refresh"])
+    refresh_interval = prefs["refresh_interval"]
 
     if auto_refresh:
-        refresh_interval = st.slider("Refresh Interval (seconds)", 5, 300, 60)
+        refresh_interval = st.slider("Refresh Interval (seconds)", 5, 300, refresh_interval)
 
     if st.button("Save Preferences", use_container_width=True):
+        set_preference("theme", theme)
+        set_preference("notifications", notifications)
+        set_preference("auto_refresh", auto_refresh)
+        set_preference("refresh_interval", refresh_interval)
+        flush_preferences(force=True)
         st.success("Preferences saved!")
 
 with tab3:
@@ -69,3 +84,6 @@ Technology:
 - SQLite
 - Plotly
 """)
+
+finish_profile()
+profile_panel("Settings", st.session_state.role=="admin")
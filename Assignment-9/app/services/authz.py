@@ -0,0 +1,94 @@
+import threading
+import time
+
+# one bit per permission
+PERMISSIONS = {
+    "read": 1 << 0,
+    "export": 1 << 1,
+    "create": 1 << 2,
+    "update": 1 << 3,
+    "delete": 1 << 4,
+    "manage_users": 1 << 5,
+}
+
+# who may do what; the only place roles are interpreted
+ROLE_PERMISSIONS = {
+    "user": ["read", "export", "create"],
+    "analyst": ["read", "export", "create", "update", "delete"],
+    "admin": list(PERMISSIONS),
+}
+
+# CRUD page actions -> permission they need
+ACTION_PERMISSIONS = {
+    "Create": "create",
+    "Read": "read",
+    "Update": "update",
+    "Delete": "delete",
+}
+
+
+def _bitset(names):
+    bits = 0
+    for name in names:
+        bits |= PERMISSIONS[name]
+    return bits
+
+
+# compiled once: role -> bitset (unknown roles get nothing)
+ROLE_BITS = {role: _bitset(names) for role, names in ROLE_PERMISSIONS.items()}
+
+# a cached entry is trusted this long, so a role changed by another process still lands
+CACHE_SECONDS = 30.0
+
+# username -> (bitset, cached_at); dropped by update_user_role / delete_user
+_user_bits = {}
+_lock = threading.Lock()
+
+
+# permission bitset of a user: a dict lookup, one query on a miss
+def permissions_for(username):
+    now = time.time()
+    with _lock:
+        entry = _user_bits.get(username)
+        if entry and now - entry[1] < CACHE_SECONDS:
+            return entry[0]
+
+    # imported here: app.data.users imports this module to invalidate the cache
+    from app.data.users import get_user_by_username
+    user = get_user_by_username(username)
+    bits = ROLE_BITS.get(user[3], 0) if user else 0
+
+    with _lock:
+        _user_bits[username] = (bits, now)
+    return bits
+
+
+def has_permission(username, permission):
+    return bool(permissions_for(username) & PERMISSIONS[permission])
+
+
+# drops one user's cached bitset (or everyone's with no username)
+def forget_permissions(username=None):
+    with _lock:
+        if username is None:
+            _user_bits.clear()
+        else:
+            _user_bits.pop(username, None)
+
+
+# page helpers for the logged in user (st.session_state.username)
+def can(permission):
+    import streamlit as st
+    return has_permission(st.session_state.get("username", ""), permission)
+
+
+def require(permission, message="You don't have permission to do this."):
+    import streamlit as st
+    if not can(permission):
+        st.error(f"⛔ {message}")
+        st.stop()
+
+
+# CRUD actions the logged in user may pick
+def allowed_actions():
+    return [action for action, permission in ACTION_PERMISSIONS.items() if can(permission)]
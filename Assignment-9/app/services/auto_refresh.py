@@ -0,0 +1,56 @@
+import threading
+import streamlit as st
+from app.data.db import connect_database
+from app.data.schema import create_change_tracking
+
+_lock = threading.Lock()
+_probe_conn = None
+_last_data_version = None
+_last_versions = {}
+
+
+def _get_probe_conn():
+    global _probe_conn
+    if _probe_conn is None:
+        _probe_conn = connect_database(check_same_thread=False)
+        cursor = _probe_conn.cursor()
+        create_change_tracking(cursor)
+        _probe_conn.commit()
+    return _probe_conn
+
+
+# cheap change probe: {table_name: version}
+# PRAGMA data_version only moves when another connection commits, so while it is
+# unchanged we don't even read table_versions
+def get_table_versions():
+    global _last_data_version, _last_versions
+
+    with _lock:
+        conn = _get_probe_conn()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+
+        if data_version != _last_data_version:
+            rows = conn.execute("SELECT table_name, version FROM table_versions").fetchall()
+            _last_versions = dict(rows)
+            _last_data_version = data_version
+
+        return dict(_last_versions)
+
+
+# re-runs the page only when one of the watched tables actually changed
+def watch_tables(tables, interval_seconds):
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        st.caption("Auto-refresh needs a newer Streamlit version")
+        return
+
+    seen = get_table_versions()
+    seen = {t: seen.get(t, 0) for t in tables}
+
+    @fragment(run_every=interval_seconds)
+    def _probe():
+        current = get_table_versions()
+        if any(current.get(t, 0) != v for t, v in seen.items()):
+            st.rerun()
+
+    _probe()
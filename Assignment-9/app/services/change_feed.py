@@ -0,0 +1,78 @@
+import json
+from app.data.db import connect_database
+
+# tails the change_log journal (app.data.schema.create_change_log) from a saved offset
+# offsets only move after a batch was handled -> at-least-once delivery
+
+
+def get_offset(consumer):
+    conn = connect_database()
+    row = conn.execute(
+        "SELECT last_seq FROM change_log_offsets WHERE consumer = ?", (consumer,)
+    ).fetchone()
+    conn.close()
+    return row[0] if row else 0
+
+
+# next batch after the consumer's offset (or after=seq), oldest first
+def read_changes(consumer, batch_size=500, after=None):
+    if after is None:
+        after = get_offset(consumer)
+
+    conn = connect_database()
+    rows = conn.execute("""
+        SELECT seq, table_name, row_id, op, payload, changed_at
+        FROM change_log
+        WHERE seq > ?
+        ORDER BY seq
+        LIMIT ?
+    """, (after, batch_size)).fetchall()
+    conn.close()
+
+    return [
+        {"seq": r[0], "table": r[1], "row_id": r[2], "op": r[3], "row": json.loads(r[4]), "changed_at": r[5]}
+        for r in rows
+    ]
+
+
+def commit_offset(consumer, seq):
+    conn = connect_database()
+    conn.execute("""
+        INSERT INTO change_log_offsets (consumer, last_seq) VALUES (?, ?)
+        ON CONFLICT (consumer) DO UPDATE SET
+            last_seq = MAX(last_seq, excluded.last_seq),
+            updated_at = CURRENT_TIMESTAMP
+    """, (consumer, seq))
+    conn.commit()
+    conn.close()
+
+
+# yields batches until caught up; the offset is saved when the next batch is requested
+def iter_changes(consumer, batch_size=500):
+    while True:
+        batch = read_changes(consumer, batch_size)
+        if not batch:
+            return
+        yield batch
+        commit_offset(consumer, batch[-1]["seq"])
+
+
+# drops changes every consumer has handled, and (collapse=True) pending changes
+# that a newer change to the same row supersedes (each entry holds the full row)
+def compact_change_log(collapse=True):
+    conn = connect_database()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM change_log WHERE seq <= (SELECT MIN(last_seq) FROM change_log_offsets)")
+    removed = cursor.rowcount
+
+    if collapse:
+        cursor.execute("""
+            DELETE FROM change_log
+            WHERE seq NOT IN (SELECT MAX(seq) FROM change_log GROUP BY table_name, row_id)
+        """)
+        removed += cursor.rowcount
+
+    conn.commit()
+    conn.close()
+    return removed
@@ -0,0 +1,67 @@
+from app.data.queries import run_named_query
+from app.data.lookups import label_for
+
+
+# turns (severity_id, status_id, count) style rows into (label, label, count)
+def _decode(rows, first_table, second_table):
+    return [(label_for(first_table, a), label_for(second_table, b), count) for a, b, count in rows]
+
+
+# adds up the grouped rows (a, b, count) into totals per a and per b
+def _split_counts(rows):
+    total = 0
+    by_first = {}
+    by_second = {}
+
+    for first, second, count in rows:
+        total += count
+        by_first[first] = by_first.get(first, 0) + count
+        by_second[second] = by_second.get(second, 0) + count
+
+    return total, by_first, by_second
+
+
+# card values and chart counts for the Security tab
+def get_incident_metrics():
+    _, rows = run_named_query("incident_metrics")
+    rows = _decode(rows, "severity_levels", "statuses")
+    total, by_severity, by_status = _split_counts(rows)
+
+    return {
+        "total": total,
+        "critical": by_severity.get("critical", 0),
+        "high": by_severity.get("high", 0),
+        "resolved": by_status.get("resolved", 0),
+        "by_severity": by_severity,
+        "by_status": by_status,
+    }
+
+
+# card values and chart counts for the IT Ops tab
+def get_ticket_metrics():
+    _, rows = run_named_query("ticket_metrics")
+    rows = _decode(rows, "statuses", "priorities")
+    total, by_status, by_priority = _split_counts(rows)
+
+    return {
+        "total": total,
+        "open": by_status.get("open", 0),
+        "in_progress": by_status.get("in progress", 0),
+        "closed": by_status.get("closed", 0),
+        "by_status": by_status,
+        "by_priority": by_priority,
+    }
+
+
+# card values and chart counts for the Data tab
+def get_dataset_metrics():
+    _, rows = run_named_query("dataset_metrics")
+    total, by_category, by_source = _split_counts(rows)
+
+    return {
+        "total": total,
+        "categories": len([c for c in by_category if c is not None]),
+        "sources": len([s for s in by_source if s is not None]),
+        "by_category": by_category,
+        "by_source": by_source,
+    }
@@ -0,0 +1,184 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.data.db import connect_database
+
+FORMATS = ["csv", "jsonl", "parquet"]
+
+# rows pulled from sqlite per fetchmany() call (memory stays at one chunk)
+CHUNK_SIZE = 5000
+
+# exportable tables and reports (categorical ids exported as labels)
+EXPORTS = {
+    "cyber_incidents": """
+        SELECT i.id, i.title, sv.label AS severity, st.label AS status, i.date
+        FROM cyber_incidents i
+        JOIN severity_levels sv ON sv.id = i.severity_id
+        JOIN statuses st ON st.id = i.status_id
+        ORDER BY i.id
+    """,
+    "it_tickets": """
+        SELECT t.id, t.title, pr.label AS priority, st.label AS status, t.created_date
+        FROM it_tickets t
+        JOIN priorities pr ON pr.id = t.priority_id
+        JOIN statuses st ON st.id = t.status_id
+        ORDER BY t.id
+    """,
+    "datasets_metadata": """
+        SELECT id, name, source, category, size
+        FROM datasets_metadata
+        ORDER BY id
+    """,
+    "high_severity_incidents": """
+        SELECT i.id, i.title, sv.label AS severity, st.label AS status, i.date
+        FROM cyber_incidents i
+        JOIN severity_levels sv ON sv.id = i.severity_id
+        JOIN statuses st ON st.id = i.status_id
+        WHERE sv.label IN ('high', 'critical')
+        ORDER BY i.id
+    """,
+    "open_it_tickets": """
+        SELECT t.id, t.title, pr.label AS priority, st.label AS status, t.created_date
+        FROM it_tickets t
+        JOIN priorities pr ON pr.id = t.priority_id
+        JOIN statuses st ON st.id = t.status_id
+        WHERE st.label = 'open'
+        ORDER BY t.id
+    """,
+    "large_datasets": """
+        SELECT id, name, source, category, size
+        FROM datasets_metadata
+        WHERE size > 2000
+        ORDER BY id
+    """,
+}
+
+
+def _chunks(cursor, chunk_size):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _open_text(path, compress):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _write_csv(path, columns, chunks, compress):
+    count = 0
+    with _open_text(path, compress) as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def _write_jsonl(path, columns, chunks, compress):
+    count = 0
+    with _open_text(path, compress) as f:
+        for rows in chunks:
+            f.write("".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows))
+            count += len(rows)
+    return count
+
+
+# pyarrow is only needed for parquet, so it is imported here
+def _write_parquet(path, columns, chunks, compress):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    count = 0
+    writer = None
+    try:
+        for rows in chunks:
+            batch = pa.table({name: [row[i] for row in rows] for i, name in enumerate(columns)})
+            if writer is None:
+                # all-null columns in the first chunk would be typed null: store them as text
+                schema = pa.schema([
+                    pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type) for f in batch.schema
+                ])
+                writer = pq.ParquetWriter(path, schema, compression="zstd" if compress else "snappy")
+            writer.write_table(batch.cast(writer.schema))
+            count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def export_path(name, out_dir, fmt, compress=False):
+    suffix = f".{fmt}.gz" if compress and fmt != "parquet" else f".{fmt}"
+    return os.path.join(out_dir, name + suffix)
+
+
+# streams one export (or any SELECT given as sql=) to a file -> number of rows written
+def export_query(name, path, fmt="csv", compress=False, sql=None, params=(), chunk_size=CHUNK_SIZE):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if sql is None:
+        sql = EXPORTS[name]
+
+    conn = connect_database()
+    try:
+        cursor = conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        # write to a temp name so a failed export never leaves a half file behind
+        tmp_path = path + ".part"
+        try:
+            count = WRITERS[fmt](tmp_path, columns, _chunks(cursor, chunk_size), compress)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        return count
+    finally:
+        conn.close()
+
+
+# exports several tables at once, one connection + thread each -> {name: (path, rows)}
+def export_many(names, out_dir, fmt="csv", compress=False, workers=4):
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(export_query, name, export_path(name, out_dir, fmt, compress), fmt, compress)
+            for name in names
+        }
+        return {name: (export_path(name, out_dir, fmt, compress), f.result()) for name, f in futures.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export platform tables and reports.")
+    parser.add_argument("names", nargs="*", help=f"exports to run (default: all tables). choices: {', '.join(EXPORTS)}")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--gzip", action="store_true", help="compress csv/jsonl (parquet uses zstd)")
+    parser.add_argument("--out", default="exports", help="output folder")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    names = args.names or ["cyber_incidents", "it_tickets", "datasets_metadata"]
+    unknown = [n for n in names if n not in EXPORTS]
+    if unknown:
+        parser.error(f"unknown export(s): {', '.join(unknown)}")
+
+    for name, (path, count) in export_many(names, args.out, args.format, args.gzip, args.workers).items():
+        print(f"{name}: {count} rows -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import csv
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from app.data.db import connect_database
+from app.data.lookups import get_lookup
+from app.services import metrics
+
+# same series as load_csv, loader="columnar"
+metrics.counter("platform_load_rows_total", "Rows read by the file loaders", ["table", "result"])
+metrics.histogram("platform_load_seconds", "Time to load one file", ["table", "loader"],
+                  buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900))
+
+# rows per record batch (= per executemany + commit)
+BATCH_SIZE = 50_000
+
+# target table -> source columns, INSERT, coded columns (-> lookup table), date columns
+TABLES = {
+    "cyber_incidents": {
+        "columns": ["title", "severity", "status", "date"],
+        "insert": "INSERT INTO cyber_incidents (title, severity_id, status_id, date) VALUES (?, ?, ?, ?)",
+        "coded": {"severity": "severity_levels", "status": "statuses"},
+        "dates": ["date"],
+    },
+    "datasets_metadata": {
+        "columns": ["name", "source", "category", "size"],
+        "insert": "INSERT INTO datasets_metadata (name, source, category, size) VALUES (?, ?, ?, ?)",
+        "coded": {},
+        "dates": [],
+    },
+    "it_tickets": {
+        "columns": ["title", "priority", "status", "created_date"],
+        "insert": "INSERT INTO it_tickets (title, priority_id, status_id, created_date) VALUES (?, ?, ?, ?)",
+        "coded": {"priority": "priorities", "status": "statuses"},
+        "dates": ["created_date"],
+    },
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow loading needs pyarrow (pip install pyarrow)")
+
+
+# ---- readers: path -> iterator of pyarrow RecordBatches ----
+
+def read_parquet(path, columns, batch_size):
+    import pyarrow.parquet as pq
+    yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns)
+
+
+# arrow IPC: file format (random access) or stream format
+def read_arrow(path, columns, batch_size):
+    import pyarrow.ipc as ipc
+    with open(path, "rb") as f:
+        try:
+            reader = ipc.open_file(f)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except Exception:
+            f.seek(0)
+            batches = iter(ipc.open_stream(f))
+        for batch in batches:
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+# same loader for csv, so the formats can be compared like for like
+def read_csv(path, columns, batch_size):
+    import pyarrow.csv as pcsv
+    reader = pcsv.open_csv(
+        path,
+        read_options=pcsv.ReadOptions(block_size=1 << 22),
+        convert_options=pcsv.ConvertOptions(include_columns=columns),
+    )
+    for batch in reader:
+        for offset in range(0, batch.num_rows, batch_size):
+            yield batch.slice(offset, batch_size)
+
+
+READERS = {
+    ".parquet": read_parquet,
+    ".pq": read_parquet,
+    ".arrow": read_arrow,
+    ".feather": read_arrow,
+    ".ipc": read_arrow,
+    ".csv": read_csv,
+}
+
+
+def _reader_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unsupported file type: {ext} (supported: {', '.join(READERS)})")
+    return READERS[ext]
+
+
+# labels -> lookup ids for a whole column at once (case/space-insensitive)
+def _encode(pa, pc, column, lookup, source_name):
+    by_id = get_lookup(lookup)[0]
+    ids = pa.array(list(by_id.keys()), pa.int64())
+    labels = pa.array([label.lower() for label in by_id.values()])
+
+    cleaned = pc.utf8_lower(pc.utf8_trim_whitespace(column.cast(pa.string())))
+    positions = pc.index_in(cleaned, value_set=labels)
+    encoded = pc.take(ids, positions)
+
+    # every null in encoded is one failed row: a label not in the lookup or a null in the file
+    failed = pc.is_null(encoded)
+    failed_count = pc.sum(pc.cast(failed, pa.int64())).as_py() or 0
+    if failed_count:
+        missing = column.null_count
+        bad = pc.unique(pc.filter(cleaned, pc.and_(failed, pc.is_valid(column)))).to_pylist()[:5]
+        raise ValueError(f"{source_name}: {failed_count - missing} value(s) not in {lookup}, e.g. {bad}, "
+                         f"and {missing} missing")
+    return encoded
+
+
+def _as_date_text(pa, pc, column):
+    if pa.types.is_date(column.type):
+        column = column.cast(pa.timestamp("s"))
+    if pa.types.is_temporal(column.type):
+        return pc.strftime(column, format="%Y-%m-%d")
+    return column.cast(pa.string())
+
+
+# converts one record batch into the column order of the INSERT (all whole-column operations)
+def _prepare(pa, pc, batch, spec, source_for):
+    prepared = []
+    for name in spec["columns"]:
+        column = batch.column(batch.schema.get_field_index(source_for[name]))
+        if name in spec["coded"]:
+            column = _encode(pa, pc, column, spec["coded"][name], name)
+        elif name in spec["dates"]:
+            column = _as_date_text(pa, pc, column)
+        prepared.append(column.to_pylist())
+    return zip(*prepared)
+
+
+# loads a parquet / arrow / csv file into one of TABLES -> rows inserted
+# rename maps source column names onto the expected ones; one transaction per batch
+def load_file(path, table, rename=None, batch_size=BATCH_SIZE, conn=None):
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+
+    spec = TABLES[table]
+    rename = {k.lower(): v for k, v in (rename or {}).items()}
+    reader = _reader_for(path)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_database()
+
+    count = 0
+    start = time.perf_counter()
+    try:
+        # match source columns case-insensitively (after renames)
+        file_columns = _source_columns(path, reader)
+        source_for = {}
+        for source in file_columns:
+            target = rename.get(source.lower(), source.lower())
+            if target in spec["columns"]:
+                source_for[target] = source
+        missing = [c for c in spec["columns"] if c not in source_for]
+        if missing:
+            raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+
+        source_columns = [source_for[c] for c in spec["columns"]]
+        for batch in reader(path, source_columns, batch_size):
+            rows = _prepare(pa, pc, batch, spec, source_for)
+            with conn:
+                conn.executemany(spec["insert"], rows)
+            count += batch.num_rows
+    finally:
+        if own_conn:
+            conn.close()
+
+    metrics.observe("platform_load_seconds", time.perf_counter() - start, table, "columnar")
+    metrics.inc("platform_load_rows_total", table, "loaded", amount=count)
+    return count
+
+
+def _source_columns(path, reader):
+    if reader is read_parquet:
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    if reader is read_csv:
+        with open(path, encoding="utf-8", newline="") as f:
+            return next(csv.reader(f), [])
+    import pyarrow.ipc as ipc
+    with open(path, "rb") as f:
+        try:
+            return ipc.open_file(f).schema.names
+        except Exception:
+            f.seek(0)
+            return ipc.open_stream(f).schema.names
+
+
+# runs load(conn) on its own throwaway copy of the database -> (rows, seconds, rows/second)
+# (the working directory moves to the copy too, for loaders that open DATA/... themselves)
+def _timed_on_copy(db_path, load):
+    tmp_dir = tempfile.mkdtemp(prefix="load_bench_")
+    os.makedirs(os.path.join(tmp_dir, "DATA"))
+    tmp_db = os.path.join(tmp_dir, "DATA", "intelligence_platform.db")
+    shutil.copy(db_path, tmp_db)
+    cwd = os.getcwd()
+    conn = sqlite3.connect(tmp_db)
+    try:
+        os.chdir(tmp_dir)
+        start = time.perf_counter()
+        count = load(conn)
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        conn.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return count, seconds, count / seconds if seconds else float("inf")
+
+
+# times each file through load_file, and every csv also through load_csv_file (the existing
+# pandas path), so the columnar formats are compared against the loader they would replace
+def benchmark(paths, table, db_path="DATA/intelligence_platform.db"):
+    from app.services.load_csv import load_csv_file
+
+    db_path = os.path.abspath(db_path)
+    results = {}
+    for path in paths:
+        path = os.path.abspath(path)
+        results[path] = _timed_on_copy(db_path, lambda conn: load_file(path, table, conn=conn))
+        if _reader_for(path) is read_csv:
+            results[f"{path} (load_csv_file)"] = _timed_on_copy(db_path, lambda conn: load_csv_file(path, table)[0])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load Parquet / Arrow IPC / CSV files into the platform database.")
+    parser.add_argument("table", choices=list(TABLES))
+    parser.add_argument("paths", nargs="+", help="files to load")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--benchmark", action="store_true", help="time each file on a scratch copy of the database instead")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for path, (count, seconds, rate) in benchmark(args.paths, args.table).items():
+            print(f"{path}: {count} rows in {seconds:.2f}s ({rate:,.0f} rows/s)")
+        return
+
+    for path in args.paths:
+        count = load_file(path, args.table, batch_size=args.batch_size)
+        print(f"{path}: {count} rows loaded into {args.table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,146 @@
+import os
+import time
 import pandas as pd
 from app.data.db import connect_database
- #loading Cyer Incidents 
-def load_cyber_incidents(csv_path="DATA/cyber_incidents.csv"):
-    df = pd.read_csv(csv_path)
-    conn = connect_database()
-    cursor = conn.cursor()
+from app.data.lookups import get_lookup
+from app.services import metrics
 
-    for _, row in df.iterrows():
-        cursor.execute("""
-            INSERT INTO cyber_incidents (title, severity, status, date)
-            VALUES (?, ?, ?, ?)
-        """, (row["title"], row["severity"], row["status"], row["date"]))
+metrics.counter("platform_load_rows_total", "Rows read by the file loaders", ["table", "result"])
+metrics.histogram("platform_load_seconds", "Time to load one file", ["table", "loader"],
+                  buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900))
 
-    conn.commit()
-    conn.close()
-    print("Cyber incidents loaded")
+# rows read, validated and committed together (memory stays at one chunk)
+CHUNK_ROWS = 50_000
 
-#loading Datasets Metadata 
-def load_datasets_metadata(csv_path="DATA/datasets_metadata.csv"):
-    df = pd.read_csv(csv_path)
-    conn = connect_database()
-    cursor = conn.cursor()
+# rejected rows are appended here with the reason, the rest of the file still loads
+QUARANTINE_DIR = "DATA/quarantine"
 
-    for _, row in df.iterrows():
-        cursor.execute("""
-            INSERT INTO datasets_metadata (name, source, category, size)
-            VALUES (?, ?, ?, ?)
-        """, (row["name"], row["source"], row["category"], row["size"]))
+# column kinds: "text" (required), "text?" (optional), "int?", "date?" or a lookup table
+CSV_TABLES = {
+    "cyber_incidents": {
+        "insert": "INSERT INTO cyber_incidents (title, severity_id, status_id, date) VALUES (?, ?, ?, ?)",
+        "columns": {"title": "text", "severity": "severity_levels", "status": "statuses", "date": "date?"},
+    },
+    "datasets_metadata": {
+        "insert": "INSERT INTO datasets_metadata (name, source, category, size) VALUES (?, ?, ?, ?)",
+        "columns": {"name": "text", "source": "text?", "category": "text?", "size": "int?"},
+    },
+    "it_tickets": {
+        "insert": "INSERT INTO it_tickets (title, priority_id, status_id, created_date) VALUES (?, ?, ?, ?)",
+        "columns": {"title": "text", "priority": "priorities", "status": "statuses", "created_date": "date?"},
+    },
+}
 
-    conn.commit()
-    conn.close()
-    print("Datasets metadata loaded")
 
-#loading IT Tickets
-def load_it_tickets(csv_path="DATA/it_tickets.csv"):
-    df = pd.read_csv(csv_path)
+# whole-column checks and coercion -> (clean frame in insert order, rejected frame with a reason column)
+def validate_frame(df, columns):
+    df.columns = [c.strip().lower() for c in df.columns]
+    reasons = pd.Series("", index=df.index)
+    clean = pd.DataFrame(index=df.index)
+
+    for name, kind in columns.items():
+        if name not in df.columns:
+            reasons += f"missing column {name}; "
+            clean[name] = None
+            continue
+
+        raw = df[name].astype(str).str.strip()
+        blank = raw == ""
+
+        if kind in ("text", "text?"):
+            values = raw.mask(blank)
+            bad = blank if kind == "text" else pd.Series(False, index=df.index)
+            message = f"{name} is empty; "
+        elif kind == "int?":
+            values = pd.to_numeric(raw.mask(blank), errors="coerce")
+            bad = ~blank & (values.isna() | (values % 1 != 0))
+            message = f"{name} is not a whole number; "
+            values = values.where(~bad).astype("Int64")
+        elif kind == "date?":
+            parsed = pd.to_datetime(raw, errors="coerce")
+            bad = ~blank & parsed.isna()
+            message = f"{name} is not a date; "
+            values = parsed.dt.strftime("%Y-%m-%d")
+        else:
+            # lookup table: label -> id, case-insensitive
+            label_ids = {label.lower(): lookup_id for label, lookup_id in get_lookup(kind)[1].items()}
+            values = raw.str.lower().map(label_ids)
+            bad = values.isna()
+            message = f"{name} is not one of {', '.join(label_ids)}; "
+            values = values.astype("Int64")
+
+        reasons = reasons.mask(bad, reasons + message)
+        clean[name] = values
+
+    rejected_mask = reasons != ""
+    rejected = df[rejected_mask].copy()
+    rejected["reason"] = reasons[rejected_mask].str.rstrip("; ")
+    return clean[~rejected_mask], rejected
+
+
+# pandas NA/NaN/numpy scalars -> plain python values for sqlite
+def _rows(clean):
+    columns = [clean[c].astype(object).where(clean[c].notna(), None).tolist() for c in clean.columns]
+    return zip(*columns)
+
+
+def _quarantine_path(table):
+    return os.path.join(QUARANTINE_DIR, f"{table}_rejected.csv")
+
+
+def _quarantine(table, rejected):
+    if rejected.empty:
+        return
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
+    path = _quarantine_path(table)
+    rejected.to_csv(path, mode="a", header=not os.path.exists(path), index_label="line")
+
+
+# validates and loads a csv chunk by chunk; bad rows go to the quarantine file -> (loaded, rejected)
+def load_csv_file(csv_path, table, chunk_rows=CHUNK_ROWS):
+    spec = CSV_TABLES[table]
     conn = connect_database()
-    cursor = conn.cursor()
+    loaded, rejected_count = 0, 0
+    start = time.perf_counter()
+
+    # the quarantine file only describes the latest load
+    if os.path.exists(_quarantine_path(table)):
+        os.remove(_quarantine_path(table))
+
+    try:
+        for chunk in pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+            # index = line number in the file (header is line 1)
+            chunk.index = chunk.index + 2
+            clean, rejected = validate_frame(chunk, spec["columns"])
+
+            with conn:
+                conn.executemany(spec["insert"], _rows(clean))
+
+            _quarantine(table, rejected)
+            loaded += len(clean)
+            rejected_count += len(rejected)
+    finally:
+        conn.close()
+
+    metrics.observe("platform_load_seconds", time.perf_counter() - start, table, "csv")
+    metrics.inc("platform_load_rows_total", table, "loaded", amount=loaded)
+    metrics.inc("platform_load_rows_total", table, "rejected", amount=rejected_count)
 
-    for _, row in df.iterrows():
-        cursor.execute("""
-            INSERT INTO it_tickets (title, priority, status, created_date)
-            VALUES (?, ?, ?, ?)
-        """, (row["title"], row["priority"], row["status"], row["created_date"]))
+    message = f"{table}: {loaded} rows loaded"
+    if rejected_count:
+        message += f", {rejected_count} rejected (see {_quarantine_path(table)})"
+    print(message)
+    return loaded, rejected_count
 
-    conn.commit()
-    conn.close()
-    print("IT tickets loaded")
\ No newline at end of file
+
+#loading Cyer Incidents
+def load_cyber_incidents(csv_path="DATA/cyber_incidents.csv"):
+    return load_csv_file(csv_path, "cyber_incidents")
+
+#loading Datasets Metadata
+def load_datasets_metadata(csv_path="DATA/datasets_metadata.csv"):
+    return load_csv_file(csv_path, "datasets_metadata")
+
+#loading IT Tickets
+def load_it_tickets(csv_path="DATA/it_tickets.csv"):
+    return load_csv_file(csv_path, "it_tickets")
@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# latency buckets in seconds (prometheus client defaults)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_lock = threading.Lock()
+# name -> {"type", "help", "labels", "buckets", "values": {label values tuple: value}}
+_metrics = {}
+# metric name -> function returning {label values tuple: value}, read at scrape time
+_callbacks = {}
+
+
+# declares a metric once (safe to call again at import time)
+def register(name, kind, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+    with _lock:
+        _metrics.setdefault(name, {"type": kind, "help": help_text, "labels": tuple(labels),
+                                   "buckets": tuple(buckets), "values": {}})
+
+
+# callback: for values something else already counts (e.g. lru_cache statistics)
+def counter(name, help_text, labels=(), callback=None):
+    register(name, "counter", help_text, labels)
+    if callback is not None:
+        _callbacks[name] = callback
+
+
+def gauge(name, help_text, labels=(), callback=None):
+    register(name, "gauge", help_text, labels)
+    if callback is not None:
+        _callbacks[name] = callback
+
+
+def histogram(name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+    register(name, "histogram", help_text, labels, buckets)
+
+
+# counter += amount
+def inc(name, *label_values, amount=1):
+    metric = _metrics[name]
+    with _lock:
+        values = metric["values"]
+        values[label_values] = values.get(label_values, 0) + amount
+
+
+def set_gauge(name, value, *label_values):
+    metric = _metrics[name]
+    with _lock:
+        metric["values"][label_values] = value
+
+
+# histogram: one bucket count per bound plus +Inf, then the running sum
+def observe(name, value, *label_values):
+    metric = _metrics[name]
+    buckets = metric["buckets"]
+    i = 0
+    for bound in buckets:
+        if value <= bound:
+            break
+        i += 1
+    with _lock:
+        entry = metric["values"].get(label_values)
+        if entry is None:
+            entry = metric["values"][label_values] = [[0] * (len(buckets) + 1), 0.0]
+        entry[0][i] += 1
+        entry[1] += value
+
+
+# with timer("a9_csv_load_seconds", table): ...
+@contextmanager
+def timer(name, *label_values):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, *label_values)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+# every metric in the prometheus text exposition format (version 0.0.4)
+def render():
+    with _lock:
+        snapshot = {name: dict(m, values={k: (list(v[0]), v[1]) if isinstance(v, list) else v
+                                          for k, v in m["values"].items()})
+                    for name, m in _metrics.items()}
+
+    lines = []
+    for name in sorted(snapshot):
+        metric = snapshot[name]
+        names = metric["labels"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+
+        values = metric["values"]
+        if name in _callbacks:
+            try:
+                values = _callbacks[name]()
+            except Exception:
+                # a failing callback must not break the whole scrape
+                values = {}
+
+        for key, value in values.items():
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip(metric["buckets"] + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{name}_bucket{_labels(names, key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # scrapes every few seconds would flood the streamlit console
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+# serves /metrics from a daemon thread, once per process; off unless PLATFORM_METRICS_PORT is set
+def start_metrics_server(port=None, host="127.0.0.1"):
+    global _server
+    port = port or os.getenv("PLATFORM_METRICS_PORT")
+    if not port:
+        return None
+
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _Handler)
+            except OSError as e:
+                # e.g. the port is taken by another streamlit process
+                print(f"Metrics endpoint not started: {e}")
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,92 @@
+import threading
+import time
+import streamlit as st
+from app.data.preferences import get_preferences, save_preferences
+
+# widget changes inside this window are written together
+DEBOUNCE_SECONDS = 5
+
+# username -> timer of the trailing write of a debounced change
+# (a skipped flush would otherwise lose the last change if the user leaves)
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+# timer thread: writes the snapshot unless a newer write replaced this timer
+def _trailing_write(username, prefs):
+    with _pending_lock:
+        if _pending.get(username) is not threading.current_thread():
+            return
+        del _pending[username]
+        save_preferences(username, prefs)
+
+
+# (re)starts the user's trailing write; streamlit state can't be used off the script thread, so a copy goes along
+def _schedule_write(username, prefs, delay):
+    with _pending_lock:
+        timer = _pending.get(username)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(delay, _trailing_write, (username, dict(prefs)))
+        timer.daemon = True
+        _pending[username] = timer
+        timer.start()
+
+
+# writes now and drops the user's pending trailing write (under the lock, so an older snapshot can't land after)
+def _write_now(username, prefs):
+    with _pending_lock:
+        timer = _pending.pop(username, None)
+        if timer is not None:
+            timer.cancel()
+        save_preferences(username, prefs)
+
+
+# loads the saved preferences once per session (or when the user changes)
+def load_preferences():
+    username = st.session_state.get("username", "")
+
+    if st.session_state.get("preferences_user") != username or "preferences" not in st.session_state:
+        st.session_state.preferences = get_preferences(username)
+        st.session_state.preferences_user = username
+        st.session_state.preferences_dirty = False
+        st.session_state.preferences_saved_at = time.time()
+
+    return st.session_state.preferences
+
+
+def get_preference(key):
+    return load_preferences()[key]
+
+
+# only marks the change, the actual write happens in flush_preferences
+def set_preference(key, value):
+    prefs = load_preferences()
+    if prefs.get(key) != value:
+        prefs[key] = value
+        st.session_state.preferences_dirty = True
+
+
+# writes pending changes at most once per DEBOUNCE_SECONDS (or now if force=True);
+# a change inside the window is written by a trailing timer when the window ends
+def flush_preferences(force=False):
+    if not st.session_state.get("preferences_dirty"):
+        return False
+
+    waited = time.time() - st.session_state.get("preferences_saved_at", 0)
+    if not force and waited < DEBOUNCE_SECONDS:
+        _schedule_write(st.session_state.preferences_user, st.session_state.preferences,
+                        DEBOUNCE_SECONDS - waited)
+        return False
+
+    _write_now(st.session_state.preferences_user, st.session_state.preferences)
+    st.session_state.preferences_dirty = False
+    st.session_state.preferences_saved_at = time.time()
+    return True
+
+
+# on logout: save anything pending and forget this user's preferences
+def clear_preferences():
+    flush_preferences(force=True)
+    for key in ["preferences", "preferences_user", "preferences_dirty", "preferences_saved_at"]:
+        st.session_state.pop(key, None)
@@ -0,0 +1,140 @@
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# folded-stack samples (one file per page) for flamegraph.pl / speedscope / inferno
+PROFILE_DIR = "DATA/profiles"
+
+# reruns kept per page for the sidebar panel
+HISTORY_SIZE = 20
+
+# always reported; time outside any phase counts as render (widgets, charts, script)
+PHASES = ("db", "transform", "render")
+
+# streamlit runs each rerun on its own thread, so the running profile is thread-local
+_local = threading.local()
+_history_lock = threading.Lock()
+_history = defaultdict(lambda: deque(maxlen=HISTORY_SIZE))
+
+
+def _current():
+    return getattr(_local, "profile", None)
+
+
+# starts timing this rerun; does nothing (and costs nothing) unless enabled
+def start_profile(page, enabled):
+    if not (enabled or os.getenv("PLATFORM_PROFILE") == "1"):
+        _local.profile = None
+        return
+    _local.profile = {"page": page, "start": time.perf_counter(), "stack": [page], "inclusive": defaultdict(float)}
+
+
+@contextmanager
+def _timed(profile, name):
+    profile["stack"].append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile["inclusive"][tuple(profile["stack"])] += time.perf_counter() - start
+        profile["stack"].pop()
+
+
+# with phase("transform"): ...  (nested phases become nested flamegraph frames)
+def phase(name):
+    profile = _current()
+    return nullcontext() if profile is None else _timed(profile, name)
+
+
+# decorator version of phase()
+def profiled(name):
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# credits already-measured time (e.g. a query timed by run_named_query) to a child phase
+def add_time(name, seconds):
+    profile = _current()
+    if profile is not None and profile["stack"][-1] != name:
+        profile["inclusive"][tuple(profile["stack"]) + (name,)] += seconds
+
+
+def _self_times(inclusive):
+    self_times = dict(inclusive)
+    for path, seconds in inclusive.items():
+        if len(path) > 1 and path[:-1] in self_times:
+            self_times[path[:-1]] -= seconds
+    return {path: max(0.0, seconds) for path, seconds in self_times.items()}
+
+
+def sample_path(page):
+    return os.path.join(PROFILE_DIR, re.sub(r"\W+", "_", page).strip("_").lower() + ".folded")
+
+
+# appends "frame;frame;frame microseconds" lines (Brendan Gregg's folded format)
+def _write_folded(page, self_times):
+    lines = [f"{';'.join(path)} {int(seconds * 1_000_000)}\n" for path, seconds in self_times.items() if seconds > 0]
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(sample_path(page), "a", encoding="utf-8") as f:
+            f.writelines(lines)
+    except OSError:
+        # profiling must never break the page
+        pass
+
+
+# stops timing -> {"at", "total_ms", "db", "transform", "render", ...} or None when off
+def finish_profile():
+    profile = _current()
+    if profile is None:
+        return None
+    _local.profile = None
+
+    page = profile["page"]
+    profile["inclusive"][(page,)] = time.perf_counter() - profile["start"]
+    self_times = _self_times(profile["inclusive"])
+
+    result = {"at": time.strftime("%H:%M:%S"), "total_ms": profile["inclusive"][(page,)] * 1000}
+    result.update({name: 0.0 for name in PHASES})
+    for path, seconds in self_times.items():
+        name = path[-1] if len(path) > 1 else "render"
+        result[name] = result.get(name, 0.0) + seconds * 1000
+
+    with _history_lock:
+        _history[page].append(result)
+    _write_folded(page, self_times)
+    return result
+
+
+# recent profiled reruns of a page (all sessions), newest first
+def rerun_history(page):
+    with _history_lock:
+        return list(reversed(_history[page]))
+
+
+# collapsible sidebar panel for admins: opt-in toggle + recent rerun timings
+def profile_panel(page, is_admin):
+    if not is_admin:
+        return
+    import streamlit as st
+    import pandas as pd
+
+    with st.sidebar.expander("⏱ Profiling"):
+        # plain session key (not a widget key) so the choice survives page switches
+        st.session_state["profiling"] = st.checkbox("Profile reruns", value=st.session_state.get("profiling", False),
+                                                    help="Times db / transform / render phases of every rerun of every page")
+        history = rerun_history(page)
+        if not history:
+            st.caption("Turn on and interact with the page to collect timings.")
+            return
+        st.dataframe(pd.DataFrame(history).round(1), use_container_width=True)
+        st.caption(f"Folded samples: {sample_path(page)}")
@@ -0,0 +1,132 @@
+import json
+import math
+import os
+import threading
+import time
+
+# failed attempts allowed per sliding window before a lockout
+MAX_USER_FAILURES = int(os.getenv("PLATFORM_LOGIN_MAX_FAILURES", "5"))
+# one client trying many usernames is credential stuffing, so clients get a larger budget
+MAX_CLIENT_FAILURES = int(os.getenv("PLATFORM_LOGIN_MAX_CLIENT_FAILURES", "20"))
+WINDOW_SECONDS = float(os.getenv("PLATFORM_LOGIN_WINDOW_SECONDS", "300"))
+# first lockout; each further lockout of the same key doubles it, up to MAX_LOCKOUT_SECONDS
+LOCKOUT_SECONDS = float(os.getenv("PLATFORM_LOGIN_LOCKOUT_SECONDS", "60"))
+MAX_LOCKOUT_SECONDS = float(os.getenv("PLATFORM_LOGIN_MAX_LOCKOUT_SECONDS", "3600"))
+
+# counters are written here at most every PERSIST_EVERY seconds so lockouts survive a restart
+PERSIST_PATH = "DATA/login_limits.json"
+PERSIST_EVERY = 30.0
+
+# key -> [window start, previous window count, current window count, locked until, lockouts so far]
+# five numbers per "user:<name>" / "client:<id>" key, so each attempt is O(1)
+_counters = {}
+_lock = threading.Lock()
+_state = {"loaded": False, "dirty": False, "last_persist": 0.0}
+
+
+# client None -> the username budget only
+def _keys(username, client):
+    if client is None:
+        return ("user:" + username.strip().lower(),)
+    return "user:" + username.strip().lower(), "client:" + client
+
+
+def _limit(key):
+    return MAX_USER_FAILURES if key.startswith("user:") else MAX_CLIENT_FAILURES
+
+
+def _load():
+    _state["loaded"] = True
+    _state["last_persist"] = time.time()
+    if not os.path.exists(PERSIST_PATH):
+        return
+    try:
+        with open(PERSIST_PATH, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring login counters file: {e}")
+        return
+    for key, counter in saved.items():
+        if len(counter) == 5:
+            _counters[key] = [float(v) for v in counter]
+
+
+def _persist(now, force=False):
+    with _lock:
+        if not _state["dirty"] or (not force and now - _state["last_persist"] < PERSIST_EVERY):
+            return
+        # drop keys with nothing left to remember
+        for key in [k for k, c in _counters.items()
+                    if c[3] <= now and now - c[0] >= 2 * WINDOW_SECONDS and now - c[3] >= MAX_LOCKOUT_SECONDS]:
+            del _counters[key]
+        saved = {key: list(counter) for key, counter in _counters.items()}
+        _state["dirty"] = False
+        _state["last_persist"] = now
+
+    try:
+        with open(PERSIST_PATH + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(saved, f)
+        os.replace(PERSIST_PATH + ".tmp", PERSIST_PATH)
+    except OSError as e:
+        print(f"Could not persist login counters: {e}")
+
+
+# seconds until this username/client may try again (0 = allowed now); no hashing involved
+def retry_after(username, client=None):
+    now = time.time()
+    with _lock:
+        if not _state["loaded"]:
+            _load()
+        waits = [_counters[key][3] - now for key in _keys(username, client) if key in _counters]
+    return max([0.0] + waits)
+
+
+# counts a failed attempt and locks the key out past its limit -> seconds to wait
+def record_failure(username, client=None):
+    now = time.time()
+    wait = 0.0
+    with _lock:
+        if not _state["loaded"]:
+            _load()
+        for key in _keys(username, client):
+            counter = _counters.setdefault(key, [now, 0, 0, 0.0, 0])
+
+            # roll to the window containing now
+            elapsed_windows = int((now - counter[0]) // WINDOW_SECONDS)
+            if elapsed_windows >= 1:
+                counter[1] = counter[2] if elapsed_windows == 1 else 0
+                counter[2] = 0
+                counter[0] += elapsed_windows * WINDOW_SECONDS
+            counter[2] += 1
+
+            # sliding estimate: previous window weighted by how much of it is still in range
+            overlap = 1 - (now - counter[0]) / WINDOW_SECONDS
+            if counter[1] * overlap + counter[2] >= _limit(key):
+                counter[3] = now + min(LOCKOUT_SECONDS * 2 ** counter[4], MAX_LOCKOUT_SECONDS)
+                counter[4] += 1
+                counter[1] = counter[2] = 0
+            wait = max(wait, counter[3] - now)
+        _state["dirty"] = True
+
+    _persist(now)
+    return wait
+
+
+# a successful login clears the username's failures (the client keeps its own)
+def record_success(username, client=None):
+    with _lock:
+        if _counters.pop(_keys(username, client)[0], None) is not None:
+            _state["dirty"] = True
+    _persist(time.time())
+
+
+def reset_limits():
+    with _lock:
+        _counters.clear()
+        _state["dirty"] = True
+    _persist(time.time(), force=True)
+
+
+def format_wait(seconds):
+    seconds = math.ceil(seconds)
+    return f"{seconds} s" if seconds < 120 else f"{math.ceil(seconds / 60)} min"
@@ -0,0 +1,154 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from app.data.sessions import delete_expired_sessions, delete_session, delete_user_sessions, get_session_user, insert_session
+
+# signing key; random per process unless PLATFORM_SESSION_SECRET is set
+# (a restart logs everybody out, streamlit session state is lost then anyway)
+SESSION_SECRET = os.getenv("PLATFORM_SESSION_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+SESSION_TTL_SECONDS = float(os.getenv("PLATFORM_SESSION_TTL_SECONDS", str(8 * 3600)))
+
+# a resolved user is trusted this long before the database is asked again,
+# so role changes / revocations from another process show up within seconds
+CACHE_SECONDS = 5.0
+CACHE_SIZE = 1024
+
+# expired sessions are deleted on login, at most this often per process
+PURGE_EVERY_SECONDS = 3600.0
+_purge = {"last": 0.0}
+
+# process-wide lru: session id hash -> (username, role, expires_at, cached_at)
+# (streamlit is imported inside the page helpers: data.users imports this module too)
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _sign(session_id):
+    return hmac.new(SESSION_SECRET, session_id.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _id_hash(session_id):
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+
+
+# session id of a correctly signed "<id>.<signature>" token, else None (no database involved)
+def _verified_id(token):
+    if not token or "." not in token:
+        return None
+    session_id, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(signature, _sign(session_id)):
+        return None
+    return session_id
+
+
+def _cache_put(key, username, role, expires_at):
+    with _lock:
+        _cache[key] = (username, role, expires_at, time.time())
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+# token -> (username, current role) or None when forged / expired / revoked
+def resolve_token(token):
+    session_id = _verified_id(token)
+    if session_id is None:
+        return None
+    key = _id_hash(session_id)
+    now = time.time()
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry and entry[2] > now and now - entry[3] < CACHE_SECONDS:
+            _cache.move_to_end(key)
+            return entry[0], entry[1]
+
+    row = get_session_user(key, now)
+    if row is None:
+        with _lock:
+            _cache.pop(key, None)
+        return None
+
+    _cache_put(key, *row)
+    return row[0], row[1]
+
+
+# after a successful login: new session row, only the signed token goes into session state
+def start_session(username, role):
+    import streamlit as st
+    maybe_purge_expired_sessions()
+    session_id = secrets.token_urlsafe(32)
+    expires_at = time.time() + SESSION_TTL_SECONDS
+    insert_session(_id_hash(session_id), username, expires_at)
+    _cache_put(_id_hash(session_id), username, role, expires_at)
+
+    st.session_state.session_token = f"{session_id}.{_sign(session_id)}"
+    st.session_state.logged_in = True
+    st.session_state.username = username
+    st.session_state.role = role
+
+
+# every page calls this first: one cached token lookup, refreshes username/role -> logged in?
+def current_session():
+    import streamlit as st
+    resolved = resolve_token(st.session_state.get("session_token"))
+    if resolved is None:
+        st.session_state.session_token = None
+        st.session_state.logged_in = False
+        st.session_state.username = ""
+        st.session_state.role = "user"
+        return False
+
+    st.session_state.logged_in = True
+    st.session_state.username, st.session_state.role = resolved
+    return True
+
+
+# logout
+def end_session():
+    import streamlit as st
+    session_id = _verified_id(st.session_state.get("session_token"))
+    if session_id is not None:
+        delete_session(_id_hash(session_id))
+        with _lock:
+            _cache.pop(_id_hash(session_id), None)
+
+    st.session_state.session_token = None
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+    st.session_state.role = "user"
+
+
+# cached entries of a user are dropped so their next page run re-reads the role
+def forget_user(username):
+    with _lock:
+        for key in [k for k, entry in _cache.items() if entry[0] == username]:
+            del _cache[key]
+
+
+# a deleted user loses every session at once
+def revoke_user_sessions(username):
+    delete_user_sessions(username)
+    forget_user(username)
+
+
+def purge_expired_sessions():
+    now = time.time()
+    with _lock:
+        for key in [k for k, entry in _cache.items() if entry[2] <= now]:
+            del _cache[key]
+    return delete_expired_sessions(now)
+
+
+# called on every login; purges at most once per PURGE_EVERY_SECONDS so the sessions table can't grow forever
+def maybe_purge_expired_sessions():
+    now = time.time()
+    with _lock:
+        if now - _purge["last"] < PURGE_EVERY_SECONDS:
+            return 0
+        _purge["last"] = now
+    return purge_expired_sessions()
@@ -1,5 +1,9 @@
 import streamlit as st
-from services.database_manager import DatabaseManager
+from services.db_registry import get_db
+from services.export_service import clear_session_exports
+from services.metrics import start_metrics_server
+from services.profiler import Profiler, show_profile_panel
+from services.session_manager import SessionManager, session_user
 
 st.set_page_config(
     page_title="Multi-Domain Intelligence Platform",
@@ -7,6 +11,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# ✅ /metrics for Prometheus when PLATFORM_METRICS_PORT is set (once per process)
+start_metrics_server()
+
 st.title("🌐 Multi-Domain Intelligence Platform")
 st.markdown("---")
 
@@ -17,6 +24,9 @@ if "current_user" not in st.session_state:
 if "current_role" not in st.session_state:
     st.session_state.current_role = None
 
+# ✅ Signed session token -> current user and role (cached; re-checked every few seconds)
+session_user(st.session_state)
+
 
 # ✅ SIDEBAR (ONLY user info + logout) — no extra navigation buttons
 st.sidebar.markdown("### 👤 Account")
@@ -26,6 +36,9 @@ if st.session_state.current_user:
     st.sidebar.caption(f"Role: {st.session_state.current_role}")
 
     if st.sidebar.button("🚪 Logout"):
+        SessionManager(get_db()).revoke(st.session_state.get("session_token"))
+        clear_session_exports(st.session_state)
+        st.session_state.session_token = None
         st.session_state.current_user = None
         st.session_state.current_role = None
         st.rerun()
@@ -46,6 +59,7 @@ This platform provides:
 - 📊 Data Science dataset analysis  
 - 💻 IT Operations ticketing  
 - 🤖 AI Assistant
+- 🛠 Admin query performance (admins only)
 """)
 
 else:
@@ -56,8 +70,10 @@ else:
 
     st.subheader("📋 Dashboard")
 
-    db = DatabaseManager("database/platform.db")
-    db.connect()
+    profiler = Profiler("Home", enabled=st.session_state.get("profiling", False))
+
+    # ✅ Shared, already-open connection of this thread (see services.db_registry)
+    db = get_db()
 
     try:
         incidents = db.fetch_one("SELECT COUNT(*) FROM security_incidents")[0]
@@ -74,8 +90,6 @@ else:
     except:
         tickets = 0
 
-    db.close()
-
     c1, c2, c3 = st.columns(3)
     c1.metric("🛡️ Incidents", incidents)
     c2.metric("📊 Datasets", datasets)
@@ -83,3 +97,6 @@ else:
 
     st.markdown("---")
     st.info("Use the left sidebar pages (the top menu) to navigate.")
+
+    profiler.finish()
+    show_profile_panel(profiler, st.session_state.current_role == "admin")
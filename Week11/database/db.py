@@ -1,6 +1,438 @@
 import sqlite3
 from pathlib import Path
 
+# Small lookup tables for categorical columns: table -> labels (id = position + 1)
+LOOKUPS = {
+    "severity_levels": ["low", "medium", "high", "critical"],
+    "statuses": ["Open", "In Progress", "Resolved", "Closed"],
+    "priorities": ["Low", "Medium", "High", "Critical"],
+}
+
+# Millisecond UTC timestamp; sorts correctly against CURRENT_TIMESTAMP values
+NOW_MS = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+SECURITY_INCIDENTS_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        incident_type TEXT NOT NULL,
+        severity_id INTEGER NOT NULL REFERENCES severity_levels(id)
+            CHECK (severity_id BETWEEN 1 AND 4),
+        status_id INTEGER NOT NULL DEFAULT 1 REFERENCES statuses(id)
+            CHECK (status_id BETWEEN 1 AND 4),
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT (""" + NOW_MS + """)
+    )
+"""
+
+IT_TICKETS_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        priority_id INTEGER NOT NULL REFERENCES priorities(id)
+            CHECK (priority_id BETWEEN 1 AND 4),
+        status_id INTEGER NOT NULL DEFAULT 1 REFERENCES statuses(id)
+            CHECK (status_id BETWEEN 1 AND 4),
+        assigned_to TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT (""" + NOW_MS + """)
+    )
+"""
+
+# Tables with categorical columns: (DDL, columns in order, {id column: (old text column, lookup table)})
+NORMALIZED_TABLES = {
+    "security_incidents": (
+        SECURITY_INCIDENTS_DDL,
+        ["id", "incident_type", "severity_id", "status_id", "description", "created_at", "updated_at"],
+        {"severity_id": ("severity", "severity_levels"), "status_id": ("status", "statuses")},
+    ),
+    "it_tickets": (
+        IT_TICKETS_DDL,
+        ["id", "title", "priority_id", "status_id", "assigned_to", "created_at", "updated_at"],
+        {"priority_id": ("priority", "priorities"), "status_id": ("status", "statuses")},
+    ),
+}
+
+
+def create_lookup_tables(cur: sqlite3.Cursor) -> None:
+    """Create and seed the lookup tables for categorical columns."""
+    for table, labels in LOOKUPS.items():
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                label TEXT UNIQUE NOT NULL
+            )
+        """)
+        cur.executemany(
+            f"INSERT OR IGNORE INTO {table} (id, label) VALUES (?, ?)",
+            list(enumerate(labels, start=1)),
+        )
+
+
+def migrate_categoricals(conn: sqlite3.Connection) -> bool:
+    """Convert free-text severity/status/priority columns to lookup ids.
+
+    Older databases store these as free text ('open', 'Open', 'OPEN', ...).
+    Each affected table is rebuilt with integer-coded columns, and existing
+    rows are back-filled by matching the text case-insensitively against
+    the lookup labels. The whole migration runs in one transaction and is
+    aborted if any value doesn't match a known label.
+
+    Tables whose updated_at still defaults to CURRENT_TIMESTAMP (second
+    precision) are rebuilt the same way, so inserts get millisecond
+    timestamps like updates do.
+
+    Args:
+        conn: Open connection to the platform database
+
+    Returns:
+        True if any table was migrated, False if already normalized
+    """
+    conn.commit()
+    cur = conn.cursor()
+    migrated = False
+
+    try:
+        cur.execute("BEGIN")
+        for table, (ddl, columns, coded) in NORMALIZED_TABLES.items():
+            info = {r[1]: r[4] for r in cur.execute(f"PRAGMA table_info({table})")}
+            text_coded = any(old in info for old, _ in coded.values())
+            if not text_coded and info.get("updated_at") != "CURRENT_TIMESTAMP":
+                continue
+
+            select_exprs = []
+            for column in columns:
+                if column not in coded or not text_coded:
+                    select_exprs.append(column)
+                    continue
+
+                old, lookup = coded[column]
+                unknown = cur.execute(f"""
+                    SELECT DISTINCT {old} FROM {table}
+                    WHERE {old} IS NOT NULL
+                      AND LOWER(TRIM({old})) NOT IN (SELECT LOWER(label) FROM {lookup})
+                """).fetchall()
+                if unknown:
+                    raise ValueError(
+                        f"{table}.{old} has unknown values: {[r[0] for r in unknown]}"
+                    )
+                # Missing statuses fall back to the column default (Open)
+                select_exprs.append(
+                    f"COALESCE((SELECT id FROM {lookup} "
+                    f"WHERE LOWER(label) = LOWER(TRIM({table}.{old}))), 1)"
+                )
+
+            cur.execute(ddl.format(name=f"{table}_new"))
+            cur.execute(f"""
+                INSERT INTO {table}_new ({", ".join(columns)})
+                SELECT {", ".join(select_exprs)} FROM {table}
+            """)
+            # Dropping the table also drops its triggers; callers recreate them
+            cur.execute(f"DROP TABLE {table}")
+            cur.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            migrated = True
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if migrated:
+        # Give the space freed by the old text columns back to the OS
+        conn.execute("VACUUM")
+    return migrated
+
+
+# Text columns indexed for full-text search / retrieval, per base table
+SEARCH_INDEXES = {
+    "security_incidents": ("incident_type", "description"),
+    "it_tickets": ("title",),
+    "datasets": ("name", "source"),
+}
+
+
+def create_search_index(cur: sqlite3.Cursor) -> None:
+    """Create FTS5 indexes over the text columns of the domain tables.
+
+    Each index is an external-content FTS5 table (it stores only the index,
+    not a second copy of the text) kept in sync by insert/update/delete
+    triggers, so it is updated incrementally as rows change. A newly
+    created index is back-filled from the existing rows.
+    """
+    for table, columns in SEARCH_INDEXES.items():
+        fts = f"{table}_fts"
+        exists = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+        ).fetchone()
+
+        cols = ", ".join(columns)
+        new_vals = ", ".join(f"new.{c}" for c in columns)
+        old_vals = ", ".join(f"old.{c}" for c in columns)
+
+        cur.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {cols}, content='{table}', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});
+            END
+        """)
+
+        if not exists:
+            cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+# Tables rolled up into daily trend buckets: table -> (domain, level column)
+TREND_SOURCES = {
+    "security_incidents": ("incidents", "severity_id"),
+    "it_tickets": ("tickets", "priority_id"),
+}
+
+# A row counts as resolved once its status is one of these
+DONE_STATUSES = ("Resolved", "Closed")
+
+
+def _trend_upsert(domain: str, day: str, level: str, opened: str = "0",
+                  resolved: str = "0", seconds: str = "0", where: str = "") -> str:
+    """INSERT ... ON CONFLICT statement that adds to one trend_rollups bucket."""
+    return f"""
+        INSERT INTO trend_rollups (domain, day, level_id, opened, resolved, resolve_seconds)
+        SELECT '{domain}', {day}, {level}, {opened}, {resolved}, {seconds}
+        WHERE {where or 'true'}
+        ON CONFLICT (domain, day, level_id) DO UPDATE SET
+            opened = opened + excluded.opened,
+            resolved = resolved + excluded.resolved,
+            resolve_seconds = resolve_seconds + excluded.resolve_seconds;
+    """
+
+
+def rebuild_trend_rollups(cur: sqlite3.Cursor) -> None:
+    """Recompute trend_rollups from the base tables."""
+    done = "(SELECT id FROM statuses WHERE label IN ({}))".format(
+        ", ".join(f"'{s}'" for s in DONE_STATUSES))
+
+    cur.execute("DELETE FROM trend_rollups")
+    for table, (domain, level) in TREND_SOURCES.items():
+        cur.execute(f"""
+            INSERT INTO trend_rollups (domain, day, level_id, opened)
+            SELECT '{domain}', date(COALESCE(created_at, 'now')), {level}, COUNT(*)
+            FROM {table}
+            GROUP BY 2, 3
+        """)
+        # Already-resolved rows: last update is the best known resolution time
+        cur.execute(f"""
+            INSERT INTO trend_rollups (domain, day, level_id, resolved, resolve_seconds)
+            SELECT '{domain}', date(COALESCE(updated_at, created_at, 'now')), {level}, COUNT(*),
+                   SUM(MAX(0, (julianday(updated_at) - julianday(created_at)) * 86400))
+            FROM {table}
+            WHERE status_id IN {done}
+            GROUP BY 2, 3
+            ON CONFLICT (domain, day, level_id) DO UPDATE SET
+                resolved = excluded.resolved,
+                resolve_seconds = excluded.resolve_seconds
+        """)
+
+
+def create_trend_rollups(cur: sqlite3.Cursor) -> None:
+    """Create daily trend rollups for incidents and tickets.
+
+    trend_rollups holds one row per (domain, day, severity/priority id):
+    how many rows were opened that day, and how many were resolved that
+    day with their summed time-to-resolve. Triggers keep it up to date as
+    rows are inserted, re-dated, re-levelled, resolved or deleted, so
+    trend charts and MTTR read a few hundred small rows instead of
+    scanning the base tables. Week/month buckets are derived from days.
+
+    Resolutions are events: reopening or deleting a resolved row does not
+    undo them.
+    """
+    exists = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trend_rollups'"
+    ).fetchone()
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS trend_rollups (
+            domain TEXT NOT NULL,
+            day TEXT NOT NULL,
+            level_id INTEGER NOT NULL,
+            opened INTEGER NOT NULL DEFAULT 0,
+            resolved INTEGER NOT NULL DEFAULT 0,
+            resolve_seconds REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (domain, day, level_id)
+        ) WITHOUT ROWID
+    """)
+
+    done = "(SELECT id FROM statuses WHERE label IN ({}))".format(
+        ", ".join(f"'{s}'" for s in DONE_STATUSES))
+
+    for table, (domain, level) in TREND_SOURCES.items():
+        new_day = "date(COALESCE(new.created_at, 'now'))"
+        old_day = "date(COALESCE(old.created_at, 'now'))"
+
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_trend_ai AFTER INSERT ON {table} BEGIN
+                {_trend_upsert(domain, new_day, f"new.{level}", opened="1")}
+                {_trend_upsert(domain, "date(COALESCE(new.updated_at, 'now'))", f"new.{level}",
+                               resolved="1",
+                               seconds="MAX(0, (julianday(new.updated_at) - julianday(new.created_at)) * 86400)",
+                               where=f"new.status_id IN {done}")}
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_trend_ad AFTER DELETE ON {table} BEGIN
+                {_trend_upsert(domain, old_day, f"old.{level}", opened="-1")}
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_trend_au_bucket
+            AFTER UPDATE OF created_at, {level} ON {table} BEGIN
+                {_trend_upsert(domain, old_day, f"old.{level}", opened="-1")}
+                {_trend_upsert(domain, new_day, f"new.{level}", opened="1")}
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_trend_au_status
+            AFTER UPDATE OF status_id ON {table}
+            WHEN new.status_id IN {done} AND old.status_id NOT IN {done} BEGIN
+                {_trend_upsert(domain, "date('now')", f"new.{level}", resolved="1",
+                               seconds="MAX(0, (julianday('now') - julianday(new.created_at)) * 86400)")}
+            END
+        """)
+
+    if not exists:
+        rebuild_trend_rollups(cur)
+
+
+# Tables whose updated_at is maintained by triggers (delta queries read these)
+TIMESTAMPED_TABLES = ("security_incidents", "it_tickets")
+
+def create_updated_at_triggers(cur: sqlite3.Cursor) -> None:
+    """Keep updated_at current on every UPDATE and index it for delta queries.
+
+    The trigger only fires when the UPDATE itself didn't set updated_at, so
+    its own write does not re-trigger it and explicit values (e.g. from a
+    migration) are kept.
+
+    The new value is strictly greater than the old one (at least 1 ms
+    later), even for two writes within the same millisecond, so every
+    update moves the row past a changes_since() watermark and the change
+    journal sees a changed updated_at.
+    """
+    for table in TIMESTAMPED_TABLES:
+        # Older databases have the non-monotonic version of this trigger
+        cur.execute(f"DROP TRIGGER IF EXISTS {table}_touch_updated_at")
+        cur.execute(f"""
+            CREATE TRIGGER {table}_touch_updated_at
+            AFTER UPDATE ON {table}
+            WHEN new.updated_at IS old.updated_at BEGIN
+                UPDATE {table}
+                SET updated_at = MAX({NOW_MS}, COALESCE(
+                    strftime('%Y-%m-%d %H:%M:%f', old.updated_at, '+0.001 seconds'), ''))
+                WHERE id = new.id;
+            END
+        """)
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_updated_at ON {table}(updated_at)")
+
+
+# Tables journaled into change_log -> columns captured (never password_hash)
+CHANGE_LOG_TABLES = {
+    "security_incidents": ["id", "incident_type", "severity_id", "status_id", "description",
+                           "created_at", "updated_at"],
+    "it_tickets": ["id", "title", "priority_id", "status_id", "assigned_to", "created_at", "updated_at"],
+    "datasets": ["id", "name", "size_bytes", "rows", "source", "created_at"],
+    "users": ["id", "username", "role", "created_at"],
+}
+
+
+def create_change_log(cur: sqlite3.Cursor) -> None:
+    """Create the change-data-capture journal and its triggers.
+
+    Every INSERT, UPDATE and DELETE on CHANGE_LOG_TABLES appends one row to
+    change_log with a JSON copy of the row (the old row for deletes).
+    seq is AUTOINCREMENT, so it only ever grows, even after compaction.
+    Consumers keep their position in change_log_offsets (see
+    services.change_feed).
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D')),
+            payload TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS change_log_offsets (
+            consumer TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    for table, columns in CHANGE_LOG_TABLES.items():
+        def payload(ref: str) -> str:
+            return "json_object({})".format(", ".join(f"'{c}', {ref}.{c}" for c in columns))
+
+        # The touch trigger re-updates the row to set updated_at; only that
+        # final write (or an UPDATE that sets updated_at itself) is journaled.
+        # Its bump is strictly monotonic, so each UPDATE changes updated_at
+        # exactly once and is journaled exactly once, even within one millisecond
+        when = "WHEN new.updated_at IS NOT old.updated_at" if table in TIMESTAMPED_TABLES else ""
+
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_cdc_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO change_log (table_name, row_id, op, payload)
+                VALUES ('{table}', new.id, 'I', {payload("new")});
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_cdc_au AFTER UPDATE ON {table} {when} BEGIN
+                INSERT INTO change_log (table_name, row_id, op, payload)
+                VALUES ('{table}', new.id, 'U', {payload("new")});
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_cdc_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO change_log (table_name, row_id, op, payload)
+                VALUES ('{table}', old.id, 'D', {payload("old")});
+            END
+        """)
+
+
+def create_sessions_table(cur: sqlite3.Cursor) -> None:
+    """Create the server-side login sessions table (see services.session_manager).
+
+    Only a SHA-256 of each session id is stored, so a copy of the database
+    does not hand out live sessions. expires_at is unix seconds.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id_hash TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at REAL NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions(username)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
+
+
 def initialize_database(db_path: str = "database/platform.db") -> None:
     """Initialize the database with required tables."""
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -19,18 +451,11 @@ def initialize_database(db_path: str = "database/platform.db") -> None:
         )
     """)
 
+    # Lookup tables for severity / status / priority
+    create_lookup_tables(cur)
+
     # Security incidents table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS security_incidents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            incident_type TEXT NOT NULL,
-            severity TEXT NOT NULL,
-            status TEXT DEFAULT 'Open',
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    cur.execute(SECURITY_INCIDENTS_DDL.format(name="security_incidents"))
 
     # Datasets table
     cur.execute("""
@@ -45,17 +470,7 @@ def initialize_database(db_path: str = "database/platform.db") -> None:
     """)
 
     # IT Tickets table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS it_tickets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            priority TEXT NOT NULL,
-            status TEXT DEFAULT 'Open',
-            assigned_to TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    cur.execute(IT_TICKETS_DDL.format(name="it_tickets"))
 
     # ✅ Chat History table (for AI Assistant pages)
     cur.execute("""
@@ -68,6 +483,31 @@ def initialize_database(db_path: str = "database/platform.db") -> None:
         )
     """)
 
+    # Older databases: free-text categoricals -> lookup ids
+    conn.commit()
+    migrate_categoricals(conn)
+
+    # Index-friendly equality filters on the coded columns
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_security_incidents_severity ON security_incidents(severity_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_security_incidents_status ON security_incidents(status_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_it_tickets_priority ON it_tickets(priority_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_it_tickets_status ON it_tickets(status_id)")
+
+    # updated_at maintenance + index for changes_since()
+    create_updated_at_triggers(cur)
+
+    # Change-data-capture journal for downstream consumers
+    create_change_log(cur)
+
+    # Full-text search indexes (AI Assistant retrieval, page search boxes)
+    create_search_index(cur)
+
+    # Daily opened/resolved rollups for trend charts and MTTR
+    create_trend_rollups(cur)
+
+    # Login sessions (signed tokens in st.session_state point here)
+    create_sessions_table(cur)
+
     conn.commit()
     conn.close()
     print(f"Database initialized at {db_path}")
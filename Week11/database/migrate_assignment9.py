@@ -0,0 +1,389 @@
+"""Stream data from an Assignment-9 database into the Week11 platform.db.
+
+Maps cyber_incidents -> security_incidents, datasets_metadata -> datasets
+and it_tickets -> it_tickets, converting columns on the way. Rows are read
+in id order one batch at a time and each batch is written in its own
+transaction together with a checkpoint, so memory stays bounded and an
+interrupted run resumes where it stopped.
+
+Users are not migrated: Assignment-9 stores bcrypt hashes, which the
+Week11 AuthManager cannot verify. datasets_metadata.category is not
+migrated either: the Week11 datasets table has no column for it.
+
+Rows without a date (e.g. created from the Assignment-9 CRUD page) get
+the time the table's migration started, which is stored with the
+checkpoint so verification recomputes the same value.
+
+Usage:
+    python database/migrate_assignment9.py SOURCE_DB [TARGET_DB] [--batch-size N] [--verify-only]
+"""
+import argparse
+import hashlib
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Assignment-9 stores dataset size in KB
+SIZE_UNIT_BYTES = 1024
+
+
+def _timestamp(date_text: Optional[str], missing: str) -> str:
+    """Convert an Assignment-9 'YYYY-MM-DD' date into a Week11 timestamp.
+
+    Args:
+        date_text: Source date (may be NULL)
+        missing: Timestamp used when there is no date; must be the same on
+                 every call for a table, or verify() would not match
+    """
+    if not date_text:
+        return missing
+    return f"{date_text} 00:00:00" if len(date_text) == 10 else date_text
+
+
+class TableMapping:
+    """How one source table maps onto one target table."""
+
+    def __init__(self, source: str, target: str, source_columns: Dict[str, str],
+                 target_columns: List[str], convert: Callable):
+        """Initialize a table mapping.
+
+        Args:
+            source: Source table name
+            target: Target table name
+            source_columns: Output name -> SQL expression over the source row
+                            (the first one must be the source id)
+            target_columns: Target columns filled by convert(), in order
+            convert: Function (source row, lookups, timestamp for missing
+                     dates) -> target value tuple
+        """
+        self.source = source
+        self.target = target
+        self.source_columns = source_columns
+        self.target_columns = target_columns
+        self.convert = convert
+
+
+def _label_expr(conn: sqlite3.Connection, table: str, text_column: str,
+                id_column: str, lookup: str) -> str:
+    """SQL expression for a categorical label, for old and normalized sources."""
+    columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+    if id_column in columns:
+        return f"(SELECT label FROM {lookup} WHERE id = {table}.{id_column})"
+    return f"{table}.{text_column}"
+
+
+def build_mappings(source: sqlite3.Connection) -> List[TableMapping]:
+    """Build the table mappings, adapting to the source schema version."""
+    def incident(row, lk, missing):
+        _, title, severity, status, date = row
+        created = _timestamp(date, missing)
+        return ("Other", lk("severity_levels", severity), lk("statuses", status or "Open"),
+                title, created, created)
+
+    def dataset(row, lk, missing):
+        _, name, source_name, size = row
+        size_bytes = int(size) * SIZE_UNIT_BYTES if size is not None else None
+        return (name, size_bytes, None, source_name)
+
+    def ticket(row, lk, missing):
+        _, title, priority, status, created_date = row
+        created = _timestamp(created_date, missing)
+        return (title, lk("priorities", priority), lk("statuses", status or "Open"),
+                None, created, created)
+
+    return [
+        TableMapping(
+            "cyber_incidents", "security_incidents",
+            {
+                "id": "id",
+                "title": "title",
+                "severity": _label_expr(source, "cyber_incidents", "severity", "severity_id", "severity_levels"),
+                "status": _label_expr(source, "cyber_incidents", "status", "status_id", "statuses"),
+                "date": "date",
+            },
+            ["incident_type", "severity_id", "status_id", "description", "created_at", "updated_at"],
+            incident,
+        ),
+        TableMapping(
+            "datasets_metadata", "datasets",
+            {"id": "id", "name": "name", "source": "source", "size": "size"},
+            ["name", "size_bytes", "rows", "source"],
+            dataset,
+        ),
+        TableMapping(
+            "it_tickets", "it_tickets",
+            {
+                "id": "id",
+                "title": "title",
+                "priority": _label_expr(source, "it_tickets", "priority", "priority_id", "priorities"),
+                "status": _label_expr(source, "it_tickets", "status", "status_id", "statuses"),
+                "created_date": "created_date",
+            },
+            ["title", "priority_id", "status_id", "assigned_to", "created_at", "updated_at"],
+            ticket,
+        ),
+    ]
+
+
+def _row_hash(values: Sequence) -> int:
+    """Stable 64-bit hash of one row's values."""
+    digest = hashlib.blake2b(repr(tuple(values)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class Assignment9Migrator:
+    """Batched, resumable migration from an Assignment-9 database.
+
+    Target ids are source ids shifted by a fixed offset (chosen on the
+    first run and stored with the checkpoint), so migrated rows never
+    collide with rows already in the target and can be found again for
+    verification. Don't write to the target tables while a migration is
+    paused half-way.
+    """
+
+    def __init__(self, source_path: str, target_path: str, batch_size: int = 5000):
+        """Initialize the migrator.
+
+        Args:
+            source_path: Path to the Assignment-9 database
+            target_path: Path to the Week11 platform database
+            batch_size: Rows read and committed per transaction
+        """
+        self._source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+        self._target = sqlite3.connect(target_path)
+        self._batch_size = batch_size
+        self._mappings = build_mappings(self._source)
+        self._lookups = self._load_lookups()
+        self._create_checkpoint_table()
+
+    def _load_lookups(self) -> Dict[str, Dict[str, int]]:
+        lookups = {}
+        for table in ("severity_levels", "statuses", "priorities"):
+            rows = self._target.execute(f"SELECT id, label FROM {table}").fetchall()
+            lookups[table] = {label.lower(): lookup_id for lookup_id, label in rows}
+        return lookups
+
+    def _lookup(self, table: str, label: str) -> int:
+        try:
+            return self._lookups[table][str(label).strip().lower()]
+        except KeyError:
+            raise ValueError(f"Unknown {table} value in source: {label!r}")
+
+    def _create_checkpoint_table(self) -> None:
+        self._target.execute("""
+            CREATE TABLE IF NOT EXISTS migration_checkpoints (
+                source_table TEXT PRIMARY KEY,
+                id_offset INTEGER NOT NULL,
+                last_source_id INTEGER NOT NULL DEFAULT 0,
+                rows_copied INTEGER NOT NULL DEFAULT 0,
+                started_at TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Checkpoint tables from before started_at existed
+        columns = [r[1] for r in self._target.execute("PRAGMA table_info(migration_checkpoints)")]
+        if "started_at" not in columns:
+            self._target.execute("ALTER TABLE migration_checkpoints ADD COLUMN started_at TEXT")
+        self._target.commit()
+
+    def _read_checkpoint(self, mapping: TableMapping) -> Tuple[Tuple[int, int, int, str], bool]:
+        """Return the checkpoint as _checkpoint() would, without writing it.
+
+        Returns:
+            ((id_offset, last_source_id, rows_copied, started_at), stored),
+            where stored is False when the checkpoint is missing or has no
+            started_at yet and the values were computed here
+        """
+        row = self._target.execute(
+            """SELECT id_offset, last_source_id, rows_copied, started_at
+               FROM migration_checkpoints WHERE source_table = ?""",
+            (mapping.source,),
+        ).fetchone()
+        if row is not None and row[3] is not None:
+            return tuple(row), True
+
+        started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if row is not None:
+            return (row[0], row[1], row[2], started_at), False
+
+        offset = self._target.execute(f"SELECT COALESCE(MAX(id), 0) FROM {mapping.target}").fetchone()[0]
+        return (offset, 0, 0, started_at), False
+
+    def _checkpoint(self, mapping: TableMapping) -> Tuple[int, int, int, str]:
+        """Return (id_offset, last_source_id, rows_copied, started_at), creating it if new."""
+        checkpoint, stored = self._read_checkpoint(mapping)
+        if stored:
+            return checkpoint
+
+        # New checkpoint, or an older one without started_at: its offset is kept
+        # and its start time fixed from now on
+        self._target.execute(
+            """INSERT INTO migration_checkpoints (source_table, id_offset, started_at)
+               VALUES (?, ?, ?)
+               ON CONFLICT(source_table) DO UPDATE SET started_at = excluded.started_at""",
+            (mapping.source, checkpoint[0], checkpoint[3]),
+        )
+        self._target.commit()
+        return checkpoint
+
+    def _select_sql(self, mapping: TableMapping, where: str) -> str:
+        exprs = ", ".join(mapping.source_columns.values())
+        return f"SELECT {exprs} FROM {mapping.source} {where} ORDER BY id LIMIT ?"
+
+    def migrate_table(self, mapping: TableMapping) -> int:
+        """Copy the remaining rows of one table.
+
+        Args:
+            mapping: Table mapping to run
+
+        Returns:
+            Number of rows copied in this run
+        """
+        offset, last_id, copied, started_at = self._checkpoint(mapping)
+        columns = ["id"] + mapping.target_columns
+        insert_sql = (
+            f"INSERT INTO {mapping.target} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        select_sql = self._select_sql(mapping, "WHERE id > ?")
+        copied_now = 0
+
+        while True:
+            # Keyset pagination: only one batch is ever held in memory
+            rows = self._source.execute(select_sql, (last_id, self._batch_size)).fetchall()
+            if not rows:
+                break
+
+            batch = [(row[0] + offset,) + mapping.convert(row, self._lookup, started_at) for row in rows]
+            last_id = rows[-1][0]
+
+            try:
+                self._target.execute("BEGIN")
+                self._target.executemany(insert_sql, batch)
+                self._target.execute(
+                    """UPDATE migration_checkpoints
+                       SET last_source_id = ?, rows_copied = rows_copied + ?, updated_at = CURRENT_TIMESTAMP
+                       WHERE source_table = ?""",
+                    (last_id, len(batch), mapping.source),
+                )
+                self._target.commit()
+            except Exception:
+                self._target.rollback()
+                raise
+
+            copied_now += len(batch)
+            print(f"  {mapping.source}: {copied + copied_now} rows copied (up to id {last_id})")
+
+        return copied_now
+
+    def migrate(self) -> None:
+        """Copy all mapped tables, resuming from saved checkpoints."""
+        for mapping in self._mappings:
+            print(f"Migrating {mapping.source} -> {mapping.target}")
+            self.migrate_table(mapping)
+
+    def verify(self) -> List[Dict]:
+        """Compare row counts and checksums between source and target.
+
+        The source side is checksummed over the converted values, the target
+        side over the same columns read back, both streamed in batches.
+        Read-only: a table that was never migrated is reported with its
+        offset computed on the fly, nothing is checkpointed.
+
+        Returns:
+            One report dict per table
+        """
+        report = []
+        for mapping in self._mappings:
+            (offset, last_id, _, started_at), _ = self._read_checkpoint(mapping)
+
+            source_count, source_sum = 0, 0
+            select_sql = self._select_sql(mapping, "WHERE id > ? AND id <= ?")
+            cursor_id = 0
+            while True:
+                rows = self._source.execute(select_sql, (cursor_id, last_id, self._batch_size)).fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    source_sum = (source_sum + _row_hash(mapping.convert(row, self._lookup, started_at))) % (1 << 64)
+                source_count += len(rows)
+                cursor_id = rows[-1][0]
+
+            target_count, target_sum = 0, 0
+            cursor = self._target.execute(
+                f"SELECT {', '.join(mapping.target_columns)} FROM {mapping.target} "
+                f"WHERE id > ? AND id <= ? ORDER BY id",
+                (offset, offset + last_id),
+            )
+            while True:
+                rows = cursor.fetchmany(self._batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    target_sum = (target_sum + _row_hash(row)) % (1 << 64)
+                target_count += len(rows)
+
+            remaining = self._source.execute(
+                f"SELECT COUNT(*) FROM {mapping.source} WHERE id > ?", (last_id,)
+            ).fetchone()[0]
+
+            report.append({
+                "table": f"{mapping.source} -> {mapping.target}",
+                "source_rows": source_count,
+                "target_rows": target_count,
+                "pending_rows": remaining,
+                "source_checksum": f"{source_sum:016x}",
+                "target_checksum": f"{target_sum:016x}",
+                "ok": source_count == target_count and source_sum == target_sum,
+            })
+        return report
+
+    def close(self) -> None:
+        """Close both database connections."""
+        self._source.close()
+        self._target.close()
+
+
+def print_report(report: List[Dict]) -> None:
+    """Print a verification report as a table."""
+    print(f"{'table':<42} {'source':>10} {'target':>10} {'pending':>9}  checksum")
+    for entry in report:
+        status = "OK" if entry["ok"] else "MISMATCH"
+        print(
+            f"{entry['table']:<42} {entry['source_rows']:>10} {entry['target_rows']:>10} "
+            f"{entry['pending_rows']:>9}  {entry['source_checksum']} / {entry['target_checksum']} {status}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate Assignment-9 data into the Week11 platform database.")
+    parser.add_argument("source", help="Assignment-9 database (e.g. DATA/intelligence_platform.db)")
+    parser.add_argument("target", nargs="?", default="database/platform.db", help="Week11 platform database")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per transaction")
+    parser.add_argument("--verify-only", action="store_true", help="only print the verification report")
+    args = parser.parse_args(argv)
+
+    if not Path(args.source).exists():
+        print(f"Source database not found: {args.source}")
+        return 1
+
+    # Make sure the target has the current schema (lookup tables, indexes, ...)
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from database.db import initialize_database
+    initialize_database(args.target)
+
+    migrator = Assignment9Migrator(args.source, args.target, args.batch_size)
+    try:
+        if not args.verify_only:
+            migrator.migrate()
+        report = migrator.verify()
+        print_report(report)
+        return 0 if all(entry["ok"] for entry in report) else 2
+    finally:
+        migrator.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import streamlit as st
+import sys
+from pathlib import Path
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.auth_manager import AuthManager
+from services.db_registry import get_db
+from services.rate_limiter import format_wait
+from services.session_manager import SessionManager, session_user
+
+st.set_page_config(
+    page_title="Login - Multi-Domain Platform",
+    page_icon="🔑",
+    layout="centered"
+)
+
+st.title("🔑 Login")
+st.markdown("---")
+
+if session_user(st.session_state) is not None:
+    st.success("Logged in as: {} (Role: {})".format(st.session_state.current_user,
+                                                    st.session_state.current_role))
+    st.info("Use the left sidebar pages to navigate.")
+    st.stop()
+
+# ✅ IP address when Streamlit exposes it (not on localhost / behind some proxies),
+# else this browser session, so one client's failures never lock out everybody
+client = getattr(st.context, "ip_address", None)
+if not client:
+    ctx = get_script_run_ctx()
+    client = "session:" + (ctx.session_id if ctx is not None else "unknown")
+
+# ✅ Shared, already-open connection of this thread (see services.db_registry)
+db = get_db()
+auth = AuthManager(db)
+tab1, tab2 = st.tabs(["Login", "Register"])
+
+with tab1:
+    with st.form("login_form"):
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        submitted = st.form_submit_button("Login", use_container_width=True)
+
+    if submitted:
+        wait = auth.retry_after(username, client)
+        if not username or not password:
+            st.error("Username and password are required")
+        elif wait > 0:
+            st.error("⛔ Too many failed attempts, try again in {}".format(format_wait(wait)))
+        else:
+            user = auth.login_user(username, password, client)
+            if user is None:
+                st.error("Invalid username or password")
+            else:
+                # ✅ Only the signed token lives in session state; pages resolve it
+                st.session_state.session_token = SessionManager(db).create_session(user)
+                st.session_state.current_user = user.get_username()
+                st.session_state.current_role = user.get_role()
+                st.rerun()
+
+with tab2:
+    with st.form("register_form"):
+        new_username = st.text_input("New Username")
+        new_password = st.text_input("New Password", type="password")
+        confirm_password = st.text_input("Confirm Password", type="password")
+        registered = st.form_submit_button("Register", use_container_width=True)
+
+    if registered:
+        if not new_username or not new_password:
+            st.error("All fields are required")
+        elif new_password != confirm_password:
+            st.error("Passwords do not match")
+        elif auth.register_user(new_username, new_password):
+            st.success("✅ Account created - you can log in now")
+        else:
+            st.error("Username already exists")
@@ -1,11 +1,19 @@
 import streamlit as st
+import os
 import sys
+import pandas as pd
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.database_manager import DatabaseManager
+from services.session_manager import session_user
+from services.db_registry import get_db
+from services.export_service import FORMATS, ExportService, session_export_file
 from models.security_incident import SecurityIncident
+from services.search_service import SearchService
+from services.lookups import LookupCache
+from services.trend_service import BUCKETS, PERIODS, TrendService, period_start
+from services.profiler import Profiler, show_profile_panel
 
 st.set_page_config(
     page_title="Cybersecurity - Multi-Domain Platform",
@@ -17,14 +25,20 @@ st.title("🛡️ Cybersecurity Incidents")
 st.markdown("---")
 
 # Check if logged in
-if not st.session_state.get("current_user"):
+# ✅ Signed session token -> user and current role (cached; re-checked every few seconds)
+if session_user(st.session_state) is None:
     st.warning("⚠️ Please login first")
     st.stop()
 
 st.success("Logged in as: {}".format(st.session_state.current_user))
 
-db = DatabaseManager("database/platform.db")
-db.connect()
+# ✅ Opt-in (admin sidebar): db time is recorded by DatabaseManager, transforms below
+profiler = Profiler("Cybersecurity", enabled=st.session_state.get("profiling", False))
+
+# ✅ Shared, already-open connection of this thread (see services.db_registry)
+db = get_db()
+lookups = LookupCache(db)
+trends = TrendService(db)
 
 try:
     tab1, tab2, tab3 = st.tabs(["View Incidents", "Add Incident", "Statistics"])
@@ -35,6 +49,24 @@ try:
     with tab1:
         st.subheader("Security Incidents")
 
+        # ✅ Streamed in chunks to this session's export directory (the previous file is
+        # replaced, the directory removed on logout); only the finished file goes to the browser
+        with st.expander("📤 Export all incidents"):
+            export_format = st.selectbox("Format", list(FORMATS), key="incident_export_format")
+            if st.button("Prepare export", key="incident_export"):
+                try:
+                    export_file = session_export_file(st.session_state, "incident_export_file",
+                                                      ExportService.file_name("security_incidents", export_format))
+                    ExportService(db.db_path).export("security_incidents", export_file, export_format)
+                    st.session_state["incident_export_file"] = export_file
+                except RuntimeError as e:
+                    st.error(str(e))
+            export_file = st.session_state.get("incident_export_file")
+            if export_file and os.path.exists(export_file):
+                with open(export_file, "rb") as f:
+                    st.download_button("⬇️ Download {}".format(os.path.basename(export_file)), f,
+                                       file_name=os.path.basename(export_file), key="incident_download")
+
         col1, col2, col3 = st.columns(3)
         with col1:
             severity_filter = st.selectbox(
@@ -47,88 +79,98 @@ try:
                 ["All", "Open", "In Progress", "Resolved", "Closed"]
             )
         with col3:
-            st.empty()
+            search_text = st.text_input("🔍 Search", placeholder="e.g. phish credential")
 
         try:
-            rows = db.fetch_all("SELECT id, incident_type, severity, status, description FROM security_incidents")
-
-            if not rows:
-                st.info("📋 No security incidents recorded yet")
+            has_more = False
+            if search_text.strip():
+                # ✅ FTS5 index: ranked, prefix-matched, one page at a time
+                search_page = st.number_input("Results page", min_value=1, value=1, step=1)
+                incidents, has_more = SearchService(db).search_incidents(
+                    search_text,
+                    page=int(search_page),
+                    severity=None if severity_filter == "All" else severity_filter,
+                    status=None if status_filter == "All" else status_filter
+                )
             else:
-                incidents = []
-                for row in rows:
-                    incidents.append(
-                        SecurityIncident(
-                            incident_id=row[0],
-                            incident_type=row[1],
-                            severity=row[2],
-                            status=row[3],
-                            description=row[4]
-                        )
-                    )
-
-                filtered = incidents
-
+                # ✅ Filters run in SQL on the indexed lookup-id columns
+                sql = "SELECT id, incident_type, severity_id, status_id, description FROM security_incidents WHERE 1 = 1"
+                params = []
                 if severity_filter != "All":
-                    filtered = [
-                        i for i in filtered
-                        if (i.get_severity() or "").lower() == severity_filter.lower()
-                    ]
-
+                    sql += " AND severity_id = ?"
+                    params.append(lookups.id_for("severity_levels", severity_filter))
                 if status_filter != "All":
-                    filtered = [
-                        i for i in filtered
-                        if (i.get_status() or "").strip().lower() == status_filter.strip().lower()
-                    ]
+                    sql += " AND status_id = ?"
+                    params.append(lookups.id_for("statuses", status_filter))
+
+                rows = db.fetch_all(sql, params)
+                incidents = []
+                with profiler.phase("transform"):
+                    for row in rows:
+                        incidents.append(
+                            SecurityIncident(
+                                incident_id=row[0],
+                                incident_type=row[1],
+                                severity=lookups.label("severity_levels", row[2]),
+                                status=lookups.label("statuses", row[3]),
+                                description=row[4]
+                            )
+                        )
 
-                if not filtered:
+            if not incidents:
+                if search_text.strip() or severity_filter != "All" or status_filter != "All":
                     st.info("No incidents match the selected filters")
                 else:
-                    for incident in filtered:
-                        # ✅ FIX: no border=True (older Streamlit)
-                        with st.container():
-                            c1, c2, c3, c4 = st.columns(4)
-
-                            with c1:
-                                st.metric("ID", incident.get_id())
-
-                            with c2:
-                                severity_level = incident.get_severity_level()
-                                sev_text = (incident.get_severity() or "Unknown").upper()
-                                st.metric("Severity", "{} ({}/4)".format(sev_text, severity_level))
-
-                            with c3:
-                                st.metric("Type", incident.get_incident_type() or "Unknown")
-
-                            with c4:
-                                st.metric("Status", incident.get_status() or "Unknown")
-
-                            st.write("**Description:** {}".format(incident.get_description() or ""))
-
-                            with st.expander("Update Status"):
-                                status_options = ["Open", "In Progress", "Resolved", "Closed"]
-                                current_status = (incident.get_status() or "Open").strip()
-
-                                index_val = 0
-                                if current_status in status_options:
-                                    index_val = status_options.index(current_status)
-
-                                new_status = st.selectbox(
-                                    "New Status",
-                                    status_options,
-                                    index=index_val,
-                                    key="status_select_{}".format(incident.get_id())
+                    st.info("📋 No security incidents recorded yet")
+            else:
+                for incident in incidents:
+                    # ✅ FIX: no border=True (older Streamlit)
+                    with st.container():
+                        c1, c2, c3, c4 = st.columns(4)
+
+                        with c1:
+                            st.metric("ID", incident.get_id())
+
+                        with c2:
+                            severity_level = incident.get_severity_level()
+                            sev_text = (incident.get_severity() or "Unknown").upper()
+                            st.metric("Severity", "{} ({}/4)".format(sev_text, severity_level))
+
+                        with c3:
+                            st.metric("Type", incident.get_incident_type() or "Unknown")
+
+                        with c4:
+                            st.metric("Status", incident.get_status() or "Unknown")
+
+                        st.write("**Description:** {}".format(incident.get_description() or ""))
+
+                        with st.expander("Update Status"):
+                            status_options = ["Open", "In Progress", "Resolved", "Closed"]
+                            current_status = (incident.get_status() or "Open").strip()
+
+                            index_val = 0
+                            if current_status in status_options:
+                                index_val = status_options.index(current_status)
+
+                            new_status = st.selectbox(
+                                "New Status",
+                                status_options,
+                                index=index_val,
+                                key="status_select_{}".format(incident.get_id())
+                            )
+
+                            if st.button("Save Status", key="save_status_{}".format(incident.get_id())):
+                                db.execute_query(
+                                    "UPDATE security_incidents SET status_id = ? WHERE id = ?",
+                                    (lookups.id_for("statuses", new_status), incident.get_id())
                                 )
+                                st.success("✅ Incident {} updated to {}".format(incident.get_id(), new_status))
+                                st.experimental_rerun()
 
-                                if st.button("Save Status", key="save_status_{}".format(incident.get_id())):
-                                    db.execute_query(
-                                        "UPDATE security_incidents SET status = ? WHERE id = ?",
-                                        (new_status, incident.get_id())
-                                    )
-                                    st.success("✅ Incident {} updated to {}".format(incident.get_id(), new_status))
-                                    st.experimental_rerun()
+                    st.markdown("---")
 
-                        st.markdown("---")
+                if has_more:
+                    st.caption("More results on the next page")
 
         except Exception as e:
             st.error("Error fetching incidents: {}".format(e))
@@ -161,8 +203,13 @@ try:
             else:
                 try:
                     db.execute_query(
-                        "INSERT INTO security_incidents (incident_type, severity, status, description) VALUES (?, ?, ?, ?)",
-                        (incident_type, severity, "Open", description)
+                        "INSERT INTO security_incidents (incident_type, severity_id, status_id, description) VALUES (?, ?, ?, ?)",
+                        (
+                            incident_type,
+                            lookups.id_for("severity_levels", severity),
+                            lookups.id_for("statuses", "Open"),
+                            description
+                        )
                     )
                     st.success("✅ Incident reported successfully!")
                     st.experimental_rerun()
@@ -176,19 +223,18 @@ try:
         st.subheader("Security Statistics")
 
         try:
-            severity_stats = {}
-            for sev in ["low", "medium", "high", "critical"]:
-                severity_stats[sev] = db.fetch_one(
-                    "SELECT COUNT(*) FROM security_incidents WHERE LOWER(severity) = ?",
-                    (sev,)
-                )[0]
-
-            status_stats = {}
-            for status in ["Open", "In Progress", "Resolved", "Closed"]:
-                status_stats[status] = db.fetch_one(
-                    "SELECT COUNT(*) FROM security_incidents WHERE status = ?",
-                    (status,)
-                )[0]
+            # ✅ One GROUP BY per chart instead of a COUNT(*) per label
+            severity_stats = {label: 0 for label in lookups.labels("severity_levels")}
+            for severity_id, count in db.fetch_all(
+                "SELECT severity_id, COUNT(*) FROM security_incidents GROUP BY severity_id"
+            ):
+                severity_stats[lookups.label("severity_levels", severity_id)] = count
+
+            status_stats = {label: 0 for label in lookups.labels("statuses")}
+            for status_id, count in db.fetch_all(
+                "SELECT status_id, COUNT(*) FROM security_incidents GROUP BY status_id"
+            ):
+                status_stats[lookups.label("statuses", status_id)] = count
 
             col1, col2 = st.columns(2)
 
@@ -202,8 +248,33 @@ try:
                 st.bar_chart(status_stats)
                 st.caption("Incidents by Status")
 
+            st.markdown("---")
+            st.subheader("📈 Trends")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                bucket = st.selectbox("Group by", list(BUCKETS), index=1, key="incident_trend_bucket")
+            with col2:
+                period = st.selectbox("Period", list(PERIODS), key="incident_trend_period")
+            start = period_start(period)
+
+            # ✅ Reads the trigger-maintained rollups, not the incidents table
+            buckets, series = trends.series("incidents", bucket, start)
+            if not buckets:
+                st.info("No incidents in this period")
+            else:
+                with profiler.phase("transform"):
+                    trend_frame = pd.DataFrame(series, index=buckets)
+                st.line_chart(trend_frame)
+                st.caption("New incidents per {} by severity".format(bucket))
+
+            mttr = trends.mean_time_to_resolve("incidents", start)
+            for col, (label, hours) in zip(st.columns(len(mttr)), mttr.items()):
+                col.metric("MTTR ({})".format(label), "-" if hours is None else "{:.1f} h".format(hours))
+
         except Exception as e:
             st.error("Error loading statistics: {}".format(e))
 
 finally:
-    db.close()
+    profiler.finish()
+    show_profile_panel(profiler, st.session_state.get("current_role") == "admin")
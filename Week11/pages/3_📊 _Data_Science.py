@@ -1,11 +1,16 @@
 import streamlit as st
+import os
 import sys
 from pathlib import Path
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.database_manager import DatabaseManager
+from services.session_manager import session_user
+from services.db_registry import get_db
+from services.export_service import FORMATS, ExportService, session_export_file
+from services.snapshot_manager import SnapshotManager
+from services.profiler import Profiler, show_profile_panel
 from models.dataset import Dataset
 
 
@@ -26,6 +31,12 @@ def safe_int(x, default=0):
         return default
 
 
+@st.cache_resource
+def get_snapshots() -> SnapshotManager:
+    # One manager per process, so every session shares the same snapshot
+    return SnapshotManager("database/platform.db", max_age_seconds=300)
+
+
 st.set_page_config(
     page_title="Data Science - Multi-Domain Platform",
     page_icon="📊",
@@ -36,15 +47,30 @@ st.title("📊 Data Science")
 st.markdown("---")
 
 # Check login
-if not st.session_state.get("current_user"):
+# ✅ Signed session token -> user and current role (cached; re-checked every few seconds)
+if session_user(st.session_state) is None:
     st.warning("⚠️ Please login first")
     st.stop()
 
 st.success("Logged in as: {}".format(st.session_state.current_user))
 
-# Connect DB
-db = DatabaseManager("database/platform.db")
-db.connect()
+# ✅ Opt-in (admin sidebar): db time is recorded by DatabaseManager, transforms below
+profiler = Profiler("Data Science", enabled=st.session_state.get("profiling", False))
+
+# ✅ Shared, already-open DB connection of this thread (writes, see services.db_registry)
+# and the read-only snapshot (views and analysis)
+db = get_db()
+
+snapshots = get_snapshots()
+if st.button("🔄 Refresh snapshot"):
+    snapshots.refresh()
+reader = snapshots.reader()
+reader.connect()
+
+age = snapshots.age_seconds() or 0
+st.caption("Showing a read-only snapshot taken {:.0f}s ago (refreshed every {} min).".format(
+    age, snapshots.max_age_seconds // 60
+))
 
 try:
     # ✅ Tabs if your Streamlit supports it, otherwise sidebar menu
@@ -65,6 +91,24 @@ try:
             with ui:
                 st.subheader("Available Datasets")
 
+                # ✅ Streamed in chunks to this session's export directory (the previous file is
+                # replaced, the directory removed on logout); only the finished file goes to the browser
+                with st.expander("📤 Export all datasets"):
+                    export_format = st.selectbox("Format", list(FORMATS), key="dataset_export_format")
+                    if st.button("Prepare export", key="dataset_export"):
+                        try:
+                            export_file = session_export_file(st.session_state, "dataset_export_file",
+                                                              ExportService.file_name("datasets", export_format))
+                            ExportService(db.db_path).export("datasets", export_file, export_format)
+                            st.session_state["dataset_export_file"] = export_file
+                        except RuntimeError as e:
+                            st.error(str(e))
+                    export_file = st.session_state.get("dataset_export_file")
+                    if export_file and os.path.exists(export_file):
+                        with open(export_file, "rb") as f:
+                            st.download_button("⬇️ Download {}".format(os.path.basename(export_file)), f,
+                                               file_name=os.path.basename(export_file), key="dataset_download")
+
                 col1, col2 = st.columns(2)
                 with col1:
                     sort_by = st.selectbox("Sort by", ["Name", "Size", "Rows"])
@@ -72,30 +116,31 @@ try:
                     st.empty()
 
                 try:
-                    rows = db.fetch_all("SELECT id, name, size_bytes, rows, source FROM datasets")
+                    rows = reader.fetch_all("SELECT id, name, size_bytes, rows, source FROM datasets")
 
                     if not rows:
                         st.info("📋 No datasets uploaded yet")
                     else:
                         datasets = []
-                        for row in rows:
-                            datasets.append(
-                                Dataset(
-                                    dataset_id=row[0],
-                                    name=row[1],
-                                    size_bytes=row[2],
-                                    rows=row[3],
-                                    source=row[4]
+                        with profiler.phase("transform"):
+                            for row in rows:
+                                datasets.append(
+                                    Dataset(
+                                        dataset_id=row[0],
+                                        name=row[1],
+                                        size_bytes=row[2],
+                                        rows=row[3],
+                                        source=row[4]
+                                    )
                                 )
-                            )
 
-                        # Sort datasets
-                        if sort_by == "Size":
-                            datasets.sort(key=lambda x: float(x.calculate_size_mb() or 0), reverse=True)
-                        elif sort_by == "Rows":
-                            datasets.sort(key=lambda x: safe_int(x.get_rows(), 0), reverse=True)
-                        else:
-                            datasets.sort(key=lambda x: (x.get_name() or "").lower())
+                            # Sort datasets
+                            if sort_by == "Size":
+                                datasets.sort(key=lambda x: float(x.calculate_size_mb() or 0), reverse=True)
+                            elif sort_by == "Rows":
+                                datasets.sort(key=lambda x: safe_int(x.get_rows(), 0), reverse=True)
+                            else:
+                                datasets.sort(key=lambda x: (x.get_name() or "").lower())
 
                         for dataset in datasets:
                             # ✅ No border=True (older streamlit safe)
@@ -159,6 +204,8 @@ try:
                                 "INSERT INTO datasets (name, size_bytes, rows, source) VALUES (?, ?, ?, ?)",
                                 (dataset_name, size_bytes, int(num_rows), dataset_source)
                             )
+                            # Publish right away so the new dataset shows up in the views
+                            snapshots.refresh()
                             st.success("✅ Dataset '{}' uploaded successfully!".format(dataset_name))
                             do_rerun()
                         except Exception as e:
@@ -170,7 +217,7 @@ try:
                 st.subheader("Data Analysis")
 
                 try:
-                    rows = db.fetch_all("SELECT id, name, size_bytes, rows, source FROM datasets")
+                    rows = reader.fetch_all("SELECT id, name, size_bytes, rows, source FROM datasets")
 
                     if not rows:
                         st.info("📊 No data to analyze yet. Upload datasets first!")
@@ -189,20 +236,23 @@ try:
 
                         st.markdown("---")
 
-                        dataset_names = [(r[1] or "Unknown") for r in rows]
-                        dataset_sizes = [safe_int(r[2], 0) / (1024**2) for r in rows]  # MB
-                        dataset_rows = [safe_int(r[3], 0) for r in rows]
+                        with profiler.phase("transform"):
+                            dataset_names = [(r[1] or "Unknown") for r in rows]
+                            dataset_sizes = [safe_int(r[2], 0) / (1024**2) for r in rows]  # MB
+                            dataset_rows = [safe_int(r[3], 0) for r in rows]
+                            chart_data = pd.DataFrame({"Dataset": dataset_names, "Size (MB)": dataset_sizes})
+                            chart_data2 = pd.DataFrame({"Dataset": dataset_names, "Rows": dataset_rows})
 
                         st.subheader("Dataset Size Distribution")
-                        chart_data = pd.DataFrame({"Dataset": dataset_names, "Size (MB)": dataset_sizes})
                         st.bar_chart(chart_data.set_index("Dataset"))
 
                         st.subheader("Row Count by Dataset")
-                        chart_data2 = pd.DataFrame({"Dataset": dataset_names, "Rows": dataset_rows})
                         st.line_chart(chart_data2.set_index("Dataset"))
 
                 except Exception as e:
                     st.error("Error loading analysis: {}".format(e))
 
 finally:
-    db.close()
+    reader.close()
+    profiler.finish()
+    show_profile_panel(profiler, st.session_state.get("current_role") == "admin")
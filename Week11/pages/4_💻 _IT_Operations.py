@@ -1,11 +1,19 @@
 import streamlit as st
+import os
 import sys
+import pandas as pd
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.database_manager import DatabaseManager
+from services.session_manager import session_user
+from services.db_registry import get_db
+from services.export_service import FORMATS, ExportService, session_export_file
 from models.it_ticket import ITTicket
+from services.search_service import SearchService
+from services.lookups import LookupCache
+from services.trend_service import BUCKETS, PERIODS, TrendService, period_start
+from services.profiler import Profiler, show_profile_panel
 
 st.set_page_config(
     page_title="IT Operations - Multi-Domain Platform",
@@ -17,14 +25,20 @@ st.title("💻 IT Operations")
 st.markdown("---")
 
 # Check if logged in
-if not st.session_state.get("current_user"):
+# ✅ Signed session token -> user and current role (cached; re-checked every few seconds)
+if session_user(st.session_state) is None:
     st.warning("⚠️ Please login first")
     st.stop()
 
 st.success("Logged in as: {}".format(st.session_state.current_user))
 
-db = DatabaseManager("database/platform.db")
-db.connect()
+# ✅ Opt-in (admin sidebar): db time is recorded by DatabaseManager, transforms below
+profiler = Profiler("IT Operations", enabled=st.session_state.get("profiling", False))
+
+# ✅ Shared, already-open connection of this thread (see services.db_registry)
+db = get_db()
+lookups = LookupCache(db)
+trends = TrendService(db)
 
 try:
     tab1, tab2, tab3 = st.tabs(["View Tickets", "Create Ticket", "Statistics"])
@@ -35,102 +49,138 @@ try:
     with tab1:
         st.subheader("Support Tickets")
 
+        # ✅ Streamed in chunks to this session's export directory (the previous file is
+        # replaced, the directory removed on logout); only the finished file goes to the browser
+        with st.expander("📤 Export all tickets"):
+            export_format = st.selectbox("Format", list(FORMATS), key="ticket_export_format")
+            if st.button("Prepare export", key="ticket_export"):
+                try:
+                    export_file = session_export_file(st.session_state, "ticket_export_file",
+                                                      ExportService.file_name("it_tickets", export_format))
+                    ExportService(db.db_path).export("it_tickets", export_file, export_format)
+                    st.session_state["ticket_export_file"] = export_file
+                except RuntimeError as e:
+                    st.error(str(e))
+            export_file = st.session_state.get("ticket_export_file")
+            if export_file and os.path.exists(export_file):
+                with open(export_file, "rb") as f:
+                    st.download_button("⬇️ Download {}".format(os.path.basename(export_file)), f,
+                                       file_name=os.path.basename(export_file), key="ticket_download")
+
         col1, col2, col3 = st.columns(3)
         with col1:
             priority_filter = st.selectbox("Filter by Priority", ["All", "Low", "Medium", "High", "Critical"])
         with col2:
             status_filter = st.selectbox("Filter by Status", ["All", "Open", "In Progress", "Resolved", "Closed"])
         with col3:
-            st.empty()
+            search_text = st.text_input("🔍 Search", placeholder="e.g. vpn printer")
 
         try:
-            rows = db.fetch_all("SELECT id, title, priority, status, assigned_to FROM it_tickets")
-
-            if not rows:
-                st.info("📋 No support tickets yet")
+            has_more = False
+            if search_text.strip():
+                # ✅ FTS5 index: ranked, prefix-matched, one page at a time
+                search_page = st.number_input("Results page", min_value=1, value=1, step=1)
+                tickets, has_more = SearchService(db).search_tickets(
+                    search_text,
+                    page=int(search_page),
+                    priority=None if priority_filter == "All" else priority_filter,
+                    status=None if status_filter == "All" else status_filter
+                )
             else:
-                tickets = []
-                for row in rows:
-                    tickets.append(
-                        ITTicket(
-                            ticket_id=row[0],
-                            title=row[1],
-                            priority=row[2],
-                            status=row[3],
-                            assigned_to=row[4]
-                        )
-                    )
-
-                filtered = tickets
+                # ✅ Filters run in SQL on the indexed lookup-id columns
+                sql = "SELECT id, title, priority_id, status_id, assigned_to FROM it_tickets WHERE 1 = 1"
+                params = []
                 if priority_filter != "All":
-                    filtered = [t for t in filtered if (t.get_priority() or "") == priority_filter]
+                    sql += " AND priority_id = ?"
+                    params.append(lookups.id_for("priorities", priority_filter))
                 if status_filter != "All":
-                    filtered = [t for t in filtered if (t.get_status() or "") == status_filter]
+                    sql += " AND status_id = ?"
+                    params.append(lookups.id_for("statuses", status_filter))
 
-                if not filtered:
+                rows = db.fetch_all(sql, params)
+                tickets = []
+                with profiler.phase("transform"):
+                    for row in rows:
+                        tickets.append(
+                            ITTicket(
+                                ticket_id=row[0],
+                                title=row[1],
+                                priority=lookups.label("priorities", row[2]),
+                                status=lookups.label("statuses", row[3]),
+                                assigned_to=row[4]
+                            )
+                        )
+
+            if not tickets:
+                if search_text.strip() or priority_filter != "All" or status_filter != "All":
                     st.info("No tickets match the selected filters")
                 else:
-                    for ticket in filtered:
-                        with st.container():  # ✅ no border=True
-                            c1, c2, c3, c4 = st.columns(4)
-
-                            with c1:
-                                st.metric("Ticket ID", ticket.get_id())
-                            with c2:
-                                priority_color = {
-                                    "Low": "🟢",
-                                    "Medium": "🟡",
-                                    "High": "🟠",
-                                    "Critical": "🔴"
-                                }
-                                color = priority_color.get(ticket.get_priority(), "⚪")
-                                st.metric("Priority", "{} {}".format(color, ticket.get_priority() or "Unknown"))
-                            with c3:
-                                st.metric("Status", ticket.get_status() or "Unknown")
-                            with c4:
-                                st.metric("Assigned To", ticket.get_assigned_to() or "Unassigned")
-
-                            st.write("**Title:** {}".format(ticket.get_title() or ""))
-
-                            a1, a2, a3 = st.columns(3)
-
-                            with a1:
-                                with st.expander("👤 Assign"):
-                                    staff_member = st.text_input(
-                                        "Assign to staff member:",
-                                        key="staff_{}".format(ticket.get_id())
-                                    )
-                                    if st.button("Save Assignment", key="save_assign_{}".format(ticket.get_id())):
-                                        if not staff_member:
-                                            st.error("❌ Please enter a staff member name")
-                                        else:
-                                            db.execute_query(
-                                                "UPDATE it_tickets SET assigned_to = ? WHERE id = ?",
-                                                (staff_member, ticket.get_id())
-                                            )
-                                            st.success("✅ Ticket assigned to {}".format(staff_member))
-                                            st.experimental_rerun()
-
-                            with a2:
-                                if st.button("✅ Mark Resolved", key="resolve_{}".format(ticket.get_id())):
+                    st.info("📋 No support tickets yet")
+            else:
+                for ticket in tickets:
+                    with st.container():  # ✅ no border=True
+                        c1, c2, c3, c4 = st.columns(4)
+
+                        with c1:
+                            st.metric("Ticket ID", ticket.get_id())
+                        with c2:
+                            priority_color = {
+                                "Low": "🟢",
+                                "Medium": "🟡",
+                                "High": "🟠",
+                                "Critical": "🔴"
+                            }
+                            color = priority_color.get(ticket.get_priority(), "⚪")
+                            st.metric("Priority", "{} {}".format(color, ticket.get_priority() or "Unknown"))
+                        with c3:
+                            st.metric("Status", ticket.get_status() or "Unknown")
+                        with c4:
+                            st.metric("Assigned To", ticket.get_assigned_to() or "Unassigned")
+
+                        st.write("**Title:** {}".format(ticket.get_title() or ""))
+
+                        a1, a2, a3 = st.columns(3)
+
+                        with a1:
+                            with st.expander("👤 Assign"):
+                                staff_member = st.text_input(
+                                    "Assign to staff member:",
+                                    key="staff_{}".format(ticket.get_id())
+                                )
+                                if st.button("Save Assignment", key="save_assign_{}".format(ticket.get_id())):
+                                    if not staff_member:
+                                        st.error("❌ Please enter a staff member name")
+                                    else:
+                                        db.execute_query(
+                                            "UPDATE it_tickets SET assigned_to = ? WHERE id = ?",
+                                            (staff_member, ticket.get_id())
+                                        )
+                                        st.success("✅ Ticket assigned to {}".format(staff_member))
+                                        st.experimental_rerun()
+
+                        with a2:
+                            if st.button("✅ Mark Resolved", key="resolve_{}".format(ticket.get_id())):
+                                db.execute_query(
+                                    "UPDATE it_tickets SET status_id = ? WHERE id = ?",
+                                    (lookups.id_for("statuses", "Resolved"), ticket.get_id())
+                                )
+                                st.success("✅ Ticket marked as Resolved")
+                                st.experimental_rerun()
+
+                        with a3:
+                            if (ticket.get_status() or "") != "Closed":
+                                if st.button("🔒 Close Ticket", key="close_{}".format(ticket.get_id())):
                                     db.execute_query(
-                                        "UPDATE it_tickets SET status = ? WHERE id = ?",
-                                        ("Resolved", ticket.get_id())
+                                        "UPDATE it_tickets SET status_id = ? WHERE id = ?",
+                                        (lookups.id_for("statuses", "Closed"), ticket.get_id())
                                     )
-                                    st.success("✅ Ticket marked as Resolved")
+                                    st.success("✅ Ticket closed")
                                     st.experimental_rerun()
 
-                            with a3:
-                                if (ticket.get_status() or "") != "Closed":
-                                    if st.button("🔒 Close Ticket", key="close_{}".format(ticket.get_id())):
-                                        db.execute_query(
-                                            "UPDATE it_tickets SET status = ? WHERE id = ?",
-                                            ("Closed", ticket.get_id())
-                                        )
-                                        st.success("✅ Ticket closed")
-                                        st.experimental_rerun()
+                    st.markdown("---")
 
-                        st.markdown("---")
+                if has_more:
+                    st.caption("More results on the next page")
 
         except Exception as e:
             st.error("Error fetching tickets: {}".format(e))
@@ -155,8 +205,13 @@ try:
             else:
                 try:
                     db.execute_query(
-                        "INSERT INTO it_tickets (title, priority, status, assigned_to) VALUES (?, ?, ?, ?)",
-                        (title, priority, "Open", assigned_to if assigned_to else None)
+                        "INSERT INTO it_tickets (title, priority_id, status_id, assigned_to) VALUES (?, ?, ?, ?)",
+                        (
+                            title,
+                            lookups.id_for("priorities", priority),
+                            lookups.id_for("statuses", "Open"),
+                            assigned_to if assigned_to else None
+                        )
                     )
                     st.success("✅ Ticket created successfully!")
                     st.experimental_rerun()
@@ -170,19 +225,18 @@ try:
         st.subheader("Ticket Statistics")
 
         try:
-            priority_stats = {}
-            for p in ["Low", "Medium", "High", "Critical"]:
-                priority_stats[p] = db.fetch_one(
-                    "SELECT COUNT(*) FROM it_tickets WHERE priority = ?",
-                    (p,)
-                )[0]
-
-            status_stats = {}
-            for s in ["Open", "In Progress", "Resolved", "Closed"]:
-                status_stats[s] = db.fetch_one(
-                    "SELECT COUNT(*) FROM it_tickets WHERE status = ?",
-                    (s,)
-                )[0]
+            # ✅ One GROUP BY per chart instead of a COUNT(*) per label
+            priority_stats = {label: 0 for label in lookups.labels("priorities")}
+            for priority_id, count in db.fetch_all(
+                "SELECT priority_id, COUNT(*) FROM it_tickets GROUP BY priority_id"
+            ):
+                priority_stats[lookups.label("priorities", priority_id)] = count
+
+            status_stats = {label: 0 for label in lookups.labels("statuses")}
+            for status_id, count in db.fetch_all(
+                "SELECT status_id, COUNT(*) FROM it_tickets GROUP BY status_id"
+            ):
+                status_stats[lookups.label("statuses", status_id)] = count
 
             col1, col2 = st.columns(2)
             with col1:
@@ -195,6 +249,30 @@ try:
                 st.bar_chart(status_stats)
                 st.caption("Tickets by Status")
 
+            st.markdown("---")
+            st.subheader("📈 Trends")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                bucket = st.selectbox("Group by", list(BUCKETS), index=1, key="ticket_trend_bucket")
+            with col2:
+                period = st.selectbox("Period", list(PERIODS), key="ticket_trend_period")
+            start = period_start(period)
+
+            # ✅ Reads the trigger-maintained rollups, not the tickets table
+            buckets, series = trends.series("tickets", bucket, start)
+            if not buckets:
+                st.info("No tickets in this period")
+            else:
+                with profiler.phase("transform"):
+                    trend_frame = pd.DataFrame(series, index=buckets)
+                st.line_chart(trend_frame)
+                st.caption("New tickets per {} by priority".format(bucket))
+
+            mttr = trends.mean_time_to_resolve("tickets", start)
+            for col, (label, hours) in zip(st.columns(len(mttr)), mttr.items()):
+                col.metric("MTTR ({})".format(label), "-" if hours is None else "{:.1f} h".format(hours))
+
             st.markdown("---")
             st.metric("System Status", "✅ All Systems Operational")
 
@@ -202,4 +280,5 @@ try:
             st.error("Error loading statistics: {}".format(e))
 
 finally:
-    db.close()
+    profiler.finish()
+    show_profile_panel(profiler, st.session_state.get("current_role") == "admin")
@@ -60,3 +60,72 @@ class AIAssistant:
 
     def get_context_window(self, max_messages: int = 10) -> List[Dict[str, str]]:
         return self._history[-max_messages:]
+
+
+# =========================
+# ASK ACROSS ALL DOMAINS
+# =========================
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.session_manager import session_user
+from services.async_ai_assistant import AsyncAIAssistant, DEFAULT_DOMAINS, run_sync
+from services.db_registry import get_db
+from services.retrieval_index import RetrievalIndex
+from services.profiler import Profiler, show_profile_panel
+
+
+@st.cache_resource
+def get_async_assistant() -> AsyncAIAssistant:
+    # One assistant (pooled HTTP client + semaphore) per server process;
+    # conversations live in each session's st.session_state.ai_histories
+    api_key = st.secrets.get("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
+    return AsyncAIAssistant(api_key=api_key)
+
+
+st.title("🤖 AI Assistant")
+st.markdown("---")
+
+# ✅ Signed session token -> user and current role (cached; re-checked every few seconds)
+if session_user(st.session_state) is None:
+    st.warning("⚠️ Please login first")
+    st.stop()
+
+# ✅ Opt-in (admin sidebar): retrieval db time and the model round trip per rerun
+profiler = Profiler("AI Assistant", enabled=st.session_state.get("profiling", False))
+
+st.subheader("Ask across all domains")
+question = st.text_area("Question", placeholder="Ask the same question to every domain...")
+domains = st.multiselect("Domains", list(DEFAULT_DOMAINS), default=list(DEFAULT_DOMAINS))
+use_platform_data = st.checkbox("Ground answers in platform data", value=True)
+
+# ✅ Per-session histories by domain (trimmed to a window by the assistant)
+histories = st.session_state.setdefault("ai_histories", {})
+
+if st.button("🚀 Ask", use_container_width=True):
+    if not question or not domains:
+        st.error("❌ Please enter a question and pick at least one domain")
+    else:
+        context = None
+        if use_platform_data:
+            try:
+                context = RetrievalIndex(get_db()).build_context(question)
+            except Exception as e:
+                st.warning("Search index unavailable: {}".format(e))
+
+        with st.spinner("Waiting for replies..."):
+            with profiler.phase("ai"):
+                answers = run_sync(get_async_assistant().ask_all_domains(question, domains, context,
+                                                                         histories))
+        for domain, answer in answers.items():
+            with st.expander(domain, expanded=True):
+                st.write(answer)
+
+if histories and st.button("🗑️ Clear conversation"):
+    histories.clear()
+    st.rerun()
+
+profiler.finish()
+show_profile_panel(profiler, st.session_state.get("current_role") == "admin")
@@ -0,0 +1,89 @@
+import streamlit as st
+import sys
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.session_manager import session_user
+from services.metrics import REGISTRY, start_metrics_server
+from services.query_stats import HISTOGRAM_BUCKETS_MS, QUERY_STATS
+from services.rate_limiter import LOGIN_LIMITER
+
+st.set_page_config(
+    page_title="Admin - Multi-Domain Platform",
+    page_icon="🛠",
+    layout="wide"
+)
+
+st.title("🛠 Admin")
+st.markdown("---")
+
+# Check if logged in
+# ✅ Signed session token -> user and current role (cached; re-checked every few seconds)
+if session_user(st.session_state) is None:
+    st.warning("⚠️ Please login first")
+    st.stop()
+
+if st.session_state.get("current_role") != "admin":
+    st.error("⛔ Admin access required")
+    st.stop()
+
+st.success("Logged in as: {}".format(st.session_state.current_user))
+
+server = start_metrics_server()
+with st.expander("📈 Metrics"):
+    if server is not None:
+        st.caption("Scrape endpoint: http://{}:{}/metrics".format(*server.server_address[:2]))
+    else:
+        st.caption("Set PLATFORM_METRICS_PORT to expose these on a local /metrics endpoint.")
+    st.code(REGISTRY.render(), language="text")
+
+if st.button("🔓 Clear login lockouts"):
+    # ✅ Forgets failed attempts of every username and client
+    LOGIN_LIMITER.reset()
+    st.success("Login lockouts cleared")
+
+st.subheader("🐢 Query Performance")
+st.caption("Timings of every DatabaseManager query since the app process started (all users).")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    top_n = st.number_input("Top N", min_value=1, max_value=200, value=20, step=5)
+with col2:
+    order_by = st.selectbox("Order by", ["total_ms", "max_ms", "calls", "rows"])
+with col3:
+    # ✅ Threshold applies immediately to every manager in this process
+    QUERY_STATS.slow_ms = st.number_input("Slow query threshold (ms)", min_value=1.0,
+                                          value=float(QUERY_STATS.slow_ms), step=10.0)
+
+if st.button("🧹 Reset statistics"):
+    QUERY_STATS.reset()
+    st.rerun()
+
+top = QUERY_STATS.top(int(top_n), order_by)
+if not top:
+    st.info("No queries recorded yet - open the other pages first")
+    st.stop()
+
+st.dataframe(
+    pd.DataFrame(top)[["fingerprint", "calls", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms", "rows"]],
+    use_container_width=True
+)
+
+# Latency histogram of one fingerprint
+labels = ["≤{} ms".format(b) for b in HISTOGRAM_BUCKETS_MS] + [">{} ms".format(HISTOGRAM_BUCKETS_MS[-1])]
+chosen = st.selectbox("Histogram for", range(len(top)), format_func=lambda i: top[i]["fingerprint"][:120])
+st.bar_chart(pd.DataFrame({"calls": top[chosen]["histogram"]}, index=labels))
+
+st.subheader("Slow Query Log")
+slow = QUERY_STATS.slow_queries()
+if slow:
+    st.dataframe(pd.DataFrame(slow), use_container_width=True)
+else:
+    st.info("No queries slower than {:.0f} ms".format(QUERY_STATS.slow_ms))
+
+traced = QUERY_STATS.traced()
+if traced:
+    with st.expander("🔎 Traced statements (counted once more per trigger fired)"):
+        st.dataframe(pd.DataFrame(traced), use_container_width=True)
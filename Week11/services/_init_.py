@@ -1,5 +1,23 @@
 from services.database_manager import DatabaseManager
 from services.auth_manager import AuthManager
 from services.ai_assistant import AIAssistant
+from services.retrieval_index import RetrievalIndex
+from services.search_service import SearchService
+from services.lookups import LookupCache
+from services.snapshot_manager import SnapshotManager, SnapshotReader
+from services.trend_service import TrendService
+from services.change_feed import ChangeFeedConsumer, compact_change_log
+from services.export_service import ExportService
+from services.query_stats import QueryStats, QUERY_STATS
+from services.profiler import Profiler
+from services.metrics import MetricsRegistry, REGISTRY, start_metrics_server
+from services.rate_limiter import LoginRateLimiter, LOGIN_LIMITER
+from services.session_manager import SessionManager, session_user
+from services.db_registry import DatabaseRegistry, get_db, get_registry
 
-__all__ = ["DatabaseManager", "AuthManager", "AIAssistant"]
\ No newline at end of file
+__all__ = ["DatabaseManager", "AuthManager", "AIAssistant", "RetrievalIndex",
+           "SearchService", "LookupCache", "SnapshotManager", "SnapshotReader", "TrendService",
+           "ChangeFeedConsumer", "compact_change_log", "ExportService", "QueryStats", "QUERY_STATS",
+           "Profiler", "MetricsRegistry", "REGISTRY", "start_metrics_server",
+           "LoginRateLimiter", "LOGIN_LIMITER", "SessionManager", "session_user",
+           "DatabaseRegistry", "get_db", "get_registry"]
\ No newline at end of file
@@ -1,19 +1,36 @@
+import time
 from typing import List, Dict, Optional
 
+from services.metrics import REGISTRY
+
+# Shared with AsyncAIAssistant; "backend" is fake (no client) or openai
+AI_REQUEST_SECONDS = REGISTRY.histogram(
+    "platform_ai_request_seconds", "Time to produce one assistant reply", ["backend"]
+)
+AI_ERRORS = REGISTRY.counter(
+    "platform_ai_errors_total", "Failed or retried assistant requests", ["reason"]
+)
+
 class AIAssistant:
     """Wrapper around an AI/chat model for multi-domain queries.
     
     In your real project, connect this to OpenAI, HuggingFace, or another provider.
     """
     
-    def __init__(self, system_prompt: str = "You are a helpful assistant."):
+    def __init__(self, system_prompt: str = "You are a helpful assistant.",
+                 retriever=None, top_k: int = 5):
         """Initialize the AI assistant.
         
         Args:
             system_prompt: System prompt for the AI model
+            retriever: Optional RetrievalIndex used to ground answers in
+                       platform data
+            top_k: Number of relevant rows to inject per message
         """
         self._system_prompt = system_prompt
         self._history: List[Dict[str, str]] = []
+        self._retriever = retriever
+        self._top_k = top_k
     
     def set_system_prompt(self, prompt: str) -> None:
         """Update the system prompt.
@@ -35,17 +52,26 @@ class AIAssistant:
         Returns:
             AI response string
         """
+        start = time.perf_counter()
         # Add user message to history
         self._history.append({
             "role": "user",
             "content": user_message
         })
         
+        # Relevant rows go in for this turn only (not into history)
+        messages = [{"role": "system", "content": self._system_prompt}]
+        if self._retriever is not None:
+            context = self._retriever.build_context(user_message, self._top_k)
+            if context:
+                messages.append({"role": "system", "content": context})
+        messages += self._history
+        
         # TODO: Replace with real API call
         # Example for OpenAI:
         # response = openai.ChatCompletion.create(
         #     model="gpt-3.5-turbo",
-        #     messages=[{"role": "system", "content": self._system_prompt}] + self._history,
+        #     messages=messages,
         # )
         # response_text = response.choices[0].message["content"]
         
@@ -54,6 +80,7 @@ class AIAssistant:
             response = f"[AI ({domain}) reply to]: {user_message[:50]}..."
         else:
             response = f"[AI reply to]: {user_message[:50]}..."
+        AI_REQUEST_SECONDS.labels("fake").observe(time.perf_counter() - start)
         
         # Add assistant response to history
         self._history.append({
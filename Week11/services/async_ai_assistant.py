@@ -0,0 +1,223 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, List, MutableMapping, Optional, Sequence
+
+import httpx
+from openai import APITimeoutError, AsyncOpenAI, RateLimitError
+
+from services.ai_assistant import AI_ERRORS, AI_REQUEST_SECONDS
+
+DEFAULT_DOMAINS = ("cybersecurity", "data_science", "it_operations")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return a process-wide event loop running in a daemon thread.
+
+    Streamlit scripts are synchronous, and the shared HTTP client and
+    semaphore must stay on one loop, so every call is submitted here
+    instead of spinning up a new loop with asyncio.run().
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+        return _loop
+
+
+def run_sync(coro, timeout: Optional[float] = None):
+    """Run a coroutine on the background loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Optional overall timeout in seconds
+
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    return future.result(timeout)
+
+
+class AsyncAIAssistant:
+    """Asyncio-based AI assistant for concurrent multi-domain queries.
+
+    All requests share one HTTP client, so fanning a question out to several
+    domains reuses pooled connections. A semaphore bounds how many calls are
+    in flight at once, each call has its own timeout, and rate-limit errors
+    are retried with exponential backoff.
+
+    The assistant is shared by the whole process, so it keeps no
+    conversation state: callers own their histories (for Streamlit, a
+    dict in st.session_state) and pass them in. Only the newest
+    max_history messages are kept and re-sent, which bounds the prompt.
+    """
+
+    def __init__(self, system_prompt: str = "You are a helpful assistant.",
+                 api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 max_concurrency: int = 4, request_timeout: float = 30.0,
+                 max_retries: int = 3, backoff_base: float = 0.5,
+                 max_history: int = 10):
+        """Initialize the async AI assistant.
+
+        Args:
+            system_prompt: System prompt for the AI model
+            api_key: OpenAI API key (defaults to the OPENAI_API_KEY env var)
+            model: Chat model name
+            max_concurrency: Maximum number of requests in flight at once
+            request_timeout: Timeout in seconds for a single request
+            max_retries: Retries on rate-limit or timeout errors
+            backoff_base: Initial backoff delay in seconds (doubled per retry)
+            max_history: Messages of a history kept and re-sent (user and
+                         assistant turns both count)
+        """
+        self._system_prompt = system_prompt
+        self._model = model
+        self._request_timeout = request_timeout
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._max_concurrency = max_concurrency
+        self._max_history = max_history
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncOpenAI] = None
+        if self._api_key:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_concurrency,
+                                    max_keepalive_connections=max_concurrency),
+                timeout=request_timeout,
+            )
+            self._client = AsyncOpenAI(
+                api_key=self._api_key,
+                http_client=self._http_client,
+                max_retries=0,  # retries are handled here, with backoff
+            )
+
+    def set_system_prompt(self, prompt: str) -> None:
+        """Update the system prompt.
+
+        Args:
+            prompt: New system prompt
+        """
+        self._system_prompt = prompt
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    async def _complete(self, messages: List[Dict[str, str]]) -> str:
+        """Run one chat completion with timeout and rate-limit backoff."""
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                async with self._get_semaphore():
+                    response = await asyncio.wait_for(
+                        self._client.chat.completions.create(
+                            model=self._model,
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=1000,
+                        ),
+                        timeout=self._request_timeout,
+                    )
+                AI_REQUEST_SECONDS.labels("openai").observe(time.perf_counter() - start)
+                return response.choices[0].message.content
+            except (RateLimitError, APITimeoutError, asyncio.TimeoutError) as e:
+                AI_ERRORS.labels("rate_limit" if isinstance(e, RateLimitError) else "timeout").inc()
+                if attempt >= self._max_retries:
+                    raise
+                # Sleep outside the semaphore so other requests can proceed
+                delay = self._backoff_base * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+                attempt += 1
+
+    async def send_message(self, user_message: str, domain: Optional[str] = None,
+                           context: Optional[str] = None,
+                           history: Optional[List[Dict[str, str]]] = None) -> str:
+        """Send a message and get a response.
+
+        Args:
+            user_message: Message from the user
+            domain: Optional domain context (cybersecurity, data_science, etc.)
+            context: Optional retrieved platform records for this turn only
+                     (see RetrievalIndex.build_context)
+            history: Caller's conversation for this domain; the new turn is
+                     appended and the list trimmed to max_history. None
+                     sends the message without any history.
+
+        Returns:
+            AI response string
+        """
+        if history is None:
+            history = []
+
+        if self._client is None:
+            if domain:
+                return f"[AI ({domain}) reply to]: {user_message[:50]}..."
+            return f"[AI reply to]: {user_message[:50]}..."
+
+        content = f"[{domain}] {user_message}" if domain else user_message
+        messages = [{"role": "system", "content": self._system_prompt}]
+        if context:
+            messages.append({"role": "system", "content": context})
+        messages += history[-self._max_history:] + [{"role": "user", "content": content}]
+
+        try:
+            response_text = await self._complete(messages)
+        except Exception as e:
+            AI_ERRORS.labels("failed").inc()
+            return f"Error calling OpenAI API: {str(e)}"
+
+        history.append({"role": "user", "content": content})
+        history.append({"role": "assistant", "content": response_text})
+        del history[:-self._max_history]
+        return response_text
+
+    async def ask_all_domains(self, user_message: str,
+                              domains: Sequence[str] = DEFAULT_DOMAINS,
+                              context: Optional[str] = None,
+                              histories: Optional[MutableMapping[str, List[Dict[str, str]]]] = None
+                              ) -> Dict[str, str]:
+        """Ask the same question in several domains concurrently.
+
+        The calls run in parallel (up to max_concurrency), so the whole
+        fan-out takes about as long as the slowest single call.
+
+        Args:
+            user_message: Message from the user
+            domains: Domains to query
+            context: Optional retrieved platform records shared by all calls.
+                     Build it on the caller's thread, since SQLite connections
+                     can't be used from the background loop.
+            histories: Caller's histories by domain (missing domains are
+                       added). Each domain has its own list, so the
+                       concurrent calls don't interleave conversations.
+
+        Returns:
+            Dictionary mapping each domain to its response
+        """
+        if histories is None:
+            histories = {}
+        responses = await asyncio.gather(
+            *(self.send_message(user_message, domain, context, histories.setdefault(domain, []))
+              for domain in domains)
+        )
+        return dict(zip(domains, responses))
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._client = None
@@ -2,6 +2,15 @@ import hashlib
 from typing import Optional
 from models.user import User
 from services.database_manager import DatabaseManager
+from services.metrics import REGISTRY
+from services.rate_limiter import LOGIN_LIMITER, LoginRateLimiter
+from services.session_manager import SessionManager
+
+LOGINS = REGISTRY.counter("platform_logins_total", "Login attempts by outcome", ["result"])
+PASSWORD_CHECK_SECONDS = REGISTRY.histogram(
+    "platform_password_check_seconds", "Time spent verifying a password hash",
+    buckets=(0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
 
 class SimpleHasher:
     """Simple password hasher using SHA256 (for demo/learning only).
@@ -38,14 +47,16 @@ class SimpleHasher:
 class AuthManager:
     """Handles user registration and login authentication."""
     
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, limiter: LoginRateLimiter = LOGIN_LIMITER):
         """Initialize auth manager with a database connection.
         
         Args:
             db: DatabaseManager instance
+            limiter: Failed-login counters (process-wide by default)
         """
         self._db = db
         self._hasher = SimpleHasher()
+        self._limiter = limiter
     
     def register_user(self, username: str, password: str, role: str = "user") -> bool:
         """Register a new user.
@@ -78,31 +89,52 @@ class AuthManager:
             print(f"Registration error: {e}")
             return False
     
-    def login_user(self, username: str, password: str) -> Optional[User]:
+    def retry_after(self, username: str, client: Optional[str] = None) -> float:
+        """Seconds until a locked-out username/client may try again (0 = allowed)."""
+        return self._limiter.retry_after(username, client)
+    
+    def login_user(self, username: str, password: str, client: Optional[str] = None) -> Optional[User]:
         """Authenticate a user and return User object if successful.
         
+        Locked-out usernames and clients are rejected before the password
+        hash is read or checked; see retry_after() for how long.
+        
         Args:
             username: Username to login
             password: Plain-text password
+            client: Client identifier (IP address or session id) for rate
+                    limiting; None counts failures against the username only
         
         Returns:
             User object if login successful, None otherwise
         """
+        if self._limiter.retry_after(username, client) > 0:
+            LOGINS.labels("throttled").inc()
+            return None
         try:
             row = self._db.fetch_one(
                 "SELECT username, password_hash, role FROM users WHERE username = ?",
                 (username,),
             )
             if row is None:
+                LOGINS.labels("unknown_user").inc()
+                self._limiter.record_failure(username, client)
                 return None
             
             username_db, password_hash_db, role_db = row
             
-            if self._hasher.check_password(password, password_hash_db):
+            with PASSWORD_CHECK_SECONDS.time():
+                valid = self._hasher.check_password(password, password_hash_db)
+            if valid:
+                LOGINS.labels("success").inc()
+                self._limiter.record_success(username, client)
                 return User(username_db, password_hash_db, role_db)
             
+            LOGINS.labels("bad_password").inc()
+            self._limiter.record_failure(username, client)
             return None
         except Exception as e:
+            LOGINS.labels("error").inc()
             print(f"Login error: {e}")
             return None
     
@@ -118,7 +150,8 @@ class AuthManager:
             True if password changed, False otherwise
         """
         try:
-            # Verify old password
+            # Verify old password (no client: a logged-in user's typo must not
+            # use up the budget shared by everyone behind the same address)
             user = self.login_user(username, old_password)
             if user is None:
                 return False
@@ -129,6 +162,8 @@ class AuthManager:
                 "UPDATE users SET password_hash = ? WHERE username = ?",
                 (new_hash, username),
             )
+            # Sessions opened with the old password end with it
+            SessionManager(self._db).revoke_user(username)
             return True
         except Exception as e:
             print(f"Password change error: {e}")
@@ -0,0 +1,123 @@
+import json
+from typing import Dict, Iterator, List, Optional
+
+from services.database_manager import DatabaseManager
+
+
+class ChangeFeedConsumer:
+    """Tails the change_log journal in batches from a saved offset.
+
+    Each consumer (e.g. "siem", "warehouse") has its own row in
+    change_log_offsets. Offsets are only advanced after a batch has been
+    handled, so delivery is at-least-once: after a crash the last batch
+    is delivered again.
+    """
+
+    def __init__(self, db: DatabaseManager, name: str, batch_size: int = 500):
+        """Initialize the consumer.
+
+        Args:
+            db: DatabaseManager instance
+            name: Consumer name, unique per downstream system
+            batch_size: Maximum number of changes per batch
+        """
+        self._db = db
+        self._name = name
+        self._batch_size = batch_size
+        self._db.execute_query(
+            "INSERT OR IGNORE INTO change_log_offsets (consumer) VALUES (?)", (name,)
+        )
+
+    @property
+    def offset(self) -> int:
+        """Sequence number of the last change handled by this consumer."""
+        row = self._db.fetch_one(
+            "SELECT last_seq FROM change_log_offsets WHERE consumer = ?", (self._name,)
+        )
+        return row[0] if row else 0
+
+    def poll(self, after: Optional[int] = None) -> List[Dict]:
+        """Fetch the next batch of changes without moving the offset.
+
+        Args:
+            after: Sequence number to read after (default: saved offset)
+
+        Returns:
+            List of dictionaries with 'seq', 'table', 'row_id', 'op'
+            ('I', 'U' or 'D'), 'row' and 'changed_at' keys, oldest first
+        """
+        rows = self._db.fetch_all("""
+            SELECT seq, table_name, row_id, op, payload, changed_at
+            FROM change_log
+            WHERE seq > ?
+            ORDER BY seq
+            LIMIT ?
+        """, (self.offset if after is None else after, self._batch_size))
+
+        return [
+            {
+                "seq": row[0],
+                "table": row[1],
+                "row_id": row[2],
+                "op": row[3],
+                "row": json.loads(row[4]),
+                "changed_at": row[5],
+            }
+            for row in rows
+        ]
+
+    def commit(self, seq: int) -> None:
+        """Save the offset after a batch has been handled.
+
+        Args:
+            seq: Sequence number of the last handled change
+        """
+        self._db.execute_query("""
+            UPDATE change_log_offsets
+            SET last_seq = MAX(last_seq, ?), updated_at = CURRENT_TIMESTAMP
+            WHERE consumer = ?
+        """, (seq, self._name))
+
+    def batches(self) -> Iterator[List[Dict]]:
+        """Yield batches until the consumer has caught up.
+
+        The offset is committed when the caller asks for the next batch, so
+        a batch that raised in the caller is delivered again next time.
+        """
+        while True:
+            batch = self.poll()
+            if not batch:
+                return
+            yield batch
+            self.commit(batch[-1]["seq"])
+
+
+def compact_change_log(db: DatabaseManager, collapse: bool = True) -> int:
+    """Shrink the change log.
+
+    Removes changes every registered consumer has already handled, and
+    (with collapse=True) pending changes superseded by a newer change to
+    the same row, since every entry carries the full row. With no
+    consumers registered only collapsing is done.
+
+    Args:
+        db: DatabaseManager instance
+        collapse: Also drop superseded pending changes
+
+    Returns:
+        Number of journal rows removed
+    """
+    removed = db.execute_query("""
+        DELETE FROM change_log
+        WHERE seq <= (SELECT MIN(last_seq) FROM change_log_offsets)
+    """).rowcount
+
+    if collapse:
+        removed += db.execute_query("""
+            DELETE FROM change_log
+            WHERE seq NOT IN (
+                SELECT MAX(seq) FROM change_log GROUP BY table_name, row_id
+            )
+        """).rowcount
+
+    return removed
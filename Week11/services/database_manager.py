@@ -1,24 +1,52 @@
 import sqlite3
-from typing import Any, Iterable, Optional, List, Tuple
+import time
+from typing import Any, Iterable, Optional, List, Tuple, Union
+
+from services.metrics import REGISTRY
+from services.profiler import active_profiler
+from services.query_stats import QUERY_STATS, QueryStats, fingerprint
+
+# Labelled by statement kind (SELECT, INSERT, ...) to keep the series count small
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "platform_db_query_seconds", "DatabaseManager call latency (execute + fetch)", ["operation"]
+)
+DB_ROWS = REGISTRY.counter(
+    "platform_db_rows_total", "Rows returned or changed by DatabaseManager calls", ["operation"]
+)
 
 class DatabaseManager:
     """Handles SQLite database connections and queries."""
     
-    def __init__(self, db_path: str):
+    # Tables with a trigger-maintained, indexed updated_at (see database.db)
+    CHANGE_TRACKED_TABLES = ("security_incidents", "it_tickets")
+    
+    def __init__(self, db_path: str, stats: QueryStats = QUERY_STATS, trace: bool = False,
+                 check_same_thread: bool = True):
         """Initialize database manager.
         
         Args:
             db_path: Path to the SQLite database file
+            stats: Where query timings are recorded (process-wide by default)
+            trace: Also count statements as SQLite runs them (trigger
+                programs included) through sqlite3's trace callback
+            check_same_thread: Let sqlite3 refuse use from other threads;
+                DatabaseRegistry turns this off because it hands a manager
+                from a finished rerun thread to the next one
         """
         self._db_path = db_path
         self._connection: Optional[sqlite3.Connection] = None
+        self.stats = stats
+        self._trace = trace
+        self._check_same_thread = check_same_thread
     
     def connect(self) -> None:
         """Establish database connection if not already connected."""
         if self._connection is None:
-            self._connection = sqlite3.connect(self._db_path)
+            self._connection = sqlite3.connect(self._db_path, check_same_thread=self._check_same_thread)
             # Enable row factory for dictionary-like access (optional)
             self._connection.row_factory = sqlite3.Row
+            if self._trace:
+                self._connection.set_trace_callback(self.stats.trace)
     
     def close(self) -> None:
         """Close database connection."""
@@ -26,6 +54,69 @@ class DatabaseManager:
             self._connection.close()
             self._connection = None
     
+    @property
+    def db_path(self) -> str:
+        """Path of the SQLite database file."""
+        return self._db_path
+    
+    def is_connected(self) -> bool:
+        """Whether a connection is currently open."""
+        return self._connection is not None
+    
+    def ping(self) -> bool:
+        """Health check: run SELECT 1 (not recorded in the query stats).
+        
+        Returns:
+            True if the open connection answers, False otherwise
+        """
+        if self._connection is None:
+            return False
+        try:
+            self._connection.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def rollback(self) -> bool:
+        """Roll back the connection's open transaction, if there is one.
+        
+        Returns:
+            True if a transaction was open (and is now rolled back)
+        """
+        if self._connection is None or not self._connection.in_transaction:
+            return False
+        self._connection.rollback()
+        return True
+    
+    def reconnect(self) -> None:
+        """Drop the current connection (even a broken one) and open a new one."""
+        try:
+            self.close()
+        except sqlite3.Error:
+            self._connection = None
+        self.connect()
+    
+    def _execute(self, sql: str, params: Iterable[Any]) -> sqlite3.Cursor:
+        """Run a statement on the (lazily opened) connection."""
+        if self._connection is None:
+            self.connect()
+        
+        cur = self._connection.cursor()
+        cur.execute(sql, tuple(params))
+        return cur
+    
+    def _record(self, sql: str, start: float, rows: int) -> None:
+        """Add a finished call to the query stats, the metrics and the rerun's profile."""
+        elapsed = time.perf_counter() - start
+        self.stats.record(sql, elapsed * 1000, rows)
+        # fingerprint() is cached and already strips leading comments
+        operation = fingerprint(sql).split(" ", 1)[0].upper() or "OTHER"
+        DB_QUERY_SECONDS.labels(operation).observe(elapsed)
+        DB_ROWS.labels(operation).inc(rows)
+        profiler = active_profiler()
+        if profiler is not None:
+            profiler.add("db", elapsed)
+    
     def execute_query(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
         """Execute a write query (INSERT, UPDATE, DELETE).
         
@@ -35,13 +126,20 @@ class DatabaseManager:
         
         Returns:
             Cursor object
-        """
-        if self._connection is None:
-            self.connect()
         
-        cur = self._connection.cursor()
-        cur.execute(sql, tuple(params))
-        self._connection.commit()
+        Raises:
+            sqlite3.Error: If the statement or the commit fails; the
+                transaction is rolled back first, so a failed write never
+                keeps SQLite's write lock
+        """
+        start = time.perf_counter()
+        try:
+            cur = self._execute(sql, params)
+            self._connection.commit()
+        except sqlite3.Error:
+            self.rollback()
+            raise
+        self._record(sql, start, max(cur.rowcount, 0))
         return cur
     
     def fetch_one(self, sql: str, params: Iterable[Any] = ()) -> Optional[Tuple]:
@@ -54,12 +152,10 @@ class DatabaseManager:
         Returns:
             Single row as tuple or None if no results
         """
-        if self._connection is None:
-            self.connect()
-        
-        cur = self._connection.cursor()
-        cur.execute(sql, tuple(params))
-        return cur.fetchone()
+        start = time.perf_counter()
+        row = self._execute(sql, params).fetchone()
+        self._record(sql, start, int(row is not None))
+        return row
     
     def fetch_all(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple]:
         """Fetch all rows from a SELECT query.
@@ -71,13 +167,53 @@ class DatabaseManager:
         Returns:
             List of rows as tuples
         """
-        if self._connection is None:
-            self.connect()
-        
-        cur = self._connection.cursor()
-        cur.execute(sql, tuple(params))
-        return cur.fetchall()
+        start = time.perf_counter()
+        rows = self._execute(sql, params).fetchall()
+        self._record(sql, start, len(rows))
+        return rows
     
-    def __del__(self):
-        """Ensure connection is closed when object is destroyed."""
-        self.close()
\ No newline at end of file
+    def changes_since(self, table: str,
+                      watermark: Union[str, Tuple[str, int], None] = None,
+                      limit: Optional[int] = None
+                      ) -> Tuple[List[Tuple], Union[str, Tuple[str, int], None]]:
+        """Fetch rows inserted or updated after a watermark.
+        
+        Uses the updated_at index (which ends in the rowid), so the cost
+        depends on the number of changed rows, not the table size. Pass the
+        returned watermark to the next call to get only newer changes.
+        
+        The watermark is an (updated_at, id) pair: rows sharing the last
+        returned timestamp are not skipped when a page ends between them.
+        
+        Args:
+            table: One of CHANGE_TRACKED_TABLES
+            watermark: (updated_at, id) from a previous call, an updated_at
+                       value to get rows changed strictly after it, or None
+                       for all rows
+            limit: Optional maximum number of rows to return
+        
+        Returns:
+            Tuple of (changed rows ordered by updated_at and id, new
+            watermark; the given one if nothing changed)
+        
+        Raises:
+            ValueError: If the table has no tracked updated_at
+        """
+        if table not in self.CHANGE_TRACKED_TABLES:
+            raise ValueError(f"Table {table!r} does not track changes")
+        
+        if isinstance(watermark, (tuple, list)):
+            where = "(updated_at, id) > (?, ?)"
+            params: List[Any] = [watermark[0], watermark[1]]
+        else:
+            where = "updated_at > ?"
+            params = [watermark or ""]
+        sql = f"SELECT * FROM {table} WHERE {where} ORDER BY updated_at, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        
+        rows = self.fetch_all(sql, params)
+        if rows:
+            watermark = (rows[-1]["updated_at"], rows[-1]["id"])
+        return rows, watermark
\ No newline at end of file
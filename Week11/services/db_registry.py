@@ -0,0 +1,175 @@
+import atexit
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List
+
+from database.db import initialize_database
+from services.database_manager import DatabaseManager
+from services.metrics import REGISTRY
+
+DEFAULT_DB_PATH = "database/platform.db"
+
+# A bound manager runs SELECT 1 on its connection at most this often
+HEALTH_CHECK_SECONDS = 30.0
+
+# Idle managers kept open for the next rerun threads; extra ones are closed
+MAX_IDLE = 8
+
+DB_CONNECTIONS = REGISTRY.gauge(
+    "platform_db_connections", "Registry DatabaseManagers by state", ["state"]
+)
+DB_RECONNECTS = REGISTRY.counter(
+    "platform_db_reconnects_total", "Registry connections reopened after a failed health check"
+)
+
+
+class DatabaseRegistry:
+    """Process-wide pool of thread-bound DatabaseManagers for one database.
+
+    Streamlit runs every rerun on a fresh script thread. get() binds an
+    open manager to the calling thread; once that thread has finished its
+    manager goes back to an idle list and the next rerun's thread picks it
+    up, so reruns reuse a connection instead of opening and closing one.
+    A manager is only ever used by one live thread at a time, which is why
+    its connection is opened with check_same_thread=False.
+
+    Pages must not close managers they got from here; close_all() runs at
+    interpreter exit. A manager left inside a transaction (a write that
+    failed half-way, an explicit BEGIN) is rolled back before it goes idle
+    and again before it is handed out, so it never holds the write lock
+    for the next rerun.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 health_check_seconds: float = HEALTH_CHECK_SECONDS, max_idle: int = MAX_IDLE):
+        """Initialize an empty registry.
+
+        Args:
+            db_path: Path to the SQLite database file
+            health_check_seconds: Minimum seconds between health checks of a manager
+            max_idle: Idle managers kept open
+        """
+        self._db_path = db_path
+        self._health_check_seconds = health_check_seconds
+        self._max_idle = max_idle
+        self._lock = threading.Lock()
+        self._bound: Dict[threading.Thread, DatabaseManager] = {}
+        self._idle: List[DatabaseManager] = []
+        self._checked_at: Dict[int, float] = {}
+        self._closed = False
+        DB_CONNECTIONS.set_function(self.counts)
+
+    def get(self) -> DatabaseManager:
+        """The calling thread's manager, connected and recently health-checked.
+
+        Returns:
+            DatabaseManager bound to the current thread
+
+        Raises:
+            RuntimeError: If the registry has been shut down
+            sqlite3.Error: If the database cannot be reopened
+        """
+        thread = threading.current_thread()
+        to_close: List[DatabaseManager] = []
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DatabaseRegistry for {} is closed".format(self._db_path))
+            db = self._bound.get(thread)
+            reused = False
+            if db is None:
+                to_close = self._release_finished()
+                if self._idle:
+                    db = self._idle.pop()
+                    reused = True
+                else:
+                    db = DatabaseManager(self._db_path, check_same_thread=False)
+                self._bound[thread] = db
+        if reused:
+            self._rollback(db)
+        for stale in to_close:
+            stale.close()
+        self._ensure_healthy(db)
+        return db
+
+    def _release_finished(self) -> List[DatabaseManager]:
+        """Move managers of finished threads to the idle list (caller holds the lock).
+
+        Returns:
+            Managers beyond max_idle, for the caller to close outside the lock
+        """
+        for thread in [t for t in self._bound if not t.is_alive()]:
+            db = self._bound.pop(thread)
+            self._rollback(db)
+            self._idle.append(db)
+        extra = self._idle[self._max_idle:]
+        del self._idle[self._max_idle:]
+        for db in extra:
+            self._checked_at.pop(id(db), None)
+        return extra
+
+    @staticmethod
+    def _rollback(db: DatabaseManager) -> None:
+        """End a transaction the previous user left open (a broken connection is left to the health check)."""
+        try:
+            db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _ensure_healthy(self, db: DatabaseManager) -> None:
+        """Connect, and reconnect when the periodic SELECT 1 fails."""
+        now = time.monotonic()
+        if not db.is_connected():
+            db.connect()
+        elif now - self._checked_at.get(id(db), 0.0) >= self._health_check_seconds:
+            if not db.ping():
+                DB_RECONNECTS.inc()
+                db.reconnect()
+        else:
+            return
+        self._checked_at[id(db)] = now
+
+    def counts(self) -> Dict[tuple, float]:
+        """Managers per state, for the platform_db_connections gauge."""
+        with self._lock:
+            return {("bound",): len(self._bound), ("idle",): len(self._idle)}
+
+    def close_all(self) -> None:
+        """Close every manager; later get() calls raise (clean shutdown)."""
+        with self._lock:
+            self._closed = True
+            managers = list(self._bound.values()) + self._idle
+            self._bound.clear()
+            self._idle.clear()
+            self._checked_at.clear()
+        for db in managers:
+            db.close()
+
+
+def _cached(factory):
+    """st.cache_resource under Streamlit, a plain per-process memo elsewhere."""
+    try:
+        import streamlit as st
+    except ImportError:
+        return lru_cache(maxsize=None)(factory)
+    return st.cache_resource(show_spinner=False)(factory)
+
+
+@_cached
+def get_registry(db_path: str = DEFAULT_DB_PATH) -> DatabaseRegistry:
+    """The process-wide registry of a database, closed at interpreter exit.
+
+    The first call also runs the idempotent initialize_database(), so an
+    existing database gets the current schema (lookup ids, search, trend
+    and sessions tables) before any page queries it.
+    """
+    initialize_database(db_path)
+    registry = DatabaseRegistry(db_path)
+    atexit.register(registry.close_all)
+    return registry
+
+
+def get_db(db_path: str = DEFAULT_DB_PATH) -> DatabaseManager:
+    """Shortcut for get_registry(db_path).get(): this thread's shared manager."""
+    return get_registry(db_path).get()
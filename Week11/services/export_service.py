@@ -0,0 +1,263 @@
+"""Stream platform tables to CSV, JSONL or Parquet files.
+
+Usage:
+    python services/export_service.py [NAME ...] [--format csv|jsonl|parquet] [--gzip] [--out DIR]
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, MutableMapping, Optional, Sequence, Tuple
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+# Exportable tables and reports; categorical ids are exported as labels
+EXPORTS = {
+    "security_incidents": """
+        SELECT t.id, t.incident_type, sv.label AS severity, st.label AS status,
+               t.description, t.created_at, t.updated_at
+        FROM security_incidents t
+        JOIN severity_levels sv ON sv.id = t.severity_id
+        JOIN statuses st ON st.id = t.status_id
+        ORDER BY t.id
+    """,
+    "it_tickets": """
+        SELECT t.id, t.title, pr.label AS priority, st.label AS status,
+               t.assigned_to, t.created_at, t.updated_at
+        FROM it_tickets t
+        JOIN priorities pr ON pr.id = t.priority_id
+        JOIN statuses st ON st.id = t.status_id
+        ORDER BY t.id
+    """,
+    "datasets": """
+        SELECT id, name, size_bytes, rows, source, created_at
+        FROM datasets
+        ORDER BY id
+    """,
+    "open_incidents": """
+        SELECT t.id, t.incident_type, sv.label AS severity, t.description, t.created_at
+        FROM security_incidents t
+        JOIN severity_levels sv ON sv.id = t.severity_id
+        JOIN statuses st ON st.id = t.status_id
+        WHERE st.label = 'Open'
+        ORDER BY t.id
+    """,
+}
+
+
+def _chunks(cursor: sqlite3.Cursor, chunk_size: int) -> Iterator[List[Tuple]]:
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _open_text(path: str, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _write_csv(path: str, columns: Sequence[str], chunks: Iterable[List[Tuple]], compress: bool) -> int:
+    count = 0
+    with _open_text(path, compress) as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def _write_jsonl(path: str, columns: Sequence[str], chunks: Iterable[List[Tuple]], compress: bool) -> int:
+    count = 0
+    with _open_text(path, compress) as f:
+        for rows in chunks:
+            f.write("".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows))
+            count += len(rows)
+    return count
+
+
+def _write_parquet(path: str, columns: Sequence[str], chunks: Iterable[List[Tuple]], compress: bool) -> int:
+    # pyarrow is optional: only Parquet exports need it
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    count = 0
+    writer = None
+    try:
+        for rows in chunks:
+            batch = pa.table({name: [row[i] for row in rows] for i, name in enumerate(columns)})
+            if writer is None:
+                # A column that is all NULL in the first chunk would get the null type
+                schema = pa.schema([
+                    pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type)
+                    for f in batch.schema
+                ])
+                writer = pq.ParquetWriter(path, schema, compression="zstd" if compress else "snappy")
+            writer.write_table(batch.cast(writer.schema))
+            count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+WRITERS: Dict[str, Callable[..., int]] = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": _write_parquet,
+}
+
+
+class ExportService:
+    """Streams tables and report queries to files.
+
+    Rows are pulled with fetchmany() and written chunk by chunk, so memory
+    use is one chunk regardless of table size. Each export uses its own
+    connection, which lets export_many() run several in parallel.
+    """
+
+    def __init__(self, db_path: str = "database/platform.db", chunk_size: int = 5000):
+        """Initialize the export service.
+
+        Args:
+            db_path: Path to the SQLite database file
+            chunk_size: Rows fetched and written per chunk
+        """
+        self._db_path = db_path
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def file_name(name: str, fmt: str, compress: bool = False) -> str:
+        """Return the file name used for an export."""
+        if compress and fmt != "parquet":
+            return "{}.{}.gz".format(name, fmt)
+        return "{}.{}".format(name, fmt)
+
+    def export(self, name: str, path: str, fmt: str = "csv", compress: bool = False,
+               sql: Optional[str] = None, params: Iterable[Any] = ()) -> int:
+        """Export one entry of EXPORTS (or any SELECT) to a file.
+
+        Args:
+            name: Key of EXPORTS (ignored if sql is given)
+            path: Output file path
+            fmt: "csv", "jsonl" or "parquet"
+            compress: gzip CSV/JSONL output; zstd instead of snappy for Parquet
+            sql: Optional custom SELECT to export instead
+            params: Parameters for sql
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ValueError: If the format is unknown
+            RuntimeError: If Parquet is requested without pyarrow installed
+        """
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format: {fmt!r}")
+
+        conn = sqlite3.connect(self._db_path)
+        try:
+            cur = conn.execute(sql or EXPORTS[name], tuple(params))
+            columns = [d[0] for d in cur.description]
+            # Written under a temporary name so a failed export leaves no partial file
+            tmp_path = path + ".part"
+            try:
+                count = WRITERS[fmt](tmp_path, columns, _chunks(cur, self._chunk_size), compress)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            os.replace(tmp_path, path)
+            return count
+        finally:
+            conn.close()
+
+    def export_many(self, names: Sequence[str], out_dir: str, fmt: str = "csv",
+                    compress: bool = False, workers: int = 4) -> Dict[str, Tuple[str, int]]:
+        """Export several entries in parallel, one thread and connection each.
+
+        Args:
+            names: Keys of EXPORTS
+            out_dir: Output folder (created if missing)
+            fmt: Output format
+            compress: Compress the output
+            workers: Maximum number of exports running at once
+
+        Returns:
+            Dictionary of name -> (file path, rows written)
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {name: os.path.join(out_dir, self.file_name(name, fmt, compress)) for name in names}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(self.export, name, paths[name], fmt, compress) for name in names}
+            return {name: (paths[name], future.result()) for name, future in futures.items()}
+
+
+def session_export_file(state: MutableMapping, key: str, file_name: str) -> str:
+    """Path for a page export inside the session's own temp directory.
+
+    The directory is created once per session and kept in
+    state["export_dir"]. The file previously stored under state[key] is
+    deleted, so each export button keeps at most one file on disk.
+
+    Args:
+        state: st.session_state (any mutable mapping)
+        key: Session state key the page keeps its export path under
+        file_name: File name from ExportService.file_name()
+
+    Returns:
+        Path to write the new export to (the caller stores it under key)
+    """
+    export_dir = state.get("export_dir")
+    if not export_dir or not os.path.isdir(export_dir):
+        export_dir = tempfile.mkdtemp(prefix="export_")
+        state["export_dir"] = export_dir
+
+    previous = state.pop(key, None)
+    if previous and os.path.exists(previous):
+        os.remove(previous)
+    return os.path.join(export_dir, file_name)
+
+
+def clear_session_exports(state: MutableMapping) -> None:
+    """Delete the session's export directory (on logout)."""
+    export_dir = state.pop("export_dir", None)
+    if export_dir:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export platform tables and reports.")
+    parser.add_argument("names", nargs="*", help="exports to run (default: all tables): " + ", ".join(EXPORTS))
+    parser.add_argument("--db", default="database/platform.db", help="database to export from")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--gzip", action="store_true", help="compress CSV/JSONL (Parquet uses zstd)")
+    parser.add_argument("--out", default="exports", help="output folder")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    names = args.names or ["security_incidents", "it_tickets", "datasets"]
+    unknown = [n for n in names if n not in EXPORTS]
+    if unknown:
+        parser.error("unknown export(s): " + ", ".join(unknown))
+
+    service = ExportService(args.db)
+    for name, (path, count) in service.export_many(names, args.out, args.format, args.gzip, args.workers).items():
+        print(f"{name}: {count} rows -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from services.database_manager import DatabaseManager
+from services.metrics import REGISTRY
+
+LOOKUP_CACHE = REGISTRY.counter("platform_lookup_cache_total", "Lookup table cache accesses", ["result"])
+
+# Process-wide cache: lookup table -> (id -> label, lowercased label -> id)
+_cache: Dict[str, Tuple[Dict[int, str], Dict[str, int]]] = {}
+_cache_lock = threading.Lock()
+
+
+class LookupCache:
+    """Cached id <-> label mapping for the categorical lookup tables.
+
+    severity_levels, statuses and priorities are tiny and effectively
+    static, so each one is read once per process and then decoded/encoded
+    in memory instead of joined or lower-cased in every query.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        """Initialize the lookup cache.
+
+        Args:
+            db: DatabaseManager used to load a table on first use
+        """
+        self._db = db
+
+    def _load(self, table: str) -> Tuple[Dict[int, str], Dict[str, int]]:
+        with _cache_lock:
+            if table in _cache:
+                LOOKUP_CACHE.labels("hit").inc()
+            else:
+                LOOKUP_CACHE.labels("miss").inc()
+                rows = self._db.fetch_all(f"SELECT id, label FROM {table} ORDER BY id")
+                by_id = {row[0]: row[1] for row in rows}
+                by_label = {row[1].lower(): row[0] for row in rows}
+                _cache[table] = (by_id, by_label)
+            return _cache[table]
+
+    def label(self, table: str, lookup_id: Optional[int]) -> Optional[str]:
+        """Decode an id into its label.
+
+        Args:
+            table: Lookup table name (e.g. "severity_levels")
+            lookup_id: Id stored in the coded column
+
+        Returns:
+            The label, or None for an unknown id
+        """
+        return self._load(table)[0].get(lookup_id)
+
+    def id_for(self, table: str, label: str) -> int:
+        """Encode a label into its id (case-insensitive).
+
+        Args:
+            table: Lookup table name
+            label: Label such as "High" or "in progress"
+
+        Returns:
+            The lookup id
+
+        Raises:
+            ValueError: If the label is not in the lookup table
+        """
+        try:
+            return self._load(table)[1][label.strip().lower()]
+        except KeyError:
+            raise ValueError(f"Unknown {table} label: {label!r}")
+
+    def labels(self, table: str) -> List[str]:
+        """Return all labels of a lookup table, in id order."""
+        return list(self._load(table)[0].values())
@@ -0,0 +1,292 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds (Prometheus client defaults)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = ['{}="{}"'.format(n, _escape(v)) for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for a named metric with optional labels; one child per label combination."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        # Unlabelled metrics have exactly one child, created up front
+        self._default = None if self.labelnames else self.labels()
+
+    def labels(self, *values: str):
+        """Child metric for one combination of label values (created on first use)."""
+        # hot path: string values of an existing child
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            raise ValueError("{} expects labels {}".format(self.name, self.labelnames))
+        key = tuple(str(v) for v in values)
+        with self._lock:
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        """(suffix, label text, value) for every exposed sample."""
+        for key, child in list(self._children.items()):
+            yield "", _format_labels(self.labelnames, key), child.value
+
+    def render(self) -> List[str]:
+        lines = ["# HELP {} {}".format(self.name, self.documentation),
+                 "# TYPE {} {}".format(self.name, self.kind)]
+        lines += ["{}{}{} {}".format(self.name, suffix, labels, _format_value(value))
+                  for suffix, labels, value in self._samples()]
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (requests, errors, rows)."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self._default.set(value)
+
+    def set_function(self, callback: Callable[[], Dict[Tuple[str, ...], float]]) -> None:
+        """Compute the samples at scrape time instead: callback returns {label values: value}."""
+        self._callback = callback
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        if self._callback is None:
+            yield from super()._samples()
+            return
+        for key, value in self._callback().items():
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = 0
+        for bound in self.bounds:
+            if value <= bound:
+                break
+            i += 1
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (usually latencies in seconds) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe one value on the unlabelled histogram."""
+        self._default.observe(value)
+
+    def time(self):
+        """Context manager observing the elapsed seconds of its block."""
+        return self._default.time()
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="{}"'.format(_format_value(bound))
+                yield "_bucket", _format_labels(self.labelnames, key, le), cumulative
+            yield "_sum", _format_labels(self.labelnames, key), total
+            yield "_count", _format_labels(self.labelnames, key), cumulative
+
+
+class MetricsRegistry:
+    """Named metrics of one process, rendered in the Prometheus text format.
+
+    counter()/gauge()/histogram() return the existing metric when the name
+    is already registered, so modules can declare what they feed at import
+    time without caring about import order.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError("Metric {} already registered as a {}".format(name, metric.kind))
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """All metrics in text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry fed by the services
+REGISTRY = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the Streamlit console
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from a daemon thread (once per process).
+
+    Args:
+        port: Port to listen on (default: PLATFORM_METRICS_PORT; unset = disabled)
+        host: Interface to bind; local only by default
+        registry: Registry to expose
+
+    Returns:
+        The running server, or None when disabled or the port is taken
+        (e.g. by another Streamlit process)
+    """
+    global _server
+    if port is None:
+        port = os.getenv("PLATFORM_METRICS_PORT")
+        if not port:
+            return None
+    with _server_lock:
+        if _server is None:
+            handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), handler)
+            except OSError as e:
+                print(f"Metrics endpoint not started: {e}")
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,185 @@
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Folded-stack samples (one file per page) for flamegraph.pl / speedscope / inferno
+PROFILE_DIR = "profiles"
+
+# Reruns kept per page for the sidebar panel
+HISTORY_SIZE = 20
+
+# Phases always reported per rerun; time outside any phase counts as render
+PHASES = ("db", "transform", "render")
+
+_active = threading.local()
+_history_lock = threading.Lock()
+_HISTORY: Dict[str, deque] = defaultdict(lambda: deque(maxlen=HISTORY_SIZE))
+
+
+def active_profiler() -> Optional["Profiler"]:
+    """The profiler of the rerun running on this thread, if profiling is on."""
+    return getattr(_active, "profiler", None)
+
+
+class Profiler:
+    """Phase timings for one Streamlit page rerun.
+
+    Streamlit runs each rerun on its own thread, so the running profiler is
+    kept thread-local: DatabaseManager adds its query time as "db" without
+    the pages passing the profiler around. Pages wrap model construction and
+    pandas work in phase("transform"); whatever is left (widgets, charts,
+    script overhead) is reported as "render".
+
+    A disabled profiler costs one attribute check per phase.
+    """
+
+    def __init__(self, page: str, enabled: bool = False, out_dir: str = PROFILE_DIR):
+        """Start profiling a rerun.
+
+        Args:
+            page: Page name, the root frame of every sample
+            enabled: Record anything at all (off unless an admin opts in)
+            out_dir: Folder for the folded-stack sample files
+        """
+        self.page = page
+        self.enabled = enabled or os.getenv("PLATFORM_PROFILE") == "1"
+        self._out_dir = out_dir
+        self._stack: List[str] = [page]
+        # inclusive seconds per stack path
+        self._inclusive: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._start = time.perf_counter()
+        self.result: Optional[Dict] = None
+        if self.enabled:
+            _active.profiler = self
+
+    def phase(self, name: str):
+        """Context manager timing a block as a (possibly nested) phase.
+
+        Args:
+            name: Phase name, usually one of PHASES
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str):
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._inclusive[tuple(self._stack)] += time.perf_counter() - start
+            self._stack.pop()
+
+    def profiled(self, name: str) -> Callable:
+        """Decorator running every call of a function inside phase(name)."""
+        def decorate(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def add(self, name: str, seconds: float) -> None:
+        """Credit already-measured time to a child phase of the current one.
+
+        Args:
+            name: Phase name
+            seconds: Elapsed time
+        """
+        if self._stack[-1] != name:
+            self._inclusive[tuple(self._stack) + (name,)] += seconds
+
+    def finish(self) -> Optional[Dict]:
+        """Stop profiling; store the rerun in the page history and append its samples.
+
+        Returns:
+            Dictionary with 'total_ms' and milliseconds per phase, or None
+            when profiling is off
+        """
+        if not self.enabled or self.result is not None:
+            return self.result
+        if active_profiler() is self:
+            _active.profiler = None
+
+        self._inclusive[(self.page,)] = time.perf_counter() - self._start
+        self_times = self.self_times()
+
+        phases = {name: 0.0 for name in PHASES}
+        for path, seconds in self_times.items():
+            phase = path[-1] if len(path) > 1 else "render"
+            phases[phase] = phases.get(phase, 0.0) + seconds * 1000
+
+        self.result = dict(
+            {"at": time.strftime("%H:%M:%S"), "total_ms": self._inclusive[(self.page,)] * 1000},
+            **phases
+        )
+        with _history_lock:
+            _HISTORY[self.page].append(self.result)
+        self._write_folded(self_times)
+        return self.result
+
+    def self_times(self) -> Dict[Tuple[str, ...], float]:
+        """Seconds spent in each stack path excluding its child phases."""
+        self_times = dict(self._inclusive)
+        for path, seconds in self._inclusive.items():
+            if len(path) > 1 and path[:-1] in self_times:
+                self_times[path[:-1]] -= seconds
+        return {path: max(0.0, seconds) for path, seconds in self_times.items()}
+
+    def sample_path(self) -> str:
+        """File the folded samples of this page are appended to."""
+        slug = re.sub(r"\W+", "_", self.page).strip("_").lower()
+        return os.path.join(self._out_dir, "{}.folded".format(slug))
+
+    def _write_folded(self, self_times: Dict[Tuple[str, ...], float]) -> None:
+        """Append 'frame;frame;frame microseconds' lines (Brendan Gregg's folded format)."""
+        lines = [
+            "{} {}\n".format(";".join(path), int(seconds * 1_000_000))
+            for path, seconds in self_times.items() if seconds > 0
+        ]
+        try:
+            os.makedirs(self._out_dir, exist_ok=True)
+            with open(self.sample_path(), "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError:
+            # profiling must never break the page
+            pass
+
+
+def rerun_history(page: str) -> List[Dict]:
+    """Recent profiled reruns of a page (all sessions), newest first."""
+    with _history_lock:
+        return list(reversed(_HISTORY[page]))
+
+
+def show_profile_panel(profiler: Profiler, is_admin: bool) -> None:
+    """Collapsible sidebar panel: opt-in toggle and per-rerun phase timings (admins only).
+
+    Args:
+        profiler: This rerun's profiler, already finished
+        is_admin: Whether the current user may see the panel
+    """
+    if not is_admin:
+        return
+    import streamlit as st
+    import pandas as pd
+
+    with st.sidebar.expander("⏱ Profiling"):
+        # plain session key (not a widget key) so the choice survives page switches
+        st.session_state["profiling"] = st.checkbox(
+            "Profile reruns", value=st.session_state.get("profiling", False),
+            help="Times db / transform / render phases of every rerun of every page"
+        )
+        if profiler.result is None:
+            st.caption("Turn on and interact with the page to collect timings.")
+            return
+        st.dataframe(pd.DataFrame(rerun_history(profiler.page)).round(1), use_container_width=True)
+        st.caption("Folded samples: {}".format(profiler.sample_path()))
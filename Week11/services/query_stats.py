@@ -0,0 +1,161 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Upper bounds (ms) of the latency histogram buckets; slower calls go in a last overflow bucket
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Default slow-query threshold, overridable per process
+DEFAULT_SLOW_MS = float(os.getenv("PLATFORM_SLOW_QUERY_MS", "100"))
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """Normalise a statement so calls that differ only in literals group together.
+
+    Comments are dropped, string and number literals become ?, IN lists
+    collapse to IN (...) and whitespace is squeezed.
+
+    Args:
+        sql: SQL statement
+
+    Returns:
+        Normalised SQL text
+    """
+    sql = _COMMENTS.sub(" ", sql)
+    sql = _STRINGS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("IN (...)", sql)
+    return _SPACES.sub(" ", sql).strip().rstrip(";")
+
+
+class QueryStats:
+    """Thread-safe per-fingerprint timings, row counts and a slow-query log.
+
+    DatabaseManager records every execute_query / fetch_one / fetch_all
+    call here. Statistics are per process, so all managers (one per page
+    run) add to the same QUERY_STATS.
+    """
+
+    def __init__(self, slow_ms: float = DEFAULT_SLOW_MS, slow_log_size: int = 200):
+        """Initialize empty statistics.
+
+        Args:
+            slow_ms: Calls taking at least this long go to the slow-query log
+            slow_log_size: Number of most recent slow queries to keep
+        """
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+        self._traced: Dict[str, int] = {}
+        self._slow = deque(maxlen=slow_log_size)
+
+    def record(self, sql: str, elapsed_ms: float, rows: int) -> None:
+        """Add one timed statement.
+
+        Args:
+            sql: SQL statement as executed
+            elapsed_ms: Wall time of execute + fetch in milliseconds
+            rows: Rows returned (SELECT) or changed (writes)
+        """
+        key = fingerprint(sql)
+        bucket = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if elapsed_ms <= bound),
+                      len(HISTOGRAM_BUCKETS_MS))
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                stat = self._stats[key] = {
+                    "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                    "histogram": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+                }
+            stat["calls"] += 1
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+            stat["rows"] += rows
+            stat["histogram"][bucket] += 1
+            if elapsed_ms >= self.slow_ms:
+                self._slow.append({
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "ms": elapsed_ms,
+                    "rows": rows,
+                    "sql": _SPACES.sub(" ", sql).strip(),
+                })
+
+    def trace(self, statement: str) -> None:
+        """sqlite3 trace callback: counts statements as SQLite runs them.
+
+        sqlite3 reports a statement once more for every trigger program it
+        fires, so a high count next to few calls points at trigger fan-out.
+
+        Args:
+            statement: Statement text passed by sqlite3
+        """
+        key = fingerprint(statement) or statement.strip()
+        with self._lock:
+            self._traced[key] = self._traced.get(key, 0) + 1
+
+    @staticmethod
+    def _percentile(histogram: List[int], fraction: float) -> Optional[float]:
+        """Upper bucket bound below which the given fraction of calls fall (None = overflow)."""
+        target = fraction * sum(histogram)
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BUCKETS_MS, histogram):
+            seen += count
+            if seen >= target:
+                return float(bound)
+        return None
+
+    def top(self, n: int = 10, order_by: str = "total_ms") -> List[Dict]:
+        """Aggregated statements, most expensive first.
+
+        Args:
+            n: Number of fingerprints to return
+            order_by: total_ms, max_ms, calls or rows
+
+        Returns:
+            List of dictionaries with fingerprint, calls, total/mean/max ms,
+            rows, p50/p95 bucket bounds and the raw histogram
+        """
+        with self._lock:
+            rows = [
+                dict(stat, fingerprint=key, histogram=list(stat["histogram"]))
+                for key, stat in self._stats.items()
+            ]
+        for row in rows:
+            row["mean_ms"] = row["total_ms"] / row["calls"]
+            row["p50_ms"] = self._percentile(row["histogram"], 0.50)
+            row["p95_ms"] = self._percentile(row["histogram"], 0.95)
+        rows.sort(key=lambda r: r[order_by], reverse=True)
+        return rows[:n]
+
+    def slow_queries(self) -> List[Dict]:
+        """Most recent slow queries, newest first."""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def traced(self, n: int = 20) -> List[Dict]:
+        """Statements seen by the trace callback, most frequent first."""
+        with self._lock:
+            counts = sorted(self._traced.items(), key=lambda item: item[1], reverse=True)
+        return [{"fingerprint": key, "count": count} for key, count in counts[:n]]
+
+    def reset(self) -> None:
+        """Forget all statistics and slow queries."""
+        with self._lock:
+            self._stats.clear()
+            self._traced.clear()
+            self._slow.clear()
+
+
+# Process-wide statistics shared by every DatabaseManager
+QUERY_STATS = QueryStats()
@@ -0,0 +1,195 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Failed attempts allowed per sliding window before a lockout
+MAX_USER_FAILURES = int(os.getenv("PLATFORM_LOGIN_MAX_FAILURES", "5"))
+# One client trying many usernames is credential stuffing, so clients get a larger budget
+MAX_CLIENT_FAILURES = int(os.getenv("PLATFORM_LOGIN_MAX_CLIENT_FAILURES", "20"))
+WINDOW_SECONDS = float(os.getenv("PLATFORM_LOGIN_WINDOW_SECONDS", "300"))
+# First lockout; each further lockout of the same key doubles it, up to MAX_LOCKOUT_SECONDS
+LOCKOUT_SECONDS = float(os.getenv("PLATFORM_LOGIN_LOCKOUT_SECONDS", "60"))
+MAX_LOCKOUT_SECONDS = float(os.getenv("PLATFORM_LOGIN_MAX_LOCKOUT_SECONDS", "3600"))
+
+# Slot positions in a counter: [window start, previous window count, current window count,
+#                               locked until, lockouts so far]
+_START, _PREV, _CURR, _LOCKED_UNTIL, _LOCKOUTS = range(5)
+
+
+class LoginRateLimiter:
+    """Sliding-window failed-login counters with lockout and exponential backoff.
+
+    Each key ("user:<name>" and "client:<id>") holds five numbers: the
+    counts of the current and previous fixed window are blended into a
+    sliding-window estimate, so memory and time per attempt are O(1) no
+    matter how many attempts arrive. Checks happen before the password
+    hash is even looked up, so a blocked burst costs a dict lookup instead
+    of a hash verification.
+
+    State is process-wide (one limiter for every Streamlit session) and
+    written to a JSON file at most every persist_every seconds, so lockouts
+    survive a restart.
+    """
+
+    def __init__(self, max_user_failures: int = MAX_USER_FAILURES,
+                 max_client_failures: int = MAX_CLIENT_FAILURES,
+                 window_seconds: float = WINDOW_SECONDS,
+                 lockout_seconds: float = LOCKOUT_SECONDS,
+                 max_lockout_seconds: float = MAX_LOCKOUT_SECONDS,
+                 persist_path: Optional[str] = None, persist_every: float = 30.0):
+        """Initialize the limiter, loading persisted counters if present.
+
+        Args:
+            max_user_failures: Failures per window allowed for one username
+            max_client_failures: Failures per window allowed for one client
+            window_seconds: Length of the sliding window
+            lockout_seconds: Length of the first lockout of a key
+            max_lockout_seconds: Cap for the doubled lockouts
+            persist_path: JSON file for the counters (None = memory only)
+            persist_every: Minimum seconds between writes of that file
+        """
+        self.max_user_failures = max_user_failures
+        self.max_client_failures = max_client_failures
+        self.window_seconds = window_seconds
+        self.lockout_seconds = lockout_seconds
+        self.max_lockout_seconds = max_lockout_seconds
+        self._persist_path = persist_path
+        self._persist_every = persist_every
+        self._lock = threading.Lock()
+        self._counters: Dict[str, List[float]] = {}
+        self._last_persist = time.time()
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def _keys(username: str, client: Optional[str]) -> Tuple[str, ...]:
+        # No client (e.g. re-checking a password while logged in): the username budget only
+        if client is None:
+            return ("user:" + username.strip().lower(),)
+        return "user:" + username.strip().lower(), "client:" + client
+
+    def _limit(self, key: str) -> int:
+        return self.max_user_failures if key.startswith("user:") else self.max_client_failures
+
+    def _roll(self, counter: List[float], now: float) -> None:
+        """Move the counter's window forward to the one containing now."""
+        elapsed_windows = int((now - counter[_START]) // self.window_seconds)
+        if elapsed_windows >= 1:
+            counter[_PREV] = counter[_CURR] if elapsed_windows == 1 else 0
+            counter[_CURR] = 0
+            counter[_START] += elapsed_windows * self.window_seconds
+
+    def _estimate(self, counter: List[float], now: float) -> float:
+        """Failures in the last window_seconds, weighting the previous window by its overlap."""
+        overlap = 1 - (now - counter[_START]) / self.window_seconds
+        return counter[_PREV] * overlap + counter[_CURR]
+
+    def retry_after(self, username: str, client: Optional[str] = None) -> float:
+        """Seconds until this username/client may try again (0 = allowed now).
+
+        Args:
+            username: Username being logged in
+            client: Client identifier (IP address or session id), None for
+                    the username alone
+        """
+        now = time.time()
+        with self._lock:
+            waits = [self._counters[key][_LOCKED_UNTIL] - now
+                     for key in self._keys(username, client) if key in self._counters]
+        return max([0.0] + waits)
+
+    def record_failure(self, username: str, client: Optional[str] = None) -> float:
+        """Count a failed attempt; lock the key out when it exceeds its limit.
+
+        Args:
+            username: Username that failed
+            client: Client identifier, None to count against the username only
+
+        Returns:
+            Seconds the caller now has to wait (0 if not locked out)
+        """
+        now = time.time()
+        wait = 0.0
+        with self._lock:
+            for key in self._keys(username, client):
+                counter = self._counters.setdefault(key, [now, 0, 0, 0.0, 0])
+                self._roll(counter, now)
+                counter[_CURR] += 1
+                if self._estimate(counter, now) >= self._limit(key):
+                    lockout = min(self.lockout_seconds * 2 ** counter[_LOCKOUTS], self.max_lockout_seconds)
+                    counter[_LOCKED_UNTIL] = now + lockout
+                    counter[_LOCKOUTS] += 1
+                    # start counting afresh once the lockout ends
+                    counter[_PREV] = counter[_CURR] = 0
+                wait = max(wait, counter[_LOCKED_UNTIL] - now)
+            self._dirty = True
+        self._maybe_persist(now)
+        return wait
+
+    def record_success(self, username: str, client: Optional[str] = None) -> None:
+        """Forget the username's failures (the client keeps its own)."""
+        user_key = self._keys(username, client)[0]
+        with self._lock:
+            if self._counters.pop(user_key, None) is not None:
+                self._dirty = True
+        self._maybe_persist(time.time())
+
+    def reset(self) -> None:
+        """Forget every counter and lockout."""
+        with self._lock:
+            self._counters.clear()
+            self._dirty = True
+        self._maybe_persist(time.time(), force=True)
+
+    def _prune(self, now: float) -> None:
+        """Drop counters with nothing left to remember (caller holds the lock)."""
+        stale = [
+            key for key, c in self._counters.items()
+            if c[_LOCKED_UNTIL] <= now and now - c[_START] >= 2 * self.window_seconds
+            and now - c[_LOCKED_UNTIL] >= self.max_lockout_seconds
+        ]
+        for key in stale:
+            del self._counters[key]
+
+    def _maybe_persist(self, now: float, force: bool = False) -> None:
+        if self._persist_path is None:
+            return
+        with self._lock:
+            if not self._dirty or (not force and now - self._last_persist < self._persist_every):
+                return
+            self._prune(now)
+            state = {key: list(counter) for key, counter in self._counters.items()}
+            self._dirty = False
+            self._last_persist = now
+        tmp_path = self._persist_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._persist_path)
+        except OSError as e:
+            print(f"Could not persist login counters: {e}")
+
+    def _load(self) -> None:
+        if self._persist_path is None or not os.path.exists(self._persist_path):
+            return
+        try:
+            with open(self._persist_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring login counters file: {e}")
+            return
+        self._counters = {key: [float(v) for v in counter] for key, counter in state.items()
+                          if len(counter) == 5 and all(isinstance(v, (int, float)) for v in counter)}
+
+
+def format_wait(seconds: float) -> str:
+    """Human-readable lockout remaining, e.g. '45 s' or '3 min'."""
+    seconds = math.ceil(seconds)
+    return "{} s".format(seconds) if seconds < 120 else "{} min".format(math.ceil(seconds / 60))
+
+
+# Process-wide limiter shared by every AuthManager
+LOGIN_LIMITER = LoginRateLimiter(persist_path=os.getenv("PLATFORM_LOGIN_LIMITS_FILE", "database/login_limits.json"))
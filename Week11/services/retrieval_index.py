@@ -0,0 +1,156 @@
+import re
+from typing import Dict, List
+
+from services.database_manager import DatabaseManager
+
+# Very common words that would only add noise to an OR query
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "by", "can", "do", "for",
+    "from", "how", "i", "in", "is", "it", "me", "of", "on", "or", "show",
+    "that", "the", "there", "this", "to", "was", "we", "what", "which",
+    "who", "why", "with", "you",
+}
+
+# Per-table retrieval query and how to render a matching row as one line
+SOURCES = {
+    "incident": (
+        """
+        SELECT t.id, t.incident_type, sv.label, st.label, t.description,
+               bm25(security_incidents_fts) AS score
+        FROM security_incidents_fts
+        JOIN security_incidents t ON t.id = security_incidents_fts.rowid
+        JOIN severity_levels sv ON sv.id = t.severity_id
+        JOIN statuses st ON st.id = t.status_id
+        WHERE security_incidents_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        lambda r: "Incident #{} [{} / {}] {}: {}".format(r[0], r[2], r[3], r[1], r[4] or ""),
+    ),
+    "ticket": (
+        """
+        SELECT t.id, t.title, pr.label, st.label, t.assigned_to,
+               bm25(it_tickets_fts) AS score
+        FROM it_tickets_fts
+        JOIN it_tickets t ON t.id = it_tickets_fts.rowid
+        JOIN priorities pr ON pr.id = t.priority_id
+        JOIN statuses st ON st.id = t.status_id
+        WHERE it_tickets_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        lambda r: "Ticket #{} [{} / {}] {} (assigned to: {})".format(
+            r[0], r[2], r[3], r[1], r[4] or "unassigned"),
+    ),
+    "dataset": (
+        """
+        SELECT t.id, t.name, t.source, t.rows, t.size_bytes,
+               bm25(datasets_fts) AS score
+        FROM datasets_fts
+        JOIN datasets t ON t.id = datasets_fts.rowid
+        WHERE datasets_fts MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        lambda r: "Dataset #{} {} from {} ({} rows, {} bytes)".format(
+            r[0], r[1], r[2] or "unknown source", r[3], r[4]),
+    ),
+}
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into a safe FTS5 OR query.
+
+    Args:
+        text: User question or search text
+
+    Returns:
+        FTS5 MATCH expression, or "" if no usable terms remain
+    """
+    terms = [t for t in re.findall(r"\w+", text.lower()) if t not in STOPWORDS]
+    # Quote every term so FTS5 operators in user input are treated as text
+    return " OR ".join('"{}"'.format(t) for t in dict.fromkeys(terms))
+
+
+class RetrievalIndex:
+    """Local full-text retrieval over incidents, tickets and datasets.
+
+    Uses the FTS5 indexes created by database.db.create_search_index, which
+    triggers keep up to date on every insert/update/delete. Everything runs
+    in-process against SQLite, so it works fully offline.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        """Initialize the retrieval index.
+
+        Args:
+            db: DatabaseManager instance
+        """
+        self._db = db
+
+    def search(self, text: str, k: int = 5) -> List[Dict]:
+        """Find the k rows most relevant to the given text.
+
+        Candidates from all tables are ranked on their raw bm25() scores,
+        one shared scale, so a weak match in one table never outranks a
+        strong match in another just for being that table's best. The
+        returned score is min-max scaled over the merged candidates: 1 for
+        the best one, 0 for the weakest.
+
+        Args:
+            text: User question or search text
+            k: Maximum number of rows to return
+
+        Returns:
+            List of dictionaries with 'source', 'id', 'text' and 'score' keys,
+            best match first
+        """
+        match = build_match_query(text)
+        if not match:
+            return []
+
+        candidates = []
+        for source, (sql, render) in SOURCES.items():
+            for row in self._db.fetch_all(sql, (match, k)):
+                candidates.append((row[-1], source, row, render))
+        if not candidates:
+            return []
+
+        # bm25() is negative, lower is a better match; the sort is stable so
+        # equal scores keep table order and each table's own ranking
+        candidates.sort(key=lambda c: c[0])
+        best, worst = candidates[0][0], candidates[-1][0]
+        spread = worst - best
+        return [
+            {
+                "source": source,
+                "id": row[0],
+                "text": render(row),
+                "score": (worst - raw) / spread if spread else 1.0,
+            }
+            for raw, source, row, render in candidates[:k]
+        ]
+
+    def build_context(self, text: str, k: int = 5, max_chars: int = 2000) -> str:
+        """Build a compact context block of the top-k relevant rows.
+
+        Args:
+            text: User question
+            k: Maximum number of rows to include
+            max_chars: Upper bound on the size of the returned block
+
+        Returns:
+            Context string for the model, or "" if nothing matched
+        """
+        lines = []
+        used = 0
+        for hit in self.search(text, k):
+            line = hit["text"]
+            if used + len(line) > max_chars:
+                break
+            lines.append("- " + line)
+            used += len(line) + 3
+
+        if not lines:
+            return ""
+        return "Relevant records from the platform database:\n" + "\n".join(lines)
@@ -0,0 +1,150 @@
+import re
+from typing import List, Optional, Tuple
+
+from models.it_ticket import ITTicket
+from models.security_incident import SecurityIncident
+from services.database_manager import DatabaseManager
+from services.lookups import LookupCache
+
+
+def build_prefix_query(text: str) -> str:
+    """Turn search-box text into an FTS5 prefix query.
+
+    Every word must match (AND), and each word also matches longer words
+    starting with it, so "phish cred" finds "Phishing ... credentials".
+
+    Args:
+        text: Text typed into a search box
+
+    Returns:
+        FTS5 MATCH expression, or "" if the text has no searchable words
+    """
+    terms = re.findall(r"\w+", text.lower())
+    # Quoting keeps FTS5 syntax (AND, NEAR, ^, ...) in user input literal
+    return " ".join('"{}"*'.format(t) for t in dict.fromkeys(terms))
+
+
+class SearchService:
+    """Ranked, paginated full-text search over incidents and tickets.
+
+    Backed by the FTS5 indexes from database.db.create_search_index, which
+    triggers keep in sync with the base tables, so searches never scan
+    security_incidents or it_tickets.
+    """
+
+    def __init__(self, db: DatabaseManager, page_size: int = 20):
+        """Initialize the search service.
+
+        Args:
+            db: DatabaseManager instance
+            page_size: Number of results per page
+        """
+        self._db = db
+        self._page_size = page_size
+        self._lookups = LookupCache(db)
+
+    def _run(self, sql: str, match: str, filters: List[Tuple[str, int]],
+             page: int) -> Tuple[List[Tuple], bool]:
+        """Run a ranked search query for one page of results."""
+        where = ""
+        params: List = [match]
+        for column, value in filters:
+            where += " AND {} = ?".format(column)
+            params.append(value)
+
+        # Fetch one extra row to know whether a next page exists
+        offset = (max(page, 1) - 1) * self._page_size
+        params += [self._page_size + 1, offset]
+
+        rows = self._db.fetch_all(sql.format(where=where), params)
+        return rows[:self._page_size], len(rows) > self._page_size
+
+    def search_incidents(self, text: str, page: int = 1,
+                         severity: Optional[str] = None,
+                         status: Optional[str] = None) -> Tuple[List[SecurityIncident], bool]:
+        """Search incident types and descriptions.
+
+        Args:
+            text: Search text (words are prefix-matched)
+            page: 1-based page number
+            severity: Optional severity label filter
+            status: Optional status label filter
+
+        Returns:
+            Tuple of (incidents on this page, whether more pages exist)
+        """
+        match = build_prefix_query(text)
+        if not match:
+            return [], False
+
+        filters = []
+        if severity:
+            filters.append(("t.severity_id", self._lookups.id_for("severity_levels", severity)))
+        if status:
+            filters.append(("t.status_id", self._lookups.id_for("statuses", status)))
+
+        rows, has_more = self._run("""
+            SELECT t.id, t.incident_type, t.severity_id, t.status_id, t.description
+            FROM security_incidents_fts f
+            JOIN security_incidents t ON t.id = f.rowid
+            WHERE security_incidents_fts MATCH ?{where}
+            ORDER BY f.rank
+            LIMIT ? OFFSET ?
+        """, match, filters, page)
+
+        incidents = [
+            SecurityIncident(
+                incident_id=row[0],
+                incident_type=row[1],
+                severity=self._lookups.label("severity_levels", row[2]),
+                status=self._lookups.label("statuses", row[3]),
+                description=row[4]
+            )
+            for row in rows
+        ]
+        return incidents, has_more
+
+    def search_tickets(self, text: str, page: int = 1,
+                       priority: Optional[str] = None,
+                       status: Optional[str] = None) -> Tuple[List[ITTicket], bool]:
+        """Search ticket titles.
+
+        Args:
+            text: Search text (words are prefix-matched)
+            page: 1-based page number
+            priority: Optional priority label filter
+            status: Optional status label filter
+
+        Returns:
+            Tuple of (tickets on this page, whether more pages exist)
+        """
+        match = build_prefix_query(text)
+        if not match:
+            return [], False
+
+        filters = []
+        if priority:
+            filters.append(("t.priority_id", self._lookups.id_for("priorities", priority)))
+        if status:
+            filters.append(("t.status_id", self._lookups.id_for("statuses", status)))
+
+        rows, has_more = self._run("""
+            SELECT t.id, t.title, t.priority_id, t.status_id, t.assigned_to
+            FROM it_tickets_fts f
+            JOIN it_tickets t ON t.id = f.rowid
+            WHERE it_tickets_fts MATCH ?{where}
+            ORDER BY f.rank
+            LIMIT ? OFFSET ?
+        """, match, filters, page)
+
+        tickets = [
+            ITTicket(
+                ticket_id=row[0],
+                title=row[1],
+                priority=self._lookups.label("priorities", row[2]),
+                status=self._lookups.label("statuses", row[3]),
+                assigned_to=row[4]
+            )
+            for row in rows
+        ]
+        return tickets, has_more
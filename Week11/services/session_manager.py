@@ -0,0 +1,201 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import MutableMapping, Optional, Tuple
+
+from models.user import User
+from services.database_manager import DatabaseManager
+from services.db_registry import get_db
+
+# Signing key; without PLATFORM_SESSION_SECRET it is random per process,
+# so a restart logs everybody out (Streamlit session state is lost then anyway)
+SESSION_SECRET = os.getenv("PLATFORM_SESSION_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+# Lifetime of a login session
+SESSION_TTL_SECONDS = float(os.getenv("PLATFORM_SESSION_TTL_SECONDS", str(8 * 3600)))
+
+# How long a resolved user is trusted before the database is asked again:
+# role changes and revocations elsewhere show up within this many seconds
+CACHE_SECONDS = 5.0
+CACHE_SIZE = 1024
+
+# Expired sessions are deleted on login, at most this often per process
+PURGE_EVERY_SECONDS = 3600.0
+_last_purge = 0.0
+
+# Process-wide LRU: session id hash -> (User, session expires_at, cached_at)
+_cache: "OrderedDict[str, Tuple[User, float, float]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _sign(session_id: str) -> str:
+    return hmac.new(SESSION_SECRET, session_id.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _id_hash(session_id: str) -> str:
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+
+
+def _drop_cached(predicate) -> None:
+    with _cache_lock:
+        for key in [key for key, entry in _cache.items() if predicate(key, entry)]:
+            del _cache[key]
+
+
+class SessionManager:
+    """Server-side login sessions behind signed tokens.
+
+    A token is "<random session id>.<HMAC of the id>". Forged or mangled
+    tokens fail the signature check without touching the database; valid
+    ones are resolved to a User through a small process-wide LRU cache, so
+    a page rerun normally costs one dictionary lookup. Cached users are
+    re-read after CACHE_SECONDS, which is how a changed role or a revoked
+    session reaches pages that are already open.
+    """
+
+    def __init__(self, db: DatabaseManager, ttl_seconds: float = SESSION_TTL_SECONDS):
+        """Initialize the session manager.
+
+        Args:
+            db: DatabaseManager for the sessions and users tables (only
+                used on a cache miss)
+            ttl_seconds: Lifetime of new sessions
+        """
+        self._db = db
+        self._ttl = ttl_seconds
+
+    def create_session(self, user: User) -> str:
+        """Start a session for an authenticated user.
+
+        Args:
+            user: User returned by AuthManager.login_user
+
+        Returns:
+            Signed session token to keep in st.session_state
+        """
+        now = time.time()
+        self._maybe_purge(now)
+        session_id = secrets.token_urlsafe(32)
+        expires_at = now + self._ttl
+        self._db.execute_query(
+            "INSERT INTO sessions (id_hash, username, expires_at) VALUES (?, ?, ?)",
+            (_id_hash(session_id), user.get_username(), expires_at),
+        )
+        with _cache_lock:
+            _cache[_id_hash(session_id)] = (user, expires_at, time.time())
+        return "{}.{}".format(session_id, _sign(session_id))
+
+    @staticmethod
+    def _verified_id(token: Optional[str]) -> Optional[str]:
+        """Session id of a correctly signed token, else None."""
+        if not token or "." not in token:
+            return None
+        session_id, signature = token.rsplit(".", 1)
+        if not hmac.compare_digest(signature, _sign(session_id)):
+            return None
+        return session_id
+
+    def resolve(self, token: Optional[str]) -> Optional[User]:
+        """User behind a session token.
+
+        Args:
+            token: Token from create_session (None allowed)
+
+        Returns:
+            The User with their current role, or None when the token is
+            forged, expired or revoked
+        """
+        session_id = self._verified_id(token)
+        if session_id is None:
+            return None
+        key = _id_hash(session_id)
+        now = time.time()
+
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[1] > now and now - entry[2] < CACHE_SECONDS:
+                _cache.move_to_end(key)
+                return entry[0]
+
+        row = self._db.fetch_one(
+            """
+            SELECT u.username, u.password_hash, u.role, s.expires_at
+            FROM sessions s
+            JOIN users u ON u.username = s.username
+            WHERE s.id_hash = ? AND s.expires_at > ?
+            """,
+            (key, now),
+        )
+        with _cache_lock:
+            if row is None:
+                _cache.pop(key, None)
+                return None
+            user = User(row[0], row[1], row[2])
+            _cache[key] = (user, row[3], now)
+            _cache.move_to_end(key)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+        return user
+
+    def revoke(self, token: Optional[str]) -> None:
+        """End one session (logout)."""
+        session_id = self._verified_id(token)
+        if session_id is None:
+            return
+        key = _id_hash(session_id)
+        self._db.execute_query("DELETE FROM sessions WHERE id_hash = ?", (key,))
+        _drop_cached(lambda k, entry: k == key)
+
+    def revoke_user(self, username: str) -> None:
+        """End every session of a user (e.g. after a password or role change)."""
+        self._db.execute_query("DELETE FROM sessions WHERE username = ?", (username,))
+        _drop_cached(lambda k, entry: entry[0].get_username() == username)
+
+    def _maybe_purge(self, now: float) -> None:
+        """Run purge_expired() if it hasn't run in this process for PURGE_EVERY_SECONDS."""
+        global _last_purge
+        with _cache_lock:
+            if now - _last_purge < PURGE_EVERY_SECONDS:
+                return
+            _last_purge = now
+        self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete expired sessions; returns how many were removed."""
+        now = time.time()
+        cur = self._db.execute_query("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        _drop_cached(lambda k, entry: entry[1] <= now)
+        return cur.rowcount
+
+
+def session_user(state: MutableMapping, db_path: str = "database/platform.db") -> Optional[User]:
+    """Resolve st.session_state's token and refresh current_user / current_role.
+
+    Pages call this instead of trusting current_user: the thread's shared
+    manager is only queried on a cache miss. A missing, invalid or expired
+    token logs the session out.
+
+    Args:
+        state: st.session_state (any mutable mapping)
+        db_path: Path to the SQLite database file
+
+    Returns:
+        The logged-in User, or None
+    """
+    token = state.get("session_token")
+    user = None
+    if token is not None:
+        user = SessionManager(get_db(db_path)).resolve(token)
+
+    if user is None:
+        state["session_token"] = None
+        state["current_user"] = None
+        state["current_role"] = None
+    else:
+        state["current_user"] = user.get_username()
+        state["current_role"] = user.get_role()
+    return user
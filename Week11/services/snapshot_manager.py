@@ -0,0 +1,201 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from services.database_manager import DatabaseManager
+
+# Map up to 256 MB of the snapshot into memory
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class SnapshotReader(DatabaseManager):
+    """DatabaseManager over a published snapshot, opened read-only.
+
+    A published snapshot file is never written again (the next one gets a
+    new name), so it is opened with immutable=1: SQLite skips all locking
+    and change detection, and reads go through mmap instead of read() calls.
+    """
+
+    def __init__(self, snapshot_path: str, mmap_size: int = DEFAULT_MMAP_SIZE):
+        """Initialize the snapshot reader.
+
+        Args:
+            snapshot_path: Path to the snapshot database file
+            mmap_size: Bytes of the file to memory-map
+        """
+        super().__init__(snapshot_path)
+        self._mmap_size = mmap_size
+
+    def connect(self) -> None:
+        """Open the snapshot read-only, without locking."""
+        if self._connection is None:
+            uri = "file:{}?mode=ro&immutable=1".format(Path(self._db_path).resolve().as_posix())
+            self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA mmap_size = {}".format(int(self._mmap_size)))
+            if self._trace:
+                self._connection.set_trace_callback(self.stats.trace)
+
+
+class SnapshotManager:
+    """Publishes periodic read-only copies of the platform database.
+
+    Analytic pages read from the snapshot, so long scans never hold read
+    locks on the database the CRUD pages write to. Snapshots are published
+    by a background thread every max_age_seconds, so a page rerun never
+    waits for a copy. Each snapshot gets its own versioned file name and
+    publishing only switches which version is current: a published file is
+    never renamed over or rewritten (Windows refuses that while a reader
+    has it open), and readers of the previous version keep a consistent
+    view until they reconnect.
+    """
+
+    # Versions kept on disk: the current one and the one readers may still have open
+    KEEP_VERSIONS = 2
+
+    def __init__(self, db_path: str, snapshot_path: Optional[str] = None,
+                 max_age_seconds: int = 300, mmap_size: int = DEFAULT_MMAP_SIZE):
+        """Initialize the snapshot manager.
+
+        Args:
+            db_path: Path to the live platform database
+            snapshot_path: Base name of the snapshot files (default: next to
+                           the database, with a _snapshot suffix); versions
+                           are published as <stem>.<epoch ms><suffix>
+            max_age_seconds: Republish when the snapshot is older than this
+            mmap_size: Bytes of the snapshot to memory-map in readers
+        """
+        self._db_path = db_path
+        if snapshot_path is None:
+            path = Path(db_path)
+            snapshot_path = str(path.with_name(path.stem + "_snapshot" + path.suffix))
+        self._snapshot_path = Path(snapshot_path)
+        self._max_age = max_age_seconds
+        self._mmap_size = mmap_size
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Pointer to the current version: (epoch ms, path), picked up from disk on start
+        versions = self._versions()
+        self._current = versions[-1] if versions else None
+
+    @property
+    def max_age_seconds(self) -> int:
+        """Refresh cadence in seconds."""
+        return self._max_age
+
+    def _versions(self) -> List[Tuple[int, Path]]:
+        """Return the published versions on disk, oldest first."""
+        base = self._snapshot_path
+        versions = []
+        for path in base.parent.glob("{}.*{}".format(base.stem, base.suffix)):
+            stamp = path.name[len(base.stem) + 1:len(path.name) - len(base.suffix)]
+            if stamp.isdigit():
+                versions.append((int(stamp), path))
+        return sorted(versions)
+
+    def current_path(self) -> Optional[str]:
+        """Return the file of the current snapshot, or None if there is none."""
+        current = self._current
+        return None if current is None else str(current[1])
+
+    def published_at(self) -> Optional[float]:
+        """Return when the current snapshot was published (epoch seconds)."""
+        current = self._current
+        return None if current is None else current[0] / 1000
+
+    def age_seconds(self) -> Optional[float]:
+        """Return how old the current snapshot is, or None if there is none."""
+        published = self.published_at()
+        return None if published is None else max(0.0, time.time() - published)
+
+    def refresh(self) -> float:
+        """Publish a new snapshot of the live database now.
+
+        Returns:
+            Publication time of the new snapshot
+        """
+        with self._lock:
+            stamp = int(time.time() * 1000)
+            if self._current is not None:
+                stamp = max(stamp, self._current[0] + 1)
+            base = self._snapshot_path
+            path = base.with_name("{}.{}{}".format(base.stem, stamp, base.suffix))
+            tmp_path = str(path) + ".tmp"
+            source = sqlite3.connect(self._db_path)
+            target = sqlite3.connect(tmp_path)
+            try:
+                # Copies the whole database as of one consistent read
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            # A brand-new name, so nothing can have it open
+            os.replace(tmp_path, path)
+            self._current = (stamp, path)
+            self._remove_old_versions()
+            return self.published_at()
+
+    def _remove_old_versions(self) -> None:
+        """Delete superseded versions; ones still open are retried next time."""
+        for _, path in self._versions()[:-self.KEEP_VERSIONS]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _seconds_until_due(self) -> float:
+        """Return how long until the current snapshot is older than max_age_seconds."""
+        age = self.age_seconds()
+        return 0.0 if age is None else self._max_age - age
+
+    def _run(self) -> None:
+        """Background loop: republish whenever the snapshot is due."""
+        while not self._stop.wait(max(0.0, self._seconds_until_due())):
+            if self._seconds_until_due() > 0:
+                # Refreshed by hand meanwhile
+                continue
+            try:
+                self.refresh()
+            except (sqlite3.Error, OSError):
+                # Keep serving the current snapshot, try again after a short pause
+                self._stop.wait(min(self._max_age, 10))
+
+    def start(self) -> None:
+        """Start the background publisher (once per manager)."""
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="snapshot-publisher", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background publisher."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None:
+            thread.join()
+
+    def ensure_fresh(self) -> float:
+        """Make sure a snapshot exists and the background publisher is running.
+
+        Only the very first snapshot is published synchronously; after that
+        a stale snapshot is replaced by the publisher, never by the caller.
+
+        Returns:
+            Publication time of the snapshot in use
+        """
+        published = self.published_at()
+        if published is None:
+            published = self.refresh()
+        self.start()
+        return published
+
+    def reader(self) -> SnapshotReader:
+        """Return a read-only DatabaseManager over the current snapshot."""
+        self.ensure_fresh()
+        return SnapshotReader(self.current_path(), self._mmap_size)
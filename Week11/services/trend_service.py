@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from services.database_manager import DatabaseManager
+from services.lookups import LookupCache
+
+# SQL that maps a daily bucket onto the requested bucket size
+BUCKETS = {
+    "day": "day",
+    "week": "date(day, '-6 days', 'weekday 1')",  # Monday of that week
+    "month": "strftime('%Y-%m-01', day)",
+}
+
+# Period choices for trend charts: label -> days back (None = all time)
+PERIODS = {
+    "Last 30 days": 30,
+    "Last 12 months": 365,
+    "All time": None,
+}
+
+# Trend domain -> lookup table of its level column (see database.db.TREND_SOURCES)
+DOMAIN_LEVELS = {
+    "incidents": "severity_levels",
+    "tickets": "priorities",
+}
+
+
+def period_start(period: str) -> Optional[str]:
+    """Return the first day (YYYY-MM-DD) of a PERIODS entry, or None."""
+    days = PERIODS[period]
+    return None if days is None else (date.today() - timedelta(days=days)).isoformat()
+
+
+class TrendService:
+    """Range queries over the trend_rollups table.
+
+    trend_rollups is maintained by triggers (database.db.create_trend_rollups),
+    so a multi-year trend is a primary-key range scan over one small row
+    per day and level, never a scan of the incident or ticket tables.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        """Initialize the trend service.
+
+        Args:
+            db: DatabaseManager instance
+        """
+        self._db = db
+        self._lookups = LookupCache(db)
+
+    @staticmethod
+    def _range(start: Optional[str], end: Optional[str]) -> Tuple[str, str]:
+        return start or "0000-01-01", end or "9999-12-31"
+
+    def series(self, domain: str, bucket: str = "day", start: Optional[str] = None,
+               end: Optional[str] = None) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Opened counts per bucket, split by severity/priority.
+
+        Args:
+            domain: "incidents" or "tickets"
+            bucket: "day", "week" or "month"
+            start: First day to include (YYYY-MM-DD), or None for no limit
+            end: Last day to include (YYYY-MM-DD), or None for no limit
+
+        Returns:
+            Tuple of (bucket start dates, {level label: count per bucket})
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket: {bucket!r}")
+        lookup = DOMAIN_LEVELS[domain]
+
+        rows = self._db.fetch_all(f"""
+            SELECT {BUCKETS[bucket]} AS bucket, level_id, SUM(opened)
+            FROM trend_rollups
+            WHERE domain = ? AND day BETWEEN ? AND ?
+            GROUP BY bucket, level_id
+            ORDER BY bucket
+        """, (domain,) + self._range(start, end))
+
+        buckets = list(dict.fromkeys(row[0] for row in rows))
+        position = {b: i for i, b in enumerate(buckets)}
+        series = {label: [0] * len(buckets) for label in self._lookups.labels(lookup)}
+        for bucket_start, level_id, opened in rows:
+            series[self._lookups.label(lookup, level_id)][position[bucket_start]] = opened
+        return buckets, series
+
+    def mean_time_to_resolve(self, domain: str, start: Optional[str] = None,
+                             end: Optional[str] = None) -> Dict[str, Optional[float]]:
+        """Mean time to resolve, in hours, per severity/priority.
+
+        Args:
+            domain: "incidents" or "tickets"
+            start: First resolution day to include, or None for no limit
+            end: Last resolution day to include, or None for no limit
+
+        Returns:
+            Dictionary of level label -> mean hours (None if nothing resolved)
+        """
+        lookup = DOMAIN_LEVELS[domain]
+        mttr = {label: None for label in self._lookups.labels(lookup)}
+
+        for level_id, resolved, seconds in self._db.fetch_all("""
+            SELECT level_id, SUM(resolved), SUM(resolve_seconds)
+            FROM trend_rollups
+            WHERE domain = ? AND day BETWEEN ? AND ?
+            GROUP BY level_id
+        """, (domain,) + self._range(start, end)):
+            if resolved:
+                mttr[self._lookups.label(lookup, level_id)] = seconds / resolved / 3600
+        return mttr
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from database.db import initialize_database
+from services.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "platform.db")
+    initialize_database(path)
+    manager = DatabaseManager(path)
+    manager.connect()
+    yield manager
+    manager.close()
+
+
+def _insert_ticket(db: DatabaseManager) -> int:
+    cur = db.execute_query(
+        "INSERT INTO it_tickets (title, priority_id, status_id) VALUES ('Printer jam', 1, 1)"
+    )
+    return cur.lastrowid
+
+
+def test_updated_at_grows_on_every_update(db):
+    ticket_id = _insert_ticket(db)
+    seen = [db.fetch_one("SELECT updated_at FROM it_tickets WHERE id = ?", (ticket_id,))[0]]
+    # Far faster than 1 ms per update, so most share a millisecond
+    for status in [2, 3, 2, 3, 4] * 10:
+        db.execute_query("UPDATE it_tickets SET status_id = ? WHERE id = ?", (status, ticket_id))
+        seen.append(db.fetch_one("SELECT updated_at FROM it_tickets WHERE id = ?", (ticket_id,))[0])
+
+    assert all(later > earlier for earlier, later in zip(seen, seen[1:]))
+
+
+def test_changes_since_sees_update_in_same_millisecond(db):
+    ticket_id = _insert_ticket(db)
+    db.execute_query("UPDATE it_tickets SET status_id = 2 WHERE id = ?", (ticket_id,))
+    rows, watermark = db.changes_since("it_tickets")
+    assert [row["id"] for row in rows] == [ticket_id]
+
+    db.execute_query("UPDATE it_tickets SET status_id = 3 WHERE id = ?", (ticket_id,))
+    rows, watermark = db.changes_since("it_tickets", watermark)
+    assert [(row["id"], row["status_id"]) for row in rows] == [(ticket_id, 3)]
+
+    rows, _ = db.changes_since("it_tickets", watermark)
+    assert rows == []
+
+
+def test_changes_since_pages_rows_sharing_a_timestamp(db):
+    db.execute_query("UPDATE it_tickets SET updated_at = '2024-01-01 00:00:00'")
+    for _ in range(5):
+        _insert_ticket(db)
+    db.execute_query("UPDATE it_tickets SET updated_at = '2024-01-01 00:00:00'")
+
+    ids, watermark = [], None
+    while True:
+        rows, watermark = db.changes_since("it_tickets", watermark, limit=2)
+        if not rows:
+            break
+        ids += [row["id"] for row in rows]
+
+    assert ids == sorted(ids) and len(ids) == 5
+
+
+def _journal(db: DatabaseManager, ticket_id: int):
+    return db.fetch_all(
+        """SELECT op, json_extract(payload, '$.status_id') FROM change_log
+           WHERE table_name = 'it_tickets' AND row_id = ? ORDER BY seq""",
+        (ticket_id,),
+    )
+
+
+def test_journal_keeps_two_updates_within_one_millisecond(db):
+    ticket_id = _insert_ticket(db)
+    db.execute_query("UPDATE it_tickets SET status_id = 2 WHERE id = ?", (ticket_id,))
+    db.execute_query("UPDATE it_tickets SET status_id = 3 WHERE id = ?", (ticket_id,))
+
+    assert [tuple(row) for row in _journal(db, ticket_id)] == [("I", 1), ("U", 2), ("U", 3)]
+
+
+def test_journal_has_one_row_per_update_in_executemany(db):
+    ticket_id = _insert_ticket(db)
+    statuses = [2, 3, 4, 1, 2] * 10
+    db._connection.executemany(
+        "UPDATE it_tickets SET status_id = ? WHERE id = ?", [(s, ticket_id) for s in statuses]
+    )
+    db._connection.commit()
+
+    journal = _journal(db, ticket_id)
+    assert [row[1] for row in journal if row[0] == "U"] == statuses
+    current = db.fetch_one("SELECT status_id FROM it_tickets WHERE id = ?", (ticket_id,))[0]
+    assert journal[-1][1] == current
+
+
+def test_journal_keeps_update_that_sets_updated_at(db):
+    ticket_id = _insert_ticket(db)
+    db.execute_query(
+        "UPDATE it_tickets SET status_id = 2, updated_at = '2030-01-01 00:00:00.000' WHERE id = ?",
+        (ticket_id,),
+    )
+    assert [row[0] for row in _journal(db, ticket_id)] == ["I", "U"]
@@ -0,0 +1,64 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from database.db import initialize_database
+from services.database_manager import DatabaseManager
+from services.db_registry import DatabaseRegistry
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "platform.db")
+    initialize_database(path)
+    return path
+
+
+def _other_connection_can_write(db_path: str) -> bool:
+    conn = sqlite3.connect(db_path, timeout=0.1)
+    try:
+        conn.execute("INSERT INTO datasets (name) VALUES ('probe')")
+        conn.commit()
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def test_failed_write_is_rolled_back(db_path):
+    db = DatabaseManager(db_path)
+    db.execute_query("INSERT INTO users (username, password_hash) VALUES ('alice', 'x')")
+    with pytest.raises(sqlite3.IntegrityError):
+        db.execute_query("INSERT INTO users (username, password_hash) VALUES ('alice', 'y')")
+
+    assert not db._connection.in_transaction
+    assert _other_connection_can_write(db_path)
+    db.close()
+
+
+def test_registry_rolls_back_open_transaction_before_reuse(db_path):
+    registry = DatabaseRegistry(db_path)
+    left_open = []
+
+    def rerun():
+        db = registry.get()
+        db._connection.execute("BEGIN IMMEDIATE")
+        left_open.append(db)
+
+    thread = threading.Thread(target=rerun)
+    thread.start()
+    thread.join()
+    assert left_open[0]._connection.in_transaction
+
+    # The next rerun's thread picks the idle manager up, rolled back
+    db = registry.get()
+    assert db is left_open[0]
+    assert not db._connection.in_transaction
+    assert _other_connection_can_write(db_path)
+    registry.close_all()
@@ -0,0 +1,63 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from database.db import initialize_database
+from database.migrate_assignment9 import Assignment9Migrator
+
+
+@pytest.fixture
+def paths(tmp_path):
+    source = str(tmp_path / "assignment9.db")
+    conn = sqlite3.connect(source)
+    conn.executescript("""
+        CREATE TABLE cyber_incidents (id INTEGER PRIMARY KEY, title TEXT, severity TEXT, status TEXT, date TEXT);
+        CREATE TABLE datasets_metadata (id INTEGER PRIMARY KEY, name TEXT, source TEXT, size INTEGER);
+        CREATE TABLE it_tickets (id INTEGER PRIMARY KEY, title TEXT, priority TEXT, status TEXT, created_date TEXT);
+        INSERT INTO datasets_metadata (name, source, size) VALUES ('a', 'x', 1), ('b', 'y', 2);
+    """)
+    conn.commit()
+    conn.close()
+    target = str(tmp_path / "platform.db")
+    initialize_database(target)
+    return source, target
+
+
+def _add_target_dataset(target: str) -> None:
+    conn = sqlite3.connect(target)
+    conn.execute("INSERT INTO datasets (name, size_bytes, rows, source) VALUES ('local', 1, 1, 'x')")
+    conn.commit()
+    conn.close()
+
+
+def test_verify_writes_no_checkpoints(paths):
+    source, target = paths
+    migrator = Assignment9Migrator(source, target)
+    migrator.verify()
+    checkpoints = migrator._target.execute("SELECT COUNT(*) FROM migration_checkpoints").fetchone()[0]
+    migrator.close()
+    assert checkpoints == 0
+
+
+def test_migration_after_verify_uses_current_offset(paths):
+    source, target = paths
+    migrator = Assignment9Migrator(source, target)
+    migrator.verify()
+    migrator.close()
+
+    # Rows added between verify and migrate must not collide with migrated ids
+    _add_target_dataset(target)
+    migrator = Assignment9Migrator(source, target)
+    migrator.migrate()
+    report = migrator.verify()
+    migrator.close()
+
+    assert all(entry["ok"] for entry in report)
+    conn = sqlite3.connect(target)
+    names = [row[0] for row in conn.execute("SELECT name FROM datasets ORDER BY id")]
+    conn.close()
+    assert names[-3:] == ["local", "a", "b"]
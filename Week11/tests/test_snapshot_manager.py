@@ -0,0 +1,85 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from database.db import initialize_database
+from services.database_manager import DatabaseManager
+from services.snapshot_manager import SnapshotManager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "platform.db")
+    initialize_database(path)
+    return path
+
+
+def _dataset_count(reader) -> int:
+    reader.connect()
+    try:
+        return reader.fetch_one("SELECT COUNT(*) FROM datasets")[0]
+    finally:
+        reader.close()
+
+
+def _add_dataset(db_path: str) -> None:
+    db = DatabaseManager(db_path)
+    db.connect()
+    db.execute_query("INSERT INTO datasets (name, size_bytes, rows, source) VALUES ('x', 1, 1, 'test')")
+    db.close()
+
+
+def test_publish_never_replaces_an_open_snapshot(db_path):
+    snapshots = SnapshotManager(db_path)
+    snapshots.refresh()
+    first = snapshots.current_path()
+    reader = snapshots.reader()
+    reader.connect()
+    before = reader.fetch_one("SELECT COUNT(*) FROM datasets")[0]
+
+    _add_dataset(db_path)
+    snapshots.refresh()
+
+    assert snapshots.current_path() != first
+    # The open reader keeps its version, a new reader sees the new one
+    assert reader.fetch_one("SELECT COUNT(*) FROM datasets")[0] == before
+    assert _dataset_count(snapshots.reader()) == before + 1
+    reader.close()
+    snapshots.stop()
+
+
+def test_old_versions_are_removed(db_path):
+    snapshots = SnapshotManager(db_path)
+    for _ in range(4):
+        snapshots.refresh()
+
+    versions = sorted(Path(db_path).parent.glob("platform_snapshot.*.db"))
+    assert len(versions) == SnapshotManager.KEEP_VERSIONS
+    assert str(versions[-1]) == snapshots.current_path()
+
+
+def test_stale_snapshot_is_republished_in_the_background(db_path):
+    SnapshotManager(db_path).refresh()
+    time.sleep(1.1)
+    snapshots = SnapshotManager(db_path, max_age_seconds=1)
+    first = snapshots.published_at()
+
+    # A rerun on a stale snapshot is served the current one right away
+    assert snapshots.ensure_fresh() == first
+
+    deadline = time.time() + 5
+    while snapshots.published_at() == first and time.time() < deadline:
+        time.sleep(0.05)
+    snapshots.stop()
+    assert snapshots.published_at() > first
+
+
+def test_current_version_is_picked_up_from_disk(db_path):
+    SnapshotManager(db_path).refresh()
+    published = SnapshotManager(db_path)
+    assert published.current_path() is not None
+    published.stop()
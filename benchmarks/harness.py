@@ -0,0 +1,196 @@
+"""Benchmark registry, workspace setup, timing and result comparison."""
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import synthetic
+
+ROOT = Path(__file__).resolve().parent.parent
+# Both stacks import from their own root (app.* / services.*, database.*)
+for stack in ("Assignment-9", "Week11"):
+    if str(ROOT / stack) not in sys.path:
+        sys.path.insert(0, str(ROOT / stack))
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup that cannot run here (e.g. missing dependency)."""
+
+
+class Benchmark:
+    """One registered benchmark.
+
+    setup(workspace) returns the callable to time, or (callable, reset) where
+    reset runs untimed before every call (e.g. emptying a table before a load).
+    """
+
+    def __init__(self, name: str, group: str, setup: Callable, repeat: Optional[int]):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.repeat = repeat
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, repeat: Optional[int] = None):
+    """Register a benchmark setup function under a name and group."""
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = Benchmark(name, group, setup, repeat)
+        return setup
+    return register
+
+
+class Workspace:
+    """Scratch copies of both databases filled with synthetic data.
+
+    Assignment-9 code uses paths relative to its app folder
+    (DATA/intelligence_platform.db), so benchmarks run with the working
+    directory set to a9_dir.
+    """
+
+    def __init__(self, scale: str, seed: int = 42):
+        self.scale = scale
+        self.rows = synthetic.SCALES[scale]
+        self.seed = seed
+        self.root = Path(tempfile.mkdtemp(prefix="platform_bench_"))
+        self.a9_dir = self.root / "a9"
+        self.week11_db = str(self.root / "week11" / "platform.db")
+        self.data_dir = self.root / "data"
+
+    def build(self) -> None:
+        """Create both schemas and bulk-insert the synthetic rows."""
+        (self.a9_dir / "DATA").mkdir(parents=True)
+        self.data_dir.mkdir()
+        os.chdir(self.a9_dir)
+        # one user per hundred rows, all sharing one password hash
+        users = max(1, self.rows // 100)
+
+        from app.data.schema import create_tables
+        create_tables()
+        synthetic.populate_assignment9("DATA/intelligence_platform.db", self.rows, users, self.seed,
+                                       self.bcrypt_hash())
+
+        from database.db import initialize_database
+        initialize_database(self.week11_db)
+        synthetic.populate_week11(self.week11_db, self.rows, users, self.seed)
+
+    @staticmethod
+    def bcrypt_hash() -> str:
+        try:
+            return synthetic.bcrypt_hash()
+        except RuntimeError:
+            # the Assignment-9 login benchmark is skipped without bcrypt
+            return "bcrypt-not-installed"
+
+    def csv_file(self, table: str, rows: Optional[int] = None) -> str:
+        """Write (once) and return a synthetic Assignment-9 CSV for a table."""
+        rows = rows or self.rows
+        path = self.data_dir / f"{table}_{rows}.csv"
+        if not path.exists():
+            generate, names = synthetic.CSV_FILES[table]
+            offset = list(synthetic.CSV_FILES).index(table)
+            synthetic.write_csv(str(path), generate(rows, self.seed + offset), names)
+        return str(path)
+
+    def cleanup(self) -> None:
+        os.chdir(ROOT)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(workspace: Workspace, names: Optional[List[str]] = None, repeat: int = 5) -> Dict:
+    """Run the selected benchmarks and return the results document."""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+
+        os.chdir(workspace.a9_dir)
+        try:
+            op = bench.setup(workspace)
+        except (Skip, ImportError) as e:
+            results[name] = {"group": bench.group, "status": "skipped", "reason": str(e)}
+            print(f"  {name:<40} skipped ({e})")
+            continue
+
+        op, reset = op if isinstance(op, tuple) else (op, None)
+        timings = []
+        try:
+            for i in range(1 + (bench.repeat or repeat)):
+                if reset:
+                    reset()
+                start = time.perf_counter()
+                op()
+                # the first call only warms caches, prepared statements and the page cache
+                if i:
+                    timings.append(time.perf_counter() - start)
+        except Exception as e:
+            results[name] = {"group": bench.group, "status": "error", "reason": repr(e)}
+            print(f"  {name:<40} error ({e!r})")
+            continue
+
+        results[name] = {
+            "group": bench.group,
+            "status": "ok",
+            "repeat": len(timings),
+            "median_s": statistics.median(timings),
+            "min_s": min(timings),
+            "mean_s": statistics.mean(timings),
+            "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        }
+        print(f"  {name:<40} {results[name]['median_s'] * 1000:10.2f} ms")
+
+    return {
+        "meta": {
+            "scale": workspace.scale,
+            "rows": workspace.rows,
+            "seed": workspace.seed,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def save(document: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """Compare median times per benchmark; ratio > 1 + threshold is a regression."""
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or old.get("status") != "ok" or new.get("status") != "ok":
+            continue
+        ratio = new["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        rows.append({
+            "name": name,
+            "baseline_ms": old["median_s"] * 1000,
+            "current_ms": new["median_s"] * 1000,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+            "improvement": ratio < 1 - threshold,
+        })
+    return rows
@@ -0,0 +1,77 @@
+"""Run the platform benchmarks or compare two result files.
+
+    python benchmarks/run.py run --scale 100k --out results.json
+    python benchmarks/run.py compare baseline.json results.json --threshold 0.10
+
+compare exits with status 1 when any benchmark's median time grew by more
+than the threshold, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+import harness
+import synthetic
+import workloads  # noqa: F401  (registers the benchmarks)
+
+
+def cmd_run(args) -> int:
+    workspace = harness.Workspace(args.scale, args.seed)
+    try:
+        print(f"Building workspace ({args.scale} rows per table) in {workspace.root}")
+        workspace.build()
+        document = harness.run(workspace, args.only, args.repeat)
+    finally:
+        if not args.keep:
+            workspace.cleanup()
+    harness.save(document, args.out)
+    print(f"Results written to {args.out}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    if baseline["meta"]["scale"] != current["meta"]["scale"]:
+        print(f"warning: comparing scale {baseline['meta']['scale']} with {current['meta']['scale']}")
+
+    rows = harness.compare(baseline, current, args.threshold)
+    regressions = 0
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else "faster" if row["improvement"] else ""
+        regressions += row["regression"]
+        print(f"{row['name']:<40} {row['baseline_ms']:10.2f} ms -> {row['current_ms']:10.2f} ms "
+              f"({row['ratio']:.2f}x) {flag}")
+
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Platform benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run benchmarks and write a JSON results file")
+    run.add_argument("--scale", choices=list(synthetic.SCALES), default="1k")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--repeat", type=int, default=5, help="timed calls per benchmark")
+    run.add_argument("--only", nargs="*", help="only benchmarks whose name contains one of these")
+    run.add_argument("--out", default="benchmark_results.json")
+    run.add_argument("--keep", action="store_true", help="keep the scratch workspace")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="flag regressions between two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""Seeded, vectorized synthetic data for the platform schemas.
+
+Generates incidents, tickets, datasets and users at any scale, with the
+shapes real data has: most incidents are low/medium severity, volume grows
+over time and dips at weekends, older rows are more likely to be resolved
+(critical ones fastest), titles and dataset sources repeat with a long
+tail. Every column is drawn as a whole numpy array, so a million rows take
+seconds.
+
+Writes the Assignment-9 DATA files (cyber_incidents.csv, it_tickets.csv,
+datasets_metadata.csv, users.txt) and bulk-loads the Assignment-9 and
+Week11 databases directly:
+
+    python benchmarks/synthetic.py --rows 1000000 --csv-dir out/
+    python benchmarks/synthetic.py --rows 100000 --a9-app scratch/app --week11-db scratch/platform.db
+"""
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# (labels, probabilities); labels as in the Assignment-9 CSV files
+SEVERITIES = (["low", "medium", "high", "critical"], [0.45, 0.33, 0.17, 0.05])
+PRIORITIES = (["low", "medium", "high", "critical"], [0.40, 0.35, 0.18, 0.07])
+STATUSES = ["open", "in progress", "resolved", "closed"]
+ROLES = (["user", "analyst", "admin"], [0.85, 0.12, 0.03])
+
+# Typical days to resolve per severity/priority level (critical is fastest)
+RESOLVE_DAYS = [30.0, 14.0, 5.0, 1.5]
+# Share of rows that are never resolved (the stale backlog)
+STALE_SHARE = 0.08
+
+INCIDENT_TITLES = [
+    "Phishing email detected", "Suspicious login attempt", "Malware infection on workstation",
+    "Unauthorized access to file share", "Credential stuffing against VPN", "Port scan from external host",
+    "Privilege escalation detected", "Data exfiltration alert", "Ransomware alert on server", "DDoS traffic spike",
+]
+TICKET_TITLES = [
+    "Reset password request", "VPN not connecting", "Email sync failing", "Printer malfunction in office",
+    "New laptop setup request", "Shared drive access request", "Software licence request",
+    "Monitor flickering", "Network outage on floor", "Slow application performance",
+]
+LOCATIONS = ["", "", "", " (HQ)", " (branch office)", " (remote)", " (data centre)"]
+
+# source -> categories it produces
+DATASET_SOURCES = {
+    "System Export": ["PII", "Finance"],
+    "Security Gateway": ["Logs"],
+    "Data Warehouse": ["Finance", "Marketing", "PII"],
+    "CRM": ["PII", "Marketing"],
+    "Web Analytics": ["Marketing", "Telemetry"],
+    "IoT Hub": ["Telemetry"],
+    "HR System": ["PII"],
+}
+DATASET_NAMES = {
+    "PII": "Customer Records", "Finance": "Ledger Extract", "Logs": "Firewall Logs",
+    "Marketing": "Campaign Results", "Telemetry": "Sensor Readings",
+}
+
+START_DATE = "2021-01-01"
+DAYS = 4 * 365
+
+# Plain-text password of every synthetic user
+PASSWORD = "Benchmark#123"
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> np.ndarray:
+    """Long-tail weights: the first items are much more common than the last."""
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return weights / weights.sum()
+
+
+def _pick(rng: np.random.Generator, labels, n: int, p=None) -> np.ndarray:
+    return np.asarray(labels)[rng.choice(len(labels), size=n, p=p)]
+
+
+def _days(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Sorted day offsets from START_DATE: linearly growing volume, quieter weekends."""
+    offsets = (DAYS * np.sqrt(rng.random(n))).astype(np.int64)
+    # 1970-01-01 was a Thursday, so (epoch day + 3) % 7 is 0 for Monday
+    start = np.datetime64(START_DATE, "D").astype(np.int64)
+    weekday = (start + offsets + 3) % 7
+    # move 60% of weekend rows back to the Friday before
+    moved = (weekday >= 5) & (rng.random(n) < 0.6)
+    offsets = np.where(moved, offsets - (weekday - 4), offsets)
+    return np.sort(np.clip(offsets, 0, DAYS - 1))
+
+
+def _as_dates(offsets: np.ndarray) -> np.ndarray:
+    return (np.datetime64(START_DATE, "D") + offsets).astype(str)
+
+
+def _statuses(rng: np.random.Generator, offsets: np.ndarray, levels: np.ndarray):
+    """Status codes and days-to-resolve; resolution chance grows with age."""
+    n = len(offsets)
+    age = DAYS - offsets
+    typical = np.asarray(RESOLVE_DAYS)[levels]
+    resolve_days = rng.exponential(typical)
+    done = (resolve_days < age) & (rng.random(n) >= STALE_SHARE)
+    codes = np.where(done,
+                     np.where(rng.random(n) < 0.7, 2, 3),
+                     np.where(rng.random(n) < 0.6, 0, 1))
+    return codes, resolve_days
+
+
+def _titles(rng: np.random.Generator, templates, n: int) -> np.ndarray:
+    titles = _pick(rng, templates, n, _zipf_weights(len(templates)))
+    return np.char.add(titles, _pick(rng, LOCATIONS, n))
+
+
+def incidents(n: int, seed: int = 42) -> Dict[str, np.ndarray]:
+    """cyber_incidents columns: title, severity, status, date (+ resolve_days)."""
+    rng = np.random.default_rng(seed)
+    levels = rng.choice(4, size=n, p=SEVERITIES[1])
+    offsets = _days(rng, n)
+    codes, resolve_days = _statuses(rng, offsets, levels)
+    return {
+        "title": _titles(rng, INCIDENT_TITLES, n),
+        "severity": np.asarray(SEVERITIES[0])[levels],
+        "status": np.asarray(STATUSES)[codes],
+        "date": _as_dates(offsets),
+        "resolve_days": np.where(codes >= 2, resolve_days, np.nan),
+    }
+
+
+def tickets(n: int, seed: int = 43) -> Dict[str, np.ndarray]:
+    """it_tickets columns: title, priority, status, created_date (+ resolve_days)."""
+    rng = np.random.default_rng(seed)
+    levels = rng.choice(4, size=n, p=PRIORITIES[1])
+    offsets = _days(rng, n)
+    codes, resolve_days = _statuses(rng, offsets, levels)
+    return {
+        "title": _titles(rng, TICKET_TITLES, n),
+        "priority": np.asarray(PRIORITIES[0])[levels],
+        "status": np.asarray(STATUSES)[codes],
+        "created_date": _as_dates(offsets),
+        "resolve_days": np.where(codes >= 2, resolve_days, np.nan),
+    }
+
+
+def datasets(n: int, seed: int = 44) -> Dict[str, np.ndarray]:
+    """datasets_metadata columns: name, source, category, size (KB)."""
+    rng = np.random.default_rng(seed)
+    sources = list(DATASET_SOURCES)
+    source_idx = rng.choice(len(sources), size=n, p=_zipf_weights(len(sources), 0.8))
+
+    category = np.empty(n, dtype=object)
+    for i, source in enumerate(sources):
+        rows = source_idx == i
+        category[rows] = _pick(rng, DATASET_SOURCES[source], int(rows.sum()))
+    category = category.astype(str)
+
+    names = np.vectorize(DATASET_NAMES.get, otypes=[str])(category)
+    suffix = np.char.mod(" %d", np.arange(1, n + 1))
+    return {
+        "name": np.char.add(names, suffix),
+        "source": np.asarray(sources)[source_idx],
+        "category": category,
+        "size": np.maximum(1, rng.lognormal(7, 1.5, size=n)).astype(np.int64),
+    }
+
+
+def users(n: int, seed: int = 45) -> Dict[str, np.ndarray]:
+    """users columns: username, role."""
+    rng = np.random.default_rng(seed)
+    return {
+        "username": np.char.mod("user%d", np.arange(1, n + 1)),
+        "role": _pick(rng, ROLES[0], n, ROLES[1]),
+    }
+
+
+def bcrypt_hash(password: str = PASSWORD) -> str:
+    """One bcrypt hash for every synthetic Assignment-9 user (hashing is the slow part)."""
+    try:
+        import bcrypt
+    except ImportError:
+        raise RuntimeError("users.txt needs bcrypt for its password hashes (pip install bcrypt)")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def sha256_hash(password: str = PASSWORD) -> str:
+    """The Week11 SimpleHasher hash of a password."""
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def write_csv(path: str, columns: Dict[str, np.ndarray], names) -> None:
+    """Write the named columns to a CSV with a leading id column, like the bundled DATA files."""
+    lists = [columns[name].tolist() for name in names]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", *names])
+        writer.writerows(zip(range(1, len(lists[0]) + 1), *lists))
+
+
+def write_users(path: str, columns: Dict[str, np.ndarray], password_hash: str) -> None:
+    """Write users.txt (username,password_hash,role)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write("username,password_hash,role\n")
+        f.writelines(f"{u},{password_hash},{r}\n" for u, r in zip(columns["username"].tolist(),
+                                                                  columns["role"].tolist()))
+
+
+CSV_FILES = {
+    "cyber_incidents": (incidents, ["title", "severity", "status", "date"]),
+    "it_tickets": (tickets, ["title", "priority", "status", "created_date"]),
+    "datasets_metadata": (datasets, ["name", "source", "category", "size"]),
+}
+
+
+def write_data_files(out_dir: str, rows: int, user_count: int, seed: int = 42,
+                     password_hash: Optional[str] = None) -> Dict[str, str]:
+    """Write the three CSV files and users.txt into out_dir -> {name: path}."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for offset, (table, (generate, names)) in enumerate(CSV_FILES.items()):
+        paths[table] = os.path.join(out_dir, f"{table}.csv")
+        write_csv(paths[table], generate(rows, seed + offset), names)
+    paths["users"] = os.path.join(out_dir, "users.txt")
+    write_users(paths["users"], users(user_count, seed + 3), password_hash or bcrypt_hash())
+    return paths
+
+
+def _lookup_ids(conn: sqlite3.Connection, table: str, labels: np.ndarray) -> list:
+    """Map label strings to lookup ids (case-insensitive) for a whole column."""
+    ids = {label.lower(): i for i, label in conn.execute(f"SELECT id, label FROM {table}")}
+    unique, inverse = np.unique(labels, return_inverse=True)
+    return np.array([ids[u.lower()] for u in unique])[inverse].tolist()
+
+
+def _timestamps(rng: np.random.Generator, dates: np.ndarray, resolve_days: np.ndarray):
+    """(created_at, updated_at) text columns: business-hours times on the given
+    dates; resolved rows were last updated when they were resolved."""
+    seconds = rng.normal(13 * 3600, 3 * 3600, size=len(dates)).clip(0, 86399)
+    created = dates.astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+    updated = created + np.nan_to_num(resolve_days * 86400).astype("timedelta64[s]")
+    return [np.char.replace(stamps.astype(str), "T", " ").tolist() for stamps in (created, updated)]
+
+
+def _bulk(conn: sqlite3.Connection):
+    """Fast-load settings: the load is one transaction on a scratch or fresh database."""
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -200000")
+
+
+def populate_assignment9(db_path: str, rows: int, user_count: int, seed: int = 42,
+                         password_hash: Optional[str] = None) -> None:
+    """Bulk-insert synthetic rows into an Assignment-9 database (schema must exist)."""
+    inc, tic, ds, usr = incidents(rows, seed), tickets(rows, seed + 1), datasets(rows, seed + 2), users(user_count, seed + 3)
+    conn = sqlite3.connect(db_path)
+    _bulk(conn)
+    with conn:
+        conn.executemany(
+            "INSERT INTO cyber_incidents (title, severity_id, status_id, date) VALUES (?, ?, ?, ?)",
+            zip(inc["title"].tolist(), _lookup_ids(conn, "severity_levels", inc["severity"]),
+                _lookup_ids(conn, "statuses", inc["status"]), inc["date"].tolist()),
+        )
+        conn.executemany(
+            "INSERT INTO it_tickets (title, priority_id, status_id, created_date) VALUES (?, ?, ?, ?)",
+            zip(tic["title"].tolist(), _lookup_ids(conn, "priorities", tic["priority"]),
+                _lookup_ids(conn, "statuses", tic["status"]), tic["created_date"].tolist()),
+        )
+        conn.executemany(
+            "INSERT INTO datasets_metadata (name, source, category, size) VALUES (?, ?, ?, ?)",
+            zip(*(ds[name].tolist() for name in ("name", "source", "category", "size"))),
+        )
+        password_hash = password_hash or bcrypt_hash()
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            ((u, password_hash, r) for u, r in zip(usr["username"].tolist(), usr["role"].tolist())),
+        )
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def populate_week11(db_path: str, rows: int, user_count: int, seed: int = 42) -> None:
+    """Bulk-insert synthetic rows into a Week11 database (initialize_database first).
+
+    Resolved rows get updated_at = created_at + time to resolve, and the
+    trend rollups are rebuilt afterwards so mean-time-to-resolve has data.
+    """
+    from database.db import rebuild_trend_rollups
+
+    inc, tic, ds, usr = incidents(rows, seed), tickets(rows, seed + 1), datasets(rows, seed + 2), users(user_count, seed + 3)
+    rng = np.random.default_rng(seed + 4)
+    conn = sqlite3.connect(db_path)
+    _bulk(conn)
+    with conn:
+        created, updated = _timestamps(rng, inc["date"], inc["resolve_days"])
+        conn.executemany(
+            "INSERT INTO security_incidents (incident_type, severity_id, status_id, description, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            zip(np.char.partition(inc["title"], " (")[:, 0].tolist(),
+                _lookup_ids(conn, "severity_levels", inc["severity"]),
+                _lookup_ids(conn, "statuses", inc["status"]), inc["title"].tolist(),
+                created, updated),
+        )
+        created, updated = _timestamps(rng, tic["created_date"], tic["resolve_days"])
+        teams = _pick(rng, ["IT support team", "Network team", "Service desk"], rows)
+        conn.executemany(
+            "INSERT INTO it_tickets (title, priority_id, status_id, assigned_to, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            zip(tic["title"].tolist(), _lookup_ids(conn, "priorities", tic["priority"]),
+                _lookup_ids(conn, "statuses", tic["status"]), teams.tolist(),
+                created, updated),
+        )
+        conn.executemany(
+            "INSERT INTO datasets (name, size_bytes, rows, source) VALUES (?, ?, ?, ?)",
+            zip(ds["name"].tolist(), (ds["size"] * 1024).tolist(), (ds["size"] * 10).tolist(), ds["source"].tolist()),
+        )
+        password_hash = sha256_hash()
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            ((u, password_hash, r) for u, r in zip(usr["username"].tolist(), usr["role"].tolist())),
+        )
+        rebuild_trend_rollups(conn.cursor())
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic platform data.")
+    parser.add_argument("--rows", type=int, default=1000, help="rows per table")
+    parser.add_argument("--users", type=int, help="number of users (default: rows / 100)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--csv-dir", help="write cyber_incidents.csv, it_tickets.csv, datasets_metadata.csv and users.txt here")
+    parser.add_argument("--a9-app", help="Assignment-9 app folder whose DATA/intelligence_platform.db to load "
+                                         "(tables are created if missing)")
+    parser.add_argument("--week11-db", help="Week11 database to load (initialized if missing)")
+    args = parser.parse_args()
+
+    if not (args.csv_dir or args.a9_app or args.week11_db):
+        parser.error("nothing to do: give --csv-dir, --a9-app and/or --week11-db")
+    user_count = args.users if args.users is not None else max(1, args.rows // 100)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path[:0] = [os.path.join(root, "Assignment-9"), os.path.join(root, "Week11")]
+
+    # computed once: bcrypt is deliberately slow
+    password_hash = bcrypt_hash() if args.csv_dir or args.a9_app else None
+
+    if args.csv_dir:
+        start = time.perf_counter()
+        for name, path in write_data_files(args.csv_dir, args.rows, user_count, args.seed, password_hash).items():
+            print(f"{name}: {path}")
+        print(f"files written in {time.perf_counter() - start:.1f}s")
+
+    if args.a9_app:
+        from app.data.schema import create_tables
+        start = time.perf_counter()
+        cwd = os.getcwd()
+        # create_tables() opens DATA/intelligence_platform.db relative to the app folder
+        os.chdir(args.a9_app)
+        try:
+            create_tables()
+            populate_assignment9("DATA/intelligence_platform.db", args.rows, user_count, args.seed, password_hash)
+        finally:
+            os.chdir(cwd)
+        print(f"{args.a9_app}: loaded in {time.perf_counter() - start:.1f}s")
+
+    if args.week11_db:
+        from database.db import initialize_database
+        start = time.perf_counter()
+        initialize_database(args.week11_db)
+        populate_week11(args.week11_db, args.rows, user_count, args.seed)
+        print(f"{args.week11_db}: loaded in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
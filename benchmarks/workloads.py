@@ -0,0 +1,304 @@
+"""The benchmarked hot paths, grouped as ingest, queries, auth, pages
+and metrics (the per-update cost of the instrumentation itself).
+
+Each function is a setup: it runs once, untimed, and returns the callable
+the harness times (or a (callable, reset) pair).
+"""
+import contextlib
+import io
+import os
+import sqlite3
+
+import synthetic
+from harness import Skip, Workspace, benchmark
+
+# Rows loaded per ingest iteration (capped so the 1m scale stays runnable)
+INGEST_ROWS = 100_000
+
+
+def _quiet(func, *args, **kwargs):
+    """Call func with its progress prints swallowed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _ingest_dir(ws: Workspace, table: str) -> str:
+    """An empty Assignment-9 database of its own, so loads don't grow the shared one."""
+    path = ws.root / f"ingest_{table}"
+    if not path.exists():
+        (path / "DATA").mkdir(parents=True)
+        os.chdir(path)
+        from app.data.schema import create_tables
+        create_tables()
+    os.chdir(path)
+    return str(path / "DATA" / "intelligence_platform.db")
+
+
+def _emptier(db_path: str, table: str):
+    def reset():
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute(f"DELETE FROM {table}")
+        conn.close()
+    return reset
+
+
+# ---- ingest ----
+
+def _csv_load(table: str):
+    def setup(ws: Workspace):
+        from app.services.load_csv import load_csv_file
+        csv_path = ws.csv_file(table, min(ws.rows, INGEST_ROWS))
+        db_path = _ingest_dir(ws, table)
+        return (lambda: _quiet(load_csv_file, csv_path, table)), _emptier(db_path, table)
+    return setup
+
+
+for _table in ("cyber_incidents", "it_tickets", "datasets_metadata"):
+    benchmark(f"ingest.a9_load_csv.{_table}", "ingest", repeat=3)(_csv_load(_table))
+
+
+@benchmark("ingest.a9_load_columnar.csv", "ingest", repeat=3)
+def columnar_csv(ws: Workspace):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise Skip("pyarrow is not installed")
+    from app.services.load_columnar import load_file
+    csv_path = ws.csv_file("cyber_incidents", min(ws.rows, INGEST_ROWS))
+    db_path = _ingest_dir(ws, "cyber_incidents")
+    return (lambda: load_file(csv_path, "cyber_incidents")), _emptier(db_path, "cyber_incidents")
+
+
+# same rows as ingest.a9_load_csv.cyber_incidents, as parquet: the columnar path against load_csv_file
+@benchmark("ingest.a9_load_columnar.parquet", "ingest", repeat=3)
+def columnar_parquet(ws: Workspace):
+    try:
+        import pyarrow.csv as pcsv
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Skip("pyarrow is not installed")
+    from app.services.load_columnar import load_file
+    csv_path = ws.csv_file("cyber_incidents", min(ws.rows, INGEST_ROWS))
+    parquet_path = csv_path[:-len(".csv")] + ".parquet"
+    if not os.path.exists(parquet_path):
+        pq.write_table(pcsv.read_csv(csv_path), parquet_path)
+    db_path = _ingest_dir(ws, "cyber_incidents")
+    return (lambda: load_file(parquet_path, "cyber_incidents")), _emptier(db_path, "cyber_incidents")
+
+
+# ---- queries ----
+
+@benchmark("queries.a9_reports.all_incidents", "queries")
+def a9_all_incidents(ws: Workspace):
+    from app.data.reports import get_all_cyber_incidents
+    return get_all_cyber_incidents
+
+
+@benchmark("queries.a9_reports.high_severity", "queries")
+def a9_high_severity(ws: Workspace):
+    from app.data.reports import get_high_severity_incidents
+    return get_high_severity_incidents
+
+
+@benchmark("queries.a9_reports.open_tickets", "queries")
+def a9_open_tickets(ws: Workspace):
+    from app.data.reports import get_open_it_tickets
+    return get_open_it_tickets
+
+
+@benchmark("queries.a9_reports.large_datasets", "queries")
+def a9_large_datasets(ws: Workspace):
+    from app.data.reports import get_large_datasets
+    return get_large_datasets
+
+
+@benchmark("queries.a9_trends.incidents_by_week", "queries")
+def a9_trends(ws: Workspace):
+    from app.data.trends import get_trend
+    return lambda: get_trend("incidents", "week", "2021-01-01", "2024-12-31")
+
+
+def _week11_db(ws: Workspace):
+    from services.database_manager import DatabaseManager
+    return DatabaseManager(ws.week11_db)
+
+
+@benchmark("queries.week11_fetch_all.open_critical", "queries")
+def week11_filter(ws: Workspace):
+    db = _week11_db(ws)
+    sql = """
+        SELECT i.id, i.incident_type, i.description
+        FROM security_incidents i
+        JOIN severity_levels sv ON sv.id = i.severity_id
+        JOIN statuses st ON st.id = i.status_id
+        WHERE sv.label = ? AND st.label = ?
+    """
+    return lambda: db.fetch_all(sql, ("critical", "Open"))
+
+
+@benchmark("queries.week11_search.incidents", "queries")
+def week11_search(ws: Workspace):
+    from services.search_service import SearchService
+    search = SearchService(_week11_db(ws))
+    return lambda: search.search_incidents("phish", severity="high")
+
+
+@benchmark("queries.week11_retrieval.top5", "queries")
+def week11_retrieval(ws: Workspace):
+    from services.retrieval_index import RetrievalIndex
+    index = RetrievalIndex(_week11_db(ws))
+    return lambda: index.search("ransomware server outage", k=5)
+
+
+@benchmark("queries.week11_trends.tickets_by_month", "queries")
+def week11_trends(ws: Workspace):
+    from services.trend_service import TrendService
+    trends = TrendService(_week11_db(ws))
+    return lambda: trends.series("tickets", "month", "2021-01-01", "2024-12-31")
+
+
+@benchmark("queries.week11_changes_since.latest", "queries")
+def week11_changes(ws: Workspace):
+    db = _week11_db(ws)
+    watermark = db.fetch_one("SELECT MAX(updated_at) FROM it_tickets")[0]
+    # the last day of changes: what a sync consumer typically asks for
+    return lambda: db.changes_since("it_tickets", watermark[:10])
+
+
+# ---- auth ----
+
+@benchmark("auth.week11_login", "auth")
+def week11_login(ws: Workspace):
+    from services.auth_manager import AuthManager
+    auth = AuthManager(_week11_db(ws))
+    return lambda: auth.login_user("user1", synthetic.PASSWORD)
+
+
+@benchmark("auth.a9_login", "auth")
+def a9_login(ws: Workspace):
+    try:
+        import bcrypt  # noqa: F401
+    except ImportError:
+        raise Skip("bcrypt is not installed")
+    from app.data.users import login_user
+    return lambda: login_user("user1", synthetic.PASSWORD)
+
+
+@benchmark("auth.a9_login_throttled", "auth")
+def a9_login_throttled(ws: Workspace):
+    """A locked-out attempt: should cost a dict lookup, not a bcrypt check."""
+    from app.data.users import login_user
+    from app.services import rate_limit
+    for _ in range(rate_limit.MAX_USER_FAILURES):
+        rate_limit.record_failure("user2", "bench")
+    return lambda: login_user("user2", synthetic.PASSWORD, "bench")
+
+
+# ---- page data ----
+
+@benchmark("pages.a9_dashboard_metrics", "pages")
+def a9_dashboard(ws: Workspace):
+    from app.services.dashboard_metrics import get_dataset_metrics, get_incident_metrics, get_ticket_metrics
+
+    def load():
+        get_incident_metrics()
+        get_ticket_metrics()
+        get_dataset_metrics()
+    return load
+
+
+@benchmark("pages.week11_statistics", "pages")
+def week11_statistics(ws: Workspace):
+    db = _week11_db(ws)
+
+    def load():
+        db.fetch_all("""
+            SELECT sv.label, st.label, COUNT(*)
+            FROM security_incidents i
+            JOIN severity_levels sv ON sv.id = i.severity_id
+            JOIN statuses st ON st.id = i.status_id
+            GROUP BY sv.label, st.label
+        """)
+        db.fetch_all("""
+            SELECT pr.label, st.label, COUNT(*)
+            FROM it_tickets t
+            JOIN priorities pr ON pr.id = t.priority_id
+            JOIN statuses st ON st.id = t.status_id
+            GROUP BY pr.label, st.label
+        """)
+        db.fetch_all("SELECT source, COUNT(*), SUM(size_bytes) FROM datasets GROUP BY source")
+    return load
+
+
+@benchmark("pages.week11_connect_per_rerun", "pages")
+def week11_connect_per_rerun(ws: Workspace):
+    """The old page pattern: open, one query, close."""
+    from services.database_manager import DatabaseManager
+
+    def rerun():
+        db = DatabaseManager(ws.week11_db)
+        db.connect()
+        try:
+            db.fetch_one("SELECT COUNT(*) FROM users")
+        finally:
+            db.close()
+    return rerun
+
+
+@benchmark("pages.week11_registry_get", "pages")
+def week11_registry_get(ws: Workspace):
+    """The same query on the thread's registry manager, as the pages do now."""
+    from services.db_registry import DatabaseRegistry
+    registry = DatabaseRegistry(ws.week11_db)
+    return lambda: registry.get().fetch_one("SELECT COUNT(*) FROM users")
+
+
+# ---- metrics overhead ----
+
+# Updates per timed call; divide the median by this for the per-update cost
+METRIC_UPDATES = 100_000
+
+
+@benchmark("metrics.week11_counter_inc", "metrics")
+def week11_counter_inc(ws: Workspace):
+    from services.metrics import MetricsRegistry
+    counter = MetricsRegistry().counter("bench_total", "benchmark", ["result"])
+
+    def run():
+        for _ in range(METRIC_UPDATES):
+            counter.labels("success").inc()
+    return run
+
+
+@benchmark("metrics.week11_histogram_observe", "metrics")
+def week11_histogram_observe(ws: Workspace):
+    from services.metrics import MetricsRegistry
+    histogram = MetricsRegistry().histogram("bench_seconds", "benchmark", ["operation"])
+
+    def run():
+        for i in range(METRIC_UPDATES):
+            histogram.labels("SELECT").observe(i * 1e-6)
+    return run
+
+
+@benchmark("metrics.a9_counter_inc", "metrics")
+def a9_counter_inc(ws: Workspace):
+    from app.services import metrics
+    metrics.counter("bench_total", "benchmark", ["result"])
+
+    def run():
+        for _ in range(METRIC_UPDATES):
+            metrics.inc("bench_total", "success")
+    return run
+
+
+@benchmark("metrics.a9_histogram_observe", "metrics")
+def a9_histogram_observe(ws: Workspace):
+    from app.services import metrics
+    metrics.histogram("bench_seconds", "benchmark", ["query"])
+
+    def run():
+        for i in range(METRIC_UPDATES):
+            metrics.observe("bench_seconds", i * 1e-6, "dashboard_incidents")
+    return run